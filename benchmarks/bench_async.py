@@ -0,0 +1,91 @@
+"""Compare the sync and async APIs under many concurrent clients.
+
+Both apps are driven in-process through httpx's ASGI transport against a
+temporary SQLite file. Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_async.py --clients 500 --requests 5000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def drive(app, clients: int, total: int) -> dict:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    latencies: List[float] = []
+    errors = 0
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+    start = date.today() + timedelta(days=2)
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        nonlocal errors
+        while not queue.empty():
+            i = queue.get_nowait()
+            began = time.perf_counter()
+            if i % 2:
+                resp = await client.get("/rooms")
+            else:
+                day = start + timedelta(days=i % 30)
+                resp = await client.get(
+                    "/rooms/availability",
+                    params={"start": str(day), "end": str(day + timedelta(days=2))},
+                )
+            latencies.append(time.perf_counter() - began)
+            if resp.status_code != 200:
+                errors += 1
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        began = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(clients)))
+        elapsed = time.perf_counter() - began
+    return {
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "errors": errors,
+    }
+
+
+async def main_async(args) -> None:
+    from api import async_main, main as sync_main
+
+    for name, app in (("sync", sync_main.app), ("async", async_main.app)):
+        # httpx's ASGI transport does not run the lifespan, so enter it here.
+        async with app.router.lifespan_context(app):
+            result = await drive(app, args.clients, args.requests)
+        print(
+            f"{name:<6} {result['rps']:>9.1f} req/s  p50 {result['p50_ms']:>8.2f} ms"
+            f"  p99 {result['p99_ms']:>8.2f} ms  errors {result['errors']}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=5_000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["HOTEL_DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Measure bulk load throughput from CSV with and without deferred indexes.
+
+Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_bulk_load.py --rows 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from infrastructure.bulk_load import bulk_load
+from infrastructure.db import get_engine
+
+FIELDS = [
+    "reference",
+    "guest_id",
+    "first_name",
+    "last_name",
+    "date_of_birth",
+    "room_type",
+    "room_number",
+    "number_of_guests",
+    "check_in",
+    "check_out",
+    "paid",
+    "cancelled",
+    "checked_in",
+    "checked_out",
+    "created_at",
+]
+
+
+def write_csv(path: Path, rows: int) -> None:
+    rooms = max(100, rows // 1000)
+    start = date(2015, 1, 1)
+    with path.open("w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(FIELDS)
+        for i in range(rows):
+            check_in = start + timedelta(days=3 * (i // rooms))
+            writer.writerow(
+                [
+                    f"r{i:09d}",
+                    f"g{i % 100_000}",
+                    "Guest",
+                    "Bench",
+                    "1980-01-01",
+                    "standard",
+                    str(1000 + i % rooms),
+                    1,
+                    check_in.isoformat(),
+                    (check_in + timedelta(days=2)).isoformat(),
+                    "true",
+                    "false",
+                    "false",
+                    "false",
+                    "2015-01-01T00:00:00",
+                ]
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "bookings.csv"
+        write_csv(source, args.rows)
+        for defer in (True, False):
+            engine = get_engine(f"sqlite:///{Path(tmp) / f'load_{defer}.db'}")
+            began = time.perf_counter()
+            (stats,) = bulk_load(engine, {"bookings": source}, defer_indexes=defer)
+            elapsed = time.perf_counter() - began
+            engine.dispose()
+            label = "deferred indexes" if defer else "live indexes"
+            print(
+                f"{label:<17} {stats.rows:,} rows  insert {stats.seconds:6.2f}s"
+                f"  total {elapsed:6.2f}s  {stats.rows / elapsed:>10,.0f} rows/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Measure bytes per booking entity and serializer cost.
+
+Compares the slotted ``Booking`` with an otherwise identical dataclass that
+keeps a per-instance ``__dict__`` (the previous layout), and
+``BookingOut.from_entity`` with validating a dict built from the entity.
+Figures include the field values each booking owns. Run from the
+repository root::
+
+    PYTHONPATH=src python benchmarks/bench_entity_memory.py --count 20000
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import gc
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+from api.schemas import BookingOut
+from domain.entities import Booking, RoomType
+
+# The pre-slots layout: same fields, with a per-instance ``__dict__``.
+DictBooking = dataclasses.make_dataclass(
+    "DictBooking",
+    [(f.name, f.type, f) for f in dataclasses.fields(Booking)],
+)
+
+
+def make(cls, count: int) -> list:
+    day = date(2030, 1, 1)
+    created = datetime(2029, 6, 1)
+    # Names and dates of birth are shared, as repeated values from one
+    # query largely are; references and stay dates are per booking.
+    names = [("Ada", "Lovelace"), ("Alan", "Turing"), ("Grace", "Hopper")]
+    return [
+        cls(
+            reference=f"b{i:09d}",
+            guest_id=f"g{i % 50_000:07d}",
+            first_name=names[i % 3][0],
+            last_name=names[i % 3][1],
+            date_of_birth=date(1980, 1, 1),
+            room_type=RoomType.STANDARD,
+            room_number=str(100 + i % 500),
+            number_of_guests=1 + i % 2,
+            check_in=day + timedelta(days=i % 365),
+            check_out=day + timedelta(days=i % 365 + 2),
+            created_at=created,
+        )
+        for i in range(count)
+    ]
+
+
+def traced_bytes(cls, count: int) -> float:
+    """Everything allocated to build ``count`` entities, per entity."""
+    gc.collect()
+    tracemalloc.start()
+    objects = make(cls, count)
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return used / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=20_000)
+    args = parser.parse_args()
+
+    # Measured with tracemalloc rather than ``sys.getsizeof``: since Python
+    # 3.11 an instance's ``__dict__`` is only materialized when accessed, and
+    # ``getsizeof(obj.__dict__)`` would create it.
+    before = traced_bytes(DictBooking, args.count)
+    after = traced_bytes(Booking, args.count)
+    print(f"__dict__ booking: {before:6.0f} bytes per booking")
+    print(f"slotted booking:  {after:6.0f} bytes per booking")
+    print(f"saved:            {before - after:6.0f} bytes ({1 - after / before:.0%})")
+
+    bookings = make(Booking, args.count)
+    fields = tuple(BookingOut.model_fields)
+    began = time.perf_counter()
+    for b in bookings:
+        BookingOut.model_validate({name: getattr(b, name) for name in fields})
+    validated = time.perf_counter() - began
+    began = time.perf_counter()
+    for b in bookings:
+        BookingOut.from_entity(b)
+    explicit = time.perf_counter() - began
+    n = len(bookings)
+    print(f"validate from dict: {validated / n * 1e6:6.2f} us per booking")
+    print(f"from_entity:        {explicit / n * 1e6:6.2f} us per booking")
+
+
+if __name__ == "__main__":
+    main()
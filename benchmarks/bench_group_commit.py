@@ -0,0 +1,128 @@
+"""Compare one commit per booking with the group-commit writer.
+
+Many threads book non-overlapping stays against a temporary SQLite file,
+first each committing its own transaction, then through
+``GroupCommitWriter``. Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_group_commit.py --threads 64 --requests 5000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Callable, List
+
+from application.group_commit import GroupCommitWriter
+from application.use_cases import BookingService, CreateBookingRequest
+from domain.entities import RoomType
+from domain.services import BookingPolicy
+from infrastructure.db import create_session_factory, get_engine, init_db
+from infrastructure.repositories import (
+    SqlBookingRepository,
+    SqlGuestRepository,
+    SqlRoomRepository,
+)
+
+ROOMS = ["101", "102", "103", "104", "105"]
+
+
+def make_requests(total: int, tag: str, start: date) -> List[CreateBookingRequest]:
+    reqs = []
+    for i in range(total):
+        check_in = start + timedelta(days=2 * (i // len(ROOMS)))
+        reqs.append(
+            CreateBookingRequest(
+                guest_id=f"{tag}{i}",
+                first_name="Bea",
+                last_name="Mark",
+                date_of_birth=date(1990, 1, 1),
+                room_type=RoomType.STANDARD,
+                room_number=ROOMS[i % len(ROOMS)],
+                number_of_guests=1,
+                check_in=check_in,
+                check_out=check_in + timedelta(days=2),
+            )
+        )
+    return reqs
+
+
+def run(
+    label: str, book: Callable, reqs: List[CreateBookingRequest], threads: int
+) -> None:
+    began = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        created = sum(pool.map(book, reqs))
+    elapsed = time.perf_counter() - began
+    print(
+        f"{label:<16} {len(reqs) / elapsed:>9,.0f} bookings/s"
+        f"  ({created:,} of {len(reqs):,} created)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--max-items", type=int, default=256)
+    parser.add_argument("--max-delay-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = get_engine(
+            f"sqlite:///{os.path.join(tmp, 'bench.db')}", pool_size=args.threads
+        )
+        init_db(engine)
+        sessions = create_session_factory(engine)
+
+        def service(session) -> BookingService:
+            return BookingService(
+                SqlBookingRepository(session),
+                SqlGuestRepository(session),
+                SqlRoomRepository(session),
+                BookingPolicy(),
+            )
+
+        def book_alone(req: CreateBookingRequest) -> bool:
+            with sessions() as session:
+                try:
+                    service(session).create_booking(req)
+                    session.commit()
+                    return True
+                except ValueError:
+                    session.rollback()
+                    return False
+
+        def write_batch(reqs):
+            with sessions() as session:
+                results = service(session).create_bookings(reqs)
+                session.commit()
+            return results
+
+        delay = args.max_delay_ms / 1000
+        writer = GroupCommitWriter(write_batch, args.max_items, delay)
+        writer.start()
+
+        def book_grouped(req: CreateBookingRequest) -> bool:
+            try:
+                writer.create_booking(req)
+                return True
+            except ValueError:
+                return False
+
+        # Each run books its own nights, so every request should succeed.
+        first = date.today() + timedelta(days=2)
+        second = first + timedelta(days=2 * args.requests)
+        alone = make_requests(args.requests, "a", first)
+        grouped = make_requests(args.requests, "b", second)
+        run("commit per call", book_alone, alone, args.threads)
+        run("group commit", book_grouped, grouped, args.threads)
+        writer.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Compare booking query plans and latencies with and without indexes.
+
+Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_indexes.py --sizes 10000 100000 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from sqlalchemy import select
+
+from infrastructure.db import create_session, get_engine
+from infrastructure.migrations import apply_indexes
+from infrastructure.models import Base, BookingModel
+from infrastructure.repositories import SqlBookingRepository
+
+CHUNK = 50_000
+
+
+def populate(engine, size: int) -> Dict[str, str]:
+    """Insert ``size`` bookings spread over consecutive stays per room."""
+    rooms = max(100, size // 1000)
+    per_room = -(-size // rooms)
+    start = date.today() - timedelta(days=3 * per_room)
+    table = BookingModel.__table__
+    rows: List[dict] = []
+    with engine.begin() as conn:
+        for i in range(size):
+            room = i % rooms
+            slot = i // rooms
+            check_in = start + timedelta(days=3 * slot + room % 3)
+            rows.append(
+                {
+                    "reference": f"r{i:09d}",
+                    "guest_id": f"g{i % max(1, size // 10)}",
+                    "first_name": "Guest",
+                    "last_name": "Bench",
+                    "date_of_birth": date(1980, 1, 1),
+                    "room_type": "standard",
+                    "room_number": str(1000 + room),
+                    "number_of_guests": 1,
+                    "check_in": check_in,
+                    "check_out": check_in + timedelta(days=2),
+                    "paid": True,
+                    "cancelled": i % 20 == 0,
+                    "checked_in": False,
+                    "checked_out": False,
+                    "created_at": datetime(2020, 1, 1),
+                }
+            )
+            if len(rows) == CHUNK:
+                conn.execute(table.insert(), rows)
+                rows = []
+        if rows:
+            conn.execute(table.insert(), rows)
+    return {"room": "1000", "guest": "g1"}
+
+
+def query_plans(engine, keys: Dict[str, str]) -> Dict[str, str]:
+    start = date.today()
+    end = start + timedelta(days=7)
+    statements = {
+        "list_for_room": select(BookingModel).where(
+            BookingModel.room_number == keys["room"],
+            BookingModel.cancelled.is_(False),
+        ),
+        "list_for_guest": select(BookingModel).where(
+            BookingModel.guest_id == keys["guest"]
+        ),
+        "list_between": select(BookingModel).where(
+            BookingModel.check_in < end, BookingModel.check_out > start
+        ),
+    }
+    plans = {}
+    with engine.connect() as conn:
+        for name, stmt in statements.items():
+            sql = str(stmt.compile(engine, compile_kwargs={"literal_binds": True}))
+            rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql).all()
+            plans[name] = "; ".join(row[-1] for row in rows)
+    return plans
+
+
+def time_call(fn: Callable[[], object], repeat: int = 20) -> float:
+    samples = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - began)
+    return statistics.median(samples) * 1000
+
+
+def latencies(engine, keys: Dict[str, str]) -> Dict[str, float]:
+    session = create_session(engine)
+    repo = SqlBookingRepository(session)
+    start = date.today()
+    end = start + timedelta(days=7)
+
+    def run(fn: Callable[[], object]) -> Callable[[], object]:
+        def call() -> object:
+            result = fn()
+            session.expunge_all()
+            return result
+
+        return call
+
+    try:
+        return {
+            "list_for_room": time_call(run(lambda: repo.list_for_room(keys["room"]))),
+            "list_for_guest": time_call(
+                run(lambda: repo.list_for_guest(keys["guest"]))
+            ),
+            "list_between": time_call(run(lambda: repo.list_between(start, end))),
+        }
+    finally:
+        session.close()
+
+
+def bench(size: int, workdir: Path) -> None:
+    engine = get_engine(f"sqlite:///{workdir / f'bench_{size}.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for index in BookingModel.__table__.indexes:
+            conn.exec_driver_sql(f"DROP INDEX {index.name}")
+    keys = populate(engine, size)
+
+    results = {"no indexes": (query_plans(engine, keys), latencies(engine, keys))}
+    apply_indexes(engine)
+    results["indexed"] = (query_plans(engine, keys), latencies(engine, keys))
+    engine.dispose()
+
+    print(f"\n== {size:,} bookings ==")
+    for label, (plans, timings) in results.items():
+        print(f"-- {label}")
+        for name, plan in plans.items():
+            print(f"  {name:<15} {timings[name]:>9.3f} ms  {plan}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            bench(size, Path(tmp))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Time availability queries against the NumPy occupancy matrix.
+
+Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_occupancy.py --rooms 10000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from domain.entities import Booking, Room, RoomType
+from infrastructure.occupancy import OccupancyMatrix
+
+
+def synthetic_bookings(rooms, origin: date, horizon_days: int, seed: int):
+    rng = random.Random(seed)
+    for room in rooms:
+        day = rng.randint(0, 6)
+        while day < horizon_days:
+            nights = rng.randint(1, 7)
+            check_in = origin + timedelta(days=day)
+            yield Booking(
+                reference=f"{room.number}-{day}",
+                guest_id="g1",
+                first_name="Guest",
+                last_name="Bench",
+                date_of_birth=date(1980, 1, 1),
+                room_type=room.room_type,
+                room_number=room.number,
+                number_of_guests=1,
+                check_in=check_in,
+                check_out=check_in + timedelta(days=nights),
+            )
+            day += nights + rng.randint(0, 10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=10_000)
+    parser.add_argument("--horizon-days", type=int, default=730)
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    origin = date.today()
+    types = list(RoomType)
+    rooms = [
+        Room(number=str(100_000 + i), room_type=types[i % len(types)])
+        for i in range(args.rooms)
+    ]
+    began = time.perf_counter()
+    bookings = list(synthetic_bookings(rooms, origin, args.horizon_days, args.seed))
+    matrix = OccupancyMatrix.build(
+        rooms, lambda start, end: bookings, origin, args.horizon_days
+    )
+    print(
+        f"built {args.rooms:,} rooms x {args.horizon_days} days from "
+        f"{len(bookings):,} bookings in {time.perf_counter() - began:.2f}s"
+    )
+
+    rng = random.Random(args.seed)
+    samples = []
+    for _ in range(args.queries):
+        start = origin + timedelta(days=rng.randint(0, args.horizon_days - 31))
+        end = start + timedelta(days=rng.randint(1, 30))
+        t0 = time.perf_counter()
+        matrix.free_rooms(start, end)
+        samples.append((time.perf_counter() - t0) * 1e6)
+    samples.sort()
+    print(
+        f"free_rooms: median {statistics.median(samples):.1f} us, "
+        f"p99 {samples[int(len(samples) * 0.99)]:.1f} us"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Compare per-night price loops with the prefix-sum quote engine.
+
+Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_quotes.py --quotes 10000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from domain.entities import RoomType
+from infrastructure.quotes import QuoteEngine, RatePlan, Season
+
+
+def naive_quote(
+    plan: RatePlan, room_type: RoomType, check_in: date, nights: int
+) -> float:
+    total = 0
+    for i in range(nights):
+        night = check_in + timedelta(days=i)
+        rate = plan.base[room_type] * plan.weekday[night.weekday()]
+        for season in plan.seasons:
+            if season.start <= night < season.end:
+                rate *= season.multiplier
+        total += round(rate * 100)
+    return total / 100
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quotes", type=int, default=10_000)
+    parser.add_argument("--max-nights", type=int, default=14)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    origin = date.today()
+    plan = RatePlan(
+        weekday=(1, 1, 1, 1, 1.2, 1.25, 1),
+        seasons=tuple(
+            Season(origin + timedelta(days=d), origin + timedelta(days=d + 14), 1.4)
+            for d in range(30, 730, 90)
+        ),
+    )
+    rng = random.Random(args.seed)
+    types = list(RoomType)
+    requests = [
+        (
+            rng.choice(types),
+            origin + timedelta(days=rng.randrange(700)),
+            rng.randint(1, args.max_nights),
+        )
+        for _ in range(args.quotes)
+    ]
+
+    began = time.perf_counter()
+    engine = QuoteEngine(plan, origin)
+    built = time.perf_counter() - began
+
+    began = time.perf_counter()
+    expected = [naive_quote(plan, *r) for r in requests]
+    naive = time.perf_counter() - began
+
+    room_types, check_ins, nights = zip(*requests)
+    began = time.perf_counter()
+    totals = engine.quote_many(room_types, check_ins, nights)
+    vectorized = time.perf_counter() - began
+
+    assert all(abs(a - b) < 1e-6 for a, b in zip(expected, totals))
+    print(f"engine build: {built * 1000:.2f} ms")
+    print(f"naive loop:   {naive * 1000:.2f} ms for {args.quotes:,} quotes")
+    print(
+        f"quote_many:   {vectorized * 1000:.2f} ms "
+        f"({naive / vectorized:.0f}x faster)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Per-item cost of encoding booking lists as JSON response bodies.
+
+``models`` is the previous path: build ``BookingOut`` objects, let FastAPI
+validate them against ``response_model`` again and serialize the result.
+``single pass`` encodes the entities straight to bytes as the endpoints now
+do. Sync endpoints also used to pay a thread pool round trip for the second
+validation, which is not included here. Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_serialization.py
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable, List
+
+from pydantic import TypeAdapter
+
+from api.schemas import BookingOut
+from api.serialization import bookings_response
+from bench_entity_memory import make
+from domain.entities import Booking
+
+_response_model = TypeAdapter(List[BookingOut])
+
+
+def via_models(bookings: List[Booking]) -> bytes:
+    # What FastAPI does with a returned list of models: validate it against
+    # the response model once more, then dump the result to JSON.
+    models = [BookingOut.from_entity(b) for b in bookings]
+    return _response_model.dump_json(_response_model.validate_python(models))
+
+
+def single_pass(bookings: List[Booking]) -> bytes:
+    return bookings_response(bookings).body
+
+
+def per_item_us(fn: Callable[[List[Booking]], bytes], bookings, repeat: int) -> float:
+    fn(bookings)
+    began = time.perf_counter()
+    for _ in range(repeat):
+        fn(bookings)
+    return (time.perf_counter() - began) / repeat / len(bookings) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10_000])
+    args = parser.parse_args()
+
+    print(f"{'items':>7} {'models':>12} {'single pass':>12} {'speedup':>8}")
+    for size in args.sizes:
+        bookings = make(Booking, size)
+        repeat = max(3, 20_000 // size)
+        before = per_item_us(via_models, bookings, repeat)
+        after = per_item_us(single_pass, bookings, repeat)
+        print(
+            f"{size:>7} {before:>9.2f} us {after:>9.2f} us {before / after:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
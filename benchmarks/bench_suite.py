@@ -0,0 +1,258 @@
+"""Time the booking hot paths on a synthetic dataset and save the results.
+
+``BookingService`` calls run directly against SQL repositories; the FastAPI
+endpoints run in-process through httpx's ASGI transport. Results are written
+as JSON so runs can be compared with ``benchmarks/compare.py``. Run from the
+repository root::
+
+    PYTHONPATH=src python benchmarks/bench_suite.py --preset medium
+    PYTHONPATH=src python benchmarks/compare.py old.json new.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from datagen import PRESETS, Dataset, generate
+
+Stay = Tuple[int, date]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] * 1000
+
+    return {
+        "n": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "min_ms": ordered[0] * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "ops_per_s": len(ordered) / sum(ordered),
+    }
+
+
+def measure(fn: Callable[[int], object], iterations: int, warmup: int) -> dict:
+    for i in range(warmup):
+        fn(i)
+    samples = []
+    for i in range(warmup, warmup + iterations):
+        began = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - began)
+    return summarize(samples)
+
+
+def free_stays(dataset: Dataset) -> Iterator[Stay]:
+    """Yield one-night stays past the generated horizon, never reused."""
+    for i in itertools.count():
+        room = i % dataset.rooms
+        yield room, dataset.horizon + timedelta(days=2 * (i // dataset.rooms))
+
+
+def booking_payload(dataset: Dataset, stay: Stay, guest: str) -> dict:
+    room, check_in = stay
+    return {
+        "guest_id": guest,
+        "first_name": "Bench",
+        "last_name": "Mark",
+        "date_of_birth": date(1980, 1, 1),
+        "room_type": dataset.room_types[room],
+        "room_number": dataset.room_numbers[room],
+        "number_of_guests": 1,
+        "check_in": check_in,
+        "check_out": check_in + timedelta(days=1),
+    }
+
+
+def window(dataset: Dataset, i: int) -> Tuple[date, date]:
+    start = dataset.today + timedelta(days=i % max(1, dataset.scenario.future_days))
+    return start, start + timedelta(days=3)
+
+
+def bench_service(engine, dataset: Dataset, stays, iterations, warmup) -> dict:
+    from application.use_cases import BookingService, CreateBookingRequest
+    from domain.entities import RoomType
+    from domain.services import BookingPolicy
+    from infrastructure.db import create_session
+    from infrastructure.repositories import (
+        SqlBookingRepository,
+        SqlGuestRepository,
+        SqlRoomRepository,
+    )
+
+    session = create_session(engine)
+    service = BookingService(
+        SqlBookingRepository(session),
+        SqlGuestRepository(session),
+        SqlRoomRepository(session),
+        BookingPolicy(),
+    )
+    upcoming = iter(dataset.upcoming[: iterations + warmup])
+    guests = dataset.guest_ids
+
+    def create(i: int) -> None:
+        payload = booking_payload(dataset, next(stays), f"bench-s{i}")
+        payload["room_type"] = RoomType(payload["room_type"])
+        service.create_booking(CreateBookingRequest(**payload))
+        session.commit()
+
+    def available(i: int) -> None:
+        service.available_rooms(*window(dataset, i))
+        session.rollback()
+
+    def history(i: int) -> None:
+        service.list_guest_bookings(guests[(i * 7919) % len(guests)])
+        session.rollback()
+
+    def check_in(i: int) -> None:
+        service.check_in_booking(next(upcoming))
+        session.commit()
+
+    try:
+        return {
+            "service.create_booking": measure(create, iterations, warmup),
+            "service.available_rooms": measure(available, iterations, warmup),
+            "service.list_guest_bookings": measure(history, iterations, warmup),
+            "service.check_in_booking": measure(check_in, iterations, warmup),
+        }
+    finally:
+        session.close()
+
+
+async def bench_api(app, dataset: Dataset, stays, iterations, warmup) -> dict:
+    import httpx
+
+    # The service benchmark consumed the first upcoming references.
+    upcoming = iter(dataset.upcoming[iterations + warmup :])
+    guests = dataset.guest_ids
+    transport = httpx.ASGITransport(app=app)
+    client = httpx.AsyncClient(transport=transport, base_url="http://bench")
+
+    async def ameasure(call: Callable[[int], object]) -> dict:
+        samples = []
+        for i in range(warmup + iterations):
+            began = time.perf_counter()
+            resp = await call(i)
+            if i >= warmup:
+                samples.append(time.perf_counter() - began)
+            if resp.status_code != 200:
+                raise RuntimeError(
+                    f"{resp.request.url}: {resp.status_code} {resp.text}"
+                )
+        return summarize(samples)
+
+    def create(i: int):
+        payload = booking_payload(dataset, next(stays), f"bench-a{i}")
+        return client.post("/bookings", json={k: str(v) for k, v in payload.items()})
+
+    def available(i: int):
+        start, end = window(dataset, i)
+        return client.get(
+            "/rooms/availability", params={"start": str(start), "end": str(end)}
+        )
+
+    def history(i: int):
+        return client.get(f"/guests/{guests[(i * 7919) % len(guests)]}/bookings")
+
+    def check_in(i: int):
+        return client.post(f"/bookings/{next(upcoming)}/check-in")
+
+    async with client:
+        return {
+            "api.POST /bookings": await ameasure(create),
+            "api.GET /rooms/availability": await ameasure(available),
+            "api.GET /guests/{id}/bookings": await ameasure(history),
+            "api.POST /bookings/{ref}/check-in": await ameasure(check_in),
+        }
+
+
+async def run(args) -> Tuple[Dataset, dict]:
+    from api.main import app
+
+    # httpx's ASGI transport does not run the lifespan, so enter it here.
+    async with app.router.lifespan_context(app):
+        engine = app.state.resources.engine
+        dataset = generate(engine, PRESETS[args.preset])
+        print(f"generated {dataset.summary()}", file=sys.stderr)
+        stays = free_stays(dataset)
+        results = bench_service(engine, dataset, stays, args.iterations, args.warmup)
+        results.update(
+            await bench_api(app, dataset, stays, args.iterations, args.warmup)
+        )
+    return dataset, results
+
+
+def git_revision() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["HOTEL_DATABASE_URL"] = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        dataset, results = asyncio.run(run(args))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "preset": args.preset,
+            "iterations": args.iterations,
+            "settings": {
+                k: v
+                for k, v in os.environ.items()
+                if k.startswith("HOTEL_") and k != "HOTEL_DATABASE_URL"
+            },
+            "dataset": dataset.summary(),
+        },
+        "results": results,
+    }
+    output = args.output or Path(__file__).parent / "results" / (
+        f"{args.preset}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    for name, stats in results.items():
+        print(
+            f"{name:<36} p50 {stats['p50_ms']:>8.3f} ms  p95 {stats['p95_ms']:>8.3f} ms"
+            f"  {stats['ops_per_s']:>9.1f} ops/s"
+        )
+    print(f"wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Compare two ``bench_suite.py`` result files and flag regressions.
+
+Exits with status 1 when any benchmark's chosen percentile got slower than
+``--threshold`` (a fraction, default 0.2 = 20%)::
+
+    PYTHONPATH=src python benchmarks/compare.py baseline.json current.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def compare(baseline: dict, current: dict, metric: str, threshold: float) -> bool:
+    regressed = False
+    old, new = baseline["results"], current["results"]
+    for name in sorted(old.keys() & new.keys()):
+        before, after = old[name][metric], new[name][metric]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressed = True
+        print(f"{name:<36} {before:>9.3f} -> {after:>9.3f} ms  {change:+7.1%}{flag}")
+    for name in sorted(old.keys() ^ new.keys()):
+        print(f"{name:<36} only in {'baseline' if name in old else 'current'}")
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("current", type=Path)
+    parser.add_argument("--metric", default="p50_ms")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+    baseline = json.loads(args.baseline.read_text())
+    current = json.loads(args.current.read_text())
+    if compare(baseline, current, args.metric, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
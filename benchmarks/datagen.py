@@ -0,0 +1,187 @@
+"""Seeded synthetic hotel data for benchmarks.
+
+The same ``Scenario`` and seed always produce the same rooms, guests and
+bookings, so timings from different runs describe the same database. Each
+room gets a non-overlapping sequence of stays covering ``history_days`` in
+the past and ``future_days`` ahead, with gaps sized so that roughly
+``density`` of all room-nights are booked.
+
+Used by the other benchmark scripts, or on its own to build a database::
+
+    PYTHONPATH=src python benchmarks/datagen.py sqlite:///./bench.db --preset large
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+from infrastructure import room_nights
+from infrastructure.db import get_engine
+from infrastructure.models import Base, BookingModel, GuestModel, RoomModel
+
+CHUNK = 50_000
+MAX_STAY = 7
+ROOM_TYPES = ("standard", "standard", "deluxe", "suite")
+FIRST_NAMES = ("Ada", "Ben", "Cleo", "Dev", "Esme", "Finn", "Gus", "Hana")
+LAST_NAMES = ("Abbott", "Baker", "Chen", "Diaz", "Evans", "Fox", "Gray", "Hill")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    rooms: int = 200
+    guests: int = 5_000
+    history_days: int = 365
+    future_days: int = 180
+    density: float = 0.7
+    seed: int = 42
+
+    @property
+    def expected_bookings(self) -> int:
+        mean_stay = (1 + MAX_STAY) / 2
+        nights = self.rooms * (self.history_days + self.future_days)
+        return int(nights * self.density / mean_stay)
+
+
+# ``large`` lands at roughly one million bookings.
+PRESETS: Dict[str, Scenario] = {
+    "small": Scenario(rooms=50, guests=1_000, history_days=180, future_days=90),
+    "medium": Scenario(rooms=500, guests=50_000, history_days=730, future_days=180),
+    "large": Scenario(
+        rooms=2_000, guests=250_000, history_days=2_200, future_days=365, density=0.8
+    ),
+}
+
+
+@dataclass
+class Dataset:
+    """What was generated, plus sample keys for benchmarks to query."""
+
+    scenario: Scenario
+    today: date
+    rooms: int = 0
+    guests: int = 0
+    bookings: int = 0
+    seconds: float = 0.0
+    room_numbers: List[str] = field(default_factory=list)
+    room_types: List[str] = field(default_factory=list)
+    guest_ids: List[str] = field(default_factory=list)
+    upcoming: List[str] = field(default_factory=list)
+
+    @property
+    def horizon(self) -> date:
+        """First day with no generated bookings, free for new ones."""
+        return self.today + timedelta(days=self.scenario.future_days + MAX_STAY)
+
+    def summary(self) -> dict:
+        return {
+            "scenario": asdict(self.scenario),
+            "rooms": self.rooms,
+            "guests": self.guests,
+            "bookings": self.bookings,
+            "seconds": round(self.seconds, 3),
+        }
+
+
+def _guest_row(rng: random.Random, index: int) -> dict:
+    return {
+        "id": f"g{index:07d}",
+        "first_name": rng.choice(FIRST_NAMES),
+        "last_name": rng.choice(LAST_NAMES),
+        "date_of_birth": date(1950, 1, 1) + timedelta(days=rng.randrange(18_000)),
+    }
+
+
+def generate(engine, scenario: Scenario, today: date | None = None) -> Dataset:
+    """Replace the contents of ``engine``'s database with ``scenario``'s data."""
+    rng = random.Random(scenario.seed)
+    today = today or date.today()
+    dataset = Dataset(scenario, today)
+    began = time.perf_counter()
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    rooms = [
+        {"number": str(1000 + i), "room_type": ROOM_TYPES[i % len(ROOM_TYPES)]}
+        for i in range(scenario.rooms)
+    ]
+    guests = [_guest_row(rng, i) for i in range(scenario.guests)]
+    mean_gap = (1 + MAX_STAY) / 2 * (1 - scenario.density) / scenario.density
+    first_day = today - timedelta(days=scenario.history_days)
+    last_day = today + timedelta(days=scenario.future_days)
+    created_at = datetime.combine(first_day, datetime.min.time())
+
+    table = BookingModel.__table__
+    rows: List[dict] = []
+    with engine.begin() as conn:
+        conn.execute(RoomModel.__table__.insert(), rooms)
+        for start in range(0, len(guests), CHUNK):
+            conn.execute(GuestModel.__table__.insert(), guests[start : start + CHUNK])
+        for room in rooms:
+            day = first_day + timedelta(days=rng.randrange(MAX_STAY))
+            while day < last_day:
+                stay = rng.randint(1, MAX_STAY)
+                guest = guests[rng.randrange(len(guests))]
+                reference = f"b{dataset.bookings:09d}"
+                cancelled = rng.random() < 0.05
+                rows.append(
+                    {
+                        "reference": reference,
+                        "guest_id": guest["id"],
+                        "first_name": guest["first_name"],
+                        "last_name": guest["last_name"],
+                        "date_of_birth": guest["date_of_birth"],
+                        "room_type": room["room_type"],
+                        "room_number": room["number"],
+                        "number_of_guests": 1,
+                        "check_in": day,
+                        "check_out": day + timedelta(days=stay),
+                        "paid": day < today,
+                        "cancelled": cancelled,
+                        "checked_in": day < today,
+                        "checked_out": day + timedelta(days=stay) <= today,
+                        "created_at": created_at,
+                    }
+                )
+                if day > today and not cancelled and len(dataset.upcoming) < 10_000:
+                    dataset.upcoming.append(reference)
+                dataset.bookings += 1
+                if len(rows) == CHUNK:
+                    conn.execute(table.insert(), rows)
+                    rows = []
+                gap = round(rng.expovariate(1 / mean_gap)) if mean_gap else 0
+                day += timedelta(days=stay + gap)
+        if rows:
+            conn.execute(table.insert(), rows)
+        room_nights.rebuild(conn)
+        if conn.dialect.name == "sqlite":
+            conn.exec_driver_sql("ANALYZE")
+
+    dataset.rooms = len(rooms)
+    dataset.guests = len(guests)
+    dataset.room_numbers = [r["number"] for r in rooms]
+    dataset.room_types = [r["room_type"] for r in rooms]
+    dataset.guest_ids = [g["id"] for g in guests]
+    rng.shuffle(dataset.upcoming)
+    dataset.seconds = time.perf_counter() - began
+    return dataset
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("url", nargs="?", default="sqlite:///./bench.db")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    scenario = PRESETS[args.preset]
+    if args.seed is not None:
+        scenario = Scenario(**{**asdict(scenario), "seed": args.seed})
+    dataset = generate(get_engine(args.url), scenario)
+    print(dataset.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""Load-test the API with a mix of guest scenarios and report percentiles.
+
+Virtual users loop over scenarios picked by weight from ``--mix``:
+
+- ``browse``: search availability
+- ``book``: search, then book one of the free rooms
+- ``stay``: search, book, check in and check out
+- ``cancel``: search, book and cancel
+
+By default the app runs in-process through httpx's ASGI transport on a
+temporary SQLite file. ``--url`` targets a running server instead, which
+includes the HTTP stack in the numbers. Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/loadgen.py --users 50 --duration 30
+    PYTHONPATH=src uvicorn api.main:app --port 8000 --workers 4
+    PYTHONPATH=src python benchmarks/loadgen.py --url http://127.0.0.1:8000
+
+Per endpoint it reports throughput, p50/p95/p99 latency, the share of
+requests rejected with a 4xx and the share that failed with a 5xx or a
+transport error. Under contention some bookings lose the race for a room
+and are rejected with a 400; that is expected, failures are not.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import httpx
+
+SCENARIOS: Dict[str, Sequence[str]] = {
+    "browse": ("search",),
+    "book": ("search", "book"),
+    "stay": ("search", "book", "check_in", "check_out"),
+    "cancel": ("search", "book", "cancel"),
+}
+DEFAULT_MIX = "browse=4,book=2,stay=2,cancel=1"
+
+# Steps after booking: (endpoint label, method, path suffix).
+BOOKING_STEPS = {
+    "check_in": ("POST /bookings/{reference}/check-in", "POST", "/check-in"),
+    "check_out": ("POST /bookings/{reference}/check-out", "POST", "/check-out"),
+    "cancel": ("DELETE /bookings/{reference}", "DELETE", ""),
+}
+
+
+@dataclass
+class EndpointStats:
+    latencies: List[float] = field(default_factory=list)
+    rejected: int = 0
+    failed: int = 0
+
+    def summary(self, elapsed: float) -> Dict[str, float]:
+        ordered = sorted(self.latencies)
+        n = len(ordered)
+
+        def pct(p: float) -> float:
+            return ordered[min(n - 1, int(n * p / 100))] * 1000
+
+        return {
+            "requests": n,
+            "rps": n / elapsed,
+            "p50_ms": pct(50),
+            "p95_ms": pct(95),
+            "p99_ms": pct(99),
+            "max_ms": ordered[-1] * 1000,
+            "rejected_rate": self.rejected / n,
+            "error_rate": self.failed / n,
+        }
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix: Dict[str, float] = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            choices = ", ".join(SCENARIOS)
+            raise ValueError(f"Unknown scenario {name!r}; choose from {choices}")
+        mix[name] = float(weight) if weight else 1.0
+    if not any(w > 0 for w in mix.values()):
+        raise ValueError("The mix needs at least one positive weight")
+    return mix
+
+
+class LoadRun:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        mix: Dict[str, float],
+        seed: int,
+        horizon_days: int,
+    ) -> None:
+        self.client = client
+        self.names = list(mix)
+        self.weights = list(mix.values())
+        self.seed = seed
+        self.horizon_days = horizon_days
+        self.stats: Dict[str, EndpointStats] = defaultdict(EndpointStats)
+        self.today = date.today()
+
+    async def call(
+        self, label: str, method: str, path: str, **kwargs
+    ) -> Optional[httpx.Response]:
+        stats = self.stats[label]
+        began = time.perf_counter()
+        try:
+            resp = await self.client.request(method, path, **kwargs)
+        except httpx.HTTPError:
+            stats.latencies.append(time.perf_counter() - began)
+            stats.failed += 1
+            return None
+        stats.latencies.append(time.perf_counter() - began)
+        if resp.status_code >= 500:
+            stats.failed += 1
+            return None
+        if resp.status_code >= 400:
+            stats.rejected += 1
+            return None
+        return resp
+
+    async def user(self, number: int, deadline: float) -> None:
+        rng = random.Random(self.seed * 100_003 + number)
+        journey = 0
+        while time.perf_counter() < deadline:
+            scenario = rng.choices(self.names, self.weights)[0]
+            guest_id = f"load-{self.seed}-{number}-{journey}"
+            await self.journey(rng, guest_id, SCENARIOS[scenario])
+            journey += 1
+
+    async def journey(
+        self, rng: random.Random, guest_id: str, steps: Sequence[str]
+    ) -> None:
+        check_in = self.today + timedelta(days=rng.randint(2, self.horizon_days))
+        check_out = check_in + timedelta(days=rng.randint(1, 5))
+        resp = await self.call(
+            "GET /rooms/availability",
+            "GET",
+            "/rooms/availability",
+            params={"start": str(check_in), "end": str(check_out)},
+        )
+        if resp is None or len(steps) == 1:
+            return
+        rooms = resp.json()
+        if not rooms:
+            return
+        room = rng.choice(rooms)
+        resp = await self.call(
+            "POST /bookings",
+            "POST",
+            "/bookings",
+            json={
+                "guest_id": guest_id,
+                "first_name": "Load",
+                "last_name": "Test",
+                "date_of_birth": "1985-06-15",
+                "room_type": room["room_type"],
+                "room_number": room["number"],
+                "number_of_guests": rng.randint(1, 2),
+                "check_in": str(check_in),
+                "check_out": str(check_out),
+            },
+        )
+        if resp is None:
+            return
+        reference = resp.json()["reference"]
+        for step in steps[2:]:
+            label, method, suffix = BOOKING_STEPS[step]
+            if await self.call(label, method, f"/bookings/{reference}{suffix}") is None:
+                return
+
+    async def run(self, users: int, duration: float) -> Dict[str, Dict[str, float]]:
+        began = time.perf_counter()
+        await asyncio.gather(*(self.user(i, began + duration) for i in range(users)))
+        elapsed = time.perf_counter() - began
+        report = {
+            label: stats.summary(elapsed) for label, stats in sorted(self.stats.items())
+        }
+        total = EndpointStats()
+        for stats in self.stats.values():
+            total.latencies += stats.latencies
+            total.rejected += stats.rejected
+            total.failed += stats.failed
+        if total.latencies:
+            report["total"] = total.summary(elapsed)
+        return report
+
+
+async def drive(args, mix: Dict[str, float]) -> Dict[str, Dict[str, float]]:
+    if args.url:
+        limits = httpx.Limits(
+            max_connections=args.users, max_keepalive_connections=args.users
+        )
+        async with httpx.AsyncClient(
+            base_url=args.url, limits=limits, timeout=60
+        ) as client:
+            return await LoadRun(client, mix, args.seed, args.horizon_days).run(
+                args.users, args.duration
+            )
+    if args.app == "async":
+        from api.async_main import app
+    else:
+        from api.main import app
+    # httpx's ASGI transport does not run the lifespan, so enter it here.
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://loadgen", timeout=60
+        ) as client:
+            return await LoadRun(client, mix, args.seed, args.horizon_days).run(
+                args.users, args.duration
+            )
+
+
+def print_report(report: Dict[str, Dict[str, float]]) -> None:
+    print(
+        f"{'endpoint':<38} {'requests':>8} {'req/s':>9} {'p50 ms':>8}"
+        f" {'p95 ms':>8} {'p99 ms':>8} {'4xx':>6} {'errors':>6}"
+    )
+    for label, s in report.items():
+        print(
+            f"{label:<38} {s['requests']:>8,} {s['rps']:>9.1f} {s['p50_ms']:>8.2f}"
+            f" {s['p95_ms']:>8.2f} {s['p99_ms']:>8.2f}"
+            f" {s['rejected_rate']:>6.1%} {s['error_rate']:>6.1%}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="base URL of a running server")
+    parser.add_argument("--app", choices=("sync", "async"), default="sync")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"default {DEFAULT_MIX}")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--horizon-days", type=int, default=180, help="book stays up to this far ahead"
+    )
+    parser.add_argument("--output", type=Path, help="also write the report as JSON")
+    args = parser.parse_args()
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    if args.url:
+        report = asyncio.run(drive(args, mix))
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.environ["HOTEL_DATABASE_URL"] = f"sqlite:///{Path(tmp) / 'load.db'}"
+            report = asyncio.run(drive(args, mix))
+    if not report:
+        sys.exit("no requests completed")
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Async variant of the API served on SQLAlchemy's asyncio extension.
+
+Endpoints mirror ``api.main`` but are ``async def`` and await an aiosqlite
+connection instead of holding a thread-pool worker. Serve it with
+``uvicorn api.async_main:app``.
+"""
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from datetime import date
+from typing import AsyncIterator, Optional
+
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from domain.services import BookingPolicy, InvalidTransition
+from infrastructure.async_repositories import (
+    AsyncSqlBookingRepository,
+    AsyncSqlGuestRepository,
+    AsyncSqlRoomRepository,
+)
+from infrastructure import query_stats
+from infrastructure.db import (
+    create_async_session_factory,
+    get_async_engine,
+    init_db_async,
+    to_async_url,
+)
+from application.async_use_cases import AsyncBookingService
+
+from .metrics import Metrics, MetricsMiddleware, profiler_for
+from .pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    next_page_headers,
+    parse_cursor,
+)
+from .schemas import BookingIn, BookingOut, GuestIn, GuestOut, RoomOut
+from .serialization import (
+    booking_response,
+    bookings_response,
+    guest_response,
+    rooms_response,
+)
+from .settings import Settings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    settings = Settings.from_env()
+    engine = get_async_engine(
+        to_async_url(settings.database_url),
+        pool_size=settings.pool_size,
+        max_overflow=settings.max_overflow,
+        pool_timeout=settings.pool_timeout,
+        slow_query_ms=settings.slow_query_ms,
+    )
+    query_stats.track(engine)
+    await init_db_async(engine)
+    app.state.engine = engine
+    metrics.profiler = profiler_for(settings)
+    app.state.session_factory = create_async_session_factory(engine)
+    try:
+        yield
+    finally:
+        await engine.dispose()
+
+
+metrics = Metrics()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    return metrics.response()
+
+
+@app.get("/debug/sql-profile", include_in_schema=False)
+async def get_sql_profile():
+    return metrics.sql_profile()
+
+
+async def get_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """Provide one session per request and commit or roll back at the end."""
+    async with request.app.state.session_factory() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+def get_booking_service(
+    session: AsyncSession = Depends(get_session, scope="function"),
+) -> AsyncBookingService:
+    return AsyncBookingService(
+        AsyncSqlBookingRepository(session),
+        AsyncSqlGuestRepository(session),
+        AsyncSqlRoomRepository(session),
+        BookingPolicy(),
+    )
+
+
+@app.post("/bookings", response_model=BookingOut)
+async def create_booking(
+    data: BookingIn,
+    booking_service: AsyncBookingService = Depends(get_booking_service),
+):
+    try:
+        booking = await booking_service.create_booking(data.to_request())
+        return booking_response(booking)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@app.get("/bookings/{reference}", response_model=BookingOut)
+async def get_booking(
+    reference: str,
+    booking_service: AsyncBookingService = Depends(get_booking_service),
+):
+    booking = await booking_service.get_booking(reference)
+    if not booking:
+        raise HTTPException(status_code=404, detail="Not found")
+    return booking_response(booking)
+
+
+@app.delete("/bookings/{reference}")
+async def cancel_booking(
+    reference: str,
+    booking_service: AsyncBookingService = Depends(get_booking_service),
+):
+    try:
+        await booking_service.cancel_booking(reference)
+        return {"status": "cancelled"}
+    except InvalidTransition as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Not found")
+
+
+@app.get("/rooms", response_model=list[RoomOut])
+async def list_rooms(
+    booking_service: AsyncBookingService = Depends(get_booking_service),
+):
+    rooms = await booking_service.list_rooms()
+    return rooms_response(rooms)
+
+
+@app.get("/rooms/availability", response_model=list[RoomOut])
+async def check_availability(
+    start: date,
+    end: date,
+    booking_service: AsyncBookingService = Depends(get_booking_service),
+):
+    rooms = await booking_service.available_rooms(start, end)
+    return rooms_response(rooms)
+
+
+@app.post("/bookings/{reference}/check-in", response_model=BookingOut)
+async def check_in(
+    reference: str,
+    booking_service: AsyncBookingService = Depends(get_booking_service),
+):
+    try:
+        booking = await booking_service.check_in_booking(reference)
+        return booking_response(booking)
+    except InvalidTransition as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Not found")
+
+
+@app.post("/bookings/{reference}/check-out", response_model=BookingOut)
+async def check_out(
+    reference: str,
+    booking_service: AsyncBookingService = Depends(get_booking_service),
+):
+    try:
+        booking = await booking_service.check_out_booking(reference)
+        return booking_response(booking)
+    except InvalidTransition as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Not found")
+
+
+@app.get("/guests/{guest_id}/bookings", response_model=list[BookingOut])
+async def guest_history(
+    guest_id: str,
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    booking_service: AsyncBookingService = Depends(get_booking_service),
+):
+    # Without limit or cursor the whole history comes back, as it always has.
+    if limit is None and cursor is None:
+        return bookings_response(await booking_service.list_guest_bookings(guest_id))
+    page = await booking_service.page_guest_bookings(
+        guest_id, limit or DEFAULT_PAGE_SIZE, parse_cursor(cursor)
+    )
+    return bookings_response(
+        page.bookings, next_page_headers(request, page.next_key)
+    )
+
+
+@app.post("/guests", response_model=GuestOut)
+async def create_guest(
+    data: GuestIn,
+    booking_service: AsyncBookingService = Depends(get_booking_service),
+):
+    try:
+        guest = await booking_service.create_guest(
+            data.id, data.first_name, data.last_name, data.date_of_birth
+        )
+        return guest_response(guest)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import csv
+import io
+from typing import Iterable, Iterator
+
+from domain.entities import Booking
+
+from .schemas import BookingOut
+from .serialization import booking_dict, booking_json
+
+EXPORT_FIELDS = list(BookingOut.model_fields)
+
+
+def ndjson_chunks(
+    bookings: Iterable[Booking], rows_per_chunk: int = 500
+) -> Iterator[str]:
+    """Yield newline-delimited JSON, ``rows_per_chunk`` bookings at a time."""
+    lines = []
+    for booking in bookings:
+        lines.append(booking_json(booking).decode())
+        if len(lines) >= rows_per_chunk:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def csv_chunks(bookings: Iterable[Booking], rows_per_chunk: int = 500) -> Iterator[str]:
+    """Yield CSV with a header row, ``rows_per_chunk`` bookings at a time."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    rows = 0
+    for booking in bookings:
+        writer.writerow(booking_dict(booking))
+        rows += 1
+        if rows >= rows_per_chunk:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            rows = 0
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -1,169 +1,503 @@
 from __future__ import annotations
 
-from datetime import date, datetime
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+import math
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from datetime import date
+from typing import (
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Union,
+)
 
-from domain.services import BookingPolicy
-from domain.entities import RoomType
-from infrastructure.db import create_session, get_engine, init_db
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from domain.availability import RoomIntervalIndex
+from domain.entities import Booking
+from domain.services import BookingPolicy, InvalidTransition
+from domain.repositories import BookingRepository, GuestRepository, RoomRepository
+from infrastructure.cached_repositories import (
+    CachedGuestRepository,
+    CachedRoomRepository,
+    GuestCache,
+    RoomCatalogCache,
+)
+from infrastructure import query_stats
+from infrastructure.db import create_session_factory, get_engine, init_db
+from infrastructure.indexed_repositories import (
+    IndexedBookingRepository,
+    OccupancyTrackingRepository,
+)
+from infrastructure.occupancy import OccupancyMatrix
+from infrastructure.quotes import QuoteEngine, RatePlan
 from infrastructure.repositories import (
     SqlBookingRepository,
     SqlGuestRepository,
     SqlRoomRepository,
 )
-from application.use_cases import BookingService, CreateBookingRequest
-
-app = FastAPI()
-
-engine = get_engine()
-init_db(engine)
-session = create_session(engine)
-booking_service = BookingService(
-    SqlBookingRepository(session),
-    SqlGuestRepository(session),
-    SqlRoomRepository(session),
-    BookingPolicy(),
+from application.group_commit import GroupCommitWriter
+from application.use_cases import (
+    BatchItemResult,
+    BookingService,
+    CreateBookingRequest,
+)
+
+from .export import csv_chunks, ndjson_chunks
+from .metrics import Metrics, MetricsMiddleware, profiler_for
+from .pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    next_page_headers,
+    parse_cursor,
+)
+from .schemas import (
+    AvailabilitySummaryOut,
+    BatchBookingIn,
+    BatchBookingOut,
+    BatchItemOut,
+    BookingIn,
+    BookingOut,
+    GuestIn,
+    GuestOut,
+    QuoteBatchIn,
+    QuoteBatchOut,
+    QuoteOut,
+    RoomOut,
+    RoomTypeAvailabilityOut,
+)
+from .serialization import (
+    booking_response,
+    bookings_response,
+    guest_response,
+    rooms_response,
 )
+from .settings import Settings
+
+
+@dataclass
+class Resources:
+    """Engine, session factory and in-process caches owned by one app run."""
+
+    engine: Engine
+    session_factory: sessionmaker[Session]
+    quote_engine: QuoteEngine
+    interval_index: Optional[RoomIntervalIndex] = None
+    room_cache: Optional[RoomCatalogCache] = None
+    guest_cache: Optional[GuestCache] = None
+    occupancy: Optional[OccupancyMatrix] = None
+    group_commit: Optional[GroupCommitWriter] = None
+
+    @classmethod
+    def open(cls, settings: Settings) -> Resources:
+        engine = get_engine(
+            settings.database_url,
+            pool_size=settings.pool_size,
+            max_overflow=settings.max_overflow,
+            pool_timeout=settings.pool_timeout,
+            slow_query_ms=settings.slow_query_ms,
+        )
+        query_stats.track(engine)
+        init_db(engine)
+        plan = RatePlan()
+        if settings.rates_file:
+            plan = RatePlan.from_file(settings.rates_file)
+        resources = cls(
+            engine,
+            create_session_factory(engine),
+            QuoteEngine(plan, date.today(), settings.quote_horizon_days),
+        )
+        if settings.interval_index:
+            resources.interval_index = RoomIntervalIndex()
+        if settings.room_cache_ttl > 0:
+            resources.room_cache = RoomCatalogCache(settings.room_cache_ttl)
+        if settings.guest_cache_size > 0:
+            resources.guest_cache = GuestCache(
+                settings.guest_cache_size, settings.guest_cache_ttl
+            )
+        if settings.occupancy_matrix:
+            with resources.session_factory() as session:
+                resources.occupancy = OccupancyMatrix.build(
+                    SqlRoomRepository(session).list_all(),
+                    SqlBookingRepository(session).list_between,
+                    date.today(),
+                    settings.occupancy_horizon_days,
+                )
+        if settings.group_commit:
+            resources.group_commit = GroupCommitWriter(
+                resources.write_bookings,
+                settings.group_commit_max_items,
+                settings.group_commit_max_delay_ms / 1000,
+            )
+            resources.group_commit.start()
+        return resources
+
+    def booking_service(self, session: Session) -> BookingService:
+        booking_repo: BookingRepository = SqlBookingRepository(session)
+        if self.occupancy is not None:
+            booking_repo = OccupancyTrackingRepository(booking_repo, self.occupancy)
+        if self.interval_index is not None:
+            booking_repo = IndexedBookingRepository(booking_repo, self.interval_index)
+        guest_repo: GuestRepository = SqlGuestRepository(session)
+        if self.guest_cache is not None:
+            guest_repo = CachedGuestRepository(guest_repo, self.guest_cache)
+        room_repo: RoomRepository = SqlRoomRepository(session)
+        if self.room_cache is not None:
+            room_repo = CachedRoomRepository(room_repo, self.room_cache)
+        return BookingService(
+            booking_repo, guest_repo, room_repo, BookingPolicy(), self.occupancy
+        )
+
+    def write_bookings(self, reqs: List[CreateBookingRequest]) -> List[BatchItemResult]:
+        """Create ``reqs`` in one transaction; the group-commit writer's batch."""
+        with self.session_factory() as session:
+            results = self.booking_service(session).create_bookings(reqs)
+            session.commit()
+        return results
+
+    def cache_stats(self) -> Dict[str, Callable[[], Dict[str, float]]]:
+        """The enabled caches' ``stats`` callables, by name, for ``/metrics``."""
+        caches = {"room": self.room_cache, "guest": self.guest_cache}
+        return {name: c.stats for name, c in caches.items() if c is not None}
+
+    def quotes(self) -> QuoteEngine:
+        """The quote engine, rebuilt once a day so its horizon keeps moving."""
+        today = date.today()
+        if self.quote_engine.origin != today:
+            current = self.quote_engine
+            self.quote_engine = QuoteEngine(current.plan, today, current.horizon_days)
+        return self.quote_engine
+
+    def close(self) -> None:
+        if self.group_commit is not None:
+            self.group_commit.close()
+        self.engine.dispose()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Connecting happens here rather than at import, so importing the module
+    # or spawning a worker never touches the database.
+    settings = Settings.from_env()
+    resources = await run_in_threadpool(Resources.open, settings)
+    app.state.resources = resources
+    metrics.profiler = profiler_for(settings)
+    metrics.caches = resources.cache_stats()
+    try:
+        yield
+    finally:
+        resources.close()
+
+
+metrics = Metrics()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    # Async, so it reads the counters on the loop thread that updates them.
+    return metrics.response()
+
 
+@app.get("/debug/sql-profile", include_in_schema=False)
+async def get_sql_profile():
+    return metrics.sql_profile()
 
-class BookingIn(BaseModel):
-    guest_id: str
-    first_name: str
-    last_name: str
-    date_of_birth: date
-    room_type: RoomType
-    room_number: str
-    number_of_guests: int
-    check_in: date
-    check_out: date
-    cancelled: bool = False
-    checked_in: bool = False
-    checked_out: bool = False
-    paid: bool = False
-
-
-class BookingOut(BaseModel):
-    reference: str
-    guest_id: str
-    first_name: str
-    last_name: str
-    date_of_birth: date
-    room_type: RoomType
-    room_number: str
-    number_of_guests: int
-    check_in: date
-    check_out: date
-    cancelled: bool
-    checked_in: bool
-    checked_out: bool
-    paid: bool
-    created_at: datetime
-
-
-class RoomOut(BaseModel):
-    number: str
-    room_type: RoomType
-
-
-class GuestIn(BaseModel):
-    id: str
-    first_name: str
-    last_name: str
-    date_of_birth: date
-
-
-class GuestOut(BaseModel):
-    id: str
-    first_name: str
-    last_name: str
-    date_of_birth: date
+
+def get_resources(request: Request) -> Resources:
+    return request.app.state.resources
+
+
+def get_session(
+    resources: Resources = Depends(get_resources),
+) -> Iterator[Session]:
+    """Provide one session per request and commit or roll back at the end."""
+    session = resources.session_factory()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def get_booking_service(
+    session: Session = Depends(get_session, scope="function"),
+    resources: Resources = Depends(get_resources),
+) -> BookingService:
+    return resources.booking_service(session)
+
+
+def get_booking_writer(
+    resources: Resources = Depends(get_resources),
+) -> Iterator[Union[GroupCommitWriter, BookingService]]:
+    """The group-commit writer when it is on, else a request-scoped service.
+
+    Grouped bookings commit on the writer's own sessions, so those requests
+    open no session of their own.
+    """
+    if resources.group_commit is not None:
+        yield resources.group_commit
+        return
+    with contextmanager(get_session)(resources) as session:
+        yield resources.booking_service(session)
 
 
 @app.post("/bookings", response_model=BookingOut)
-def create_booking(data: BookingIn):
+def create_booking(
+    data: BookingIn,
+    writer: Union[GroupCommitWriter, BookingService] = Depends(
+        get_booking_writer, scope="function"
+    ),
+):
     try:
-        booking = booking_service.create_booking(
-            CreateBookingRequest(
-                guest_id=data.guest_id,
-                first_name=data.first_name,
-                last_name=data.last_name,
-                date_of_birth=data.date_of_birth,
-                room_type=data.room_type,
-                room_number=data.room_number,
-                number_of_guests=data.number_of_guests,
-                check_in=data.check_in,
-                check_out=data.check_out,
-                cancelled=data.cancelled,
-                checked_in=data.checked_in,
-                checked_out=data.checked_out,
-                paid=data.paid,
-            )
+        return booking_response(writer.create_booking(data.to_request()))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@app.post("/bookings/batch", response_model=BatchBookingOut)
+def create_bookings_batch(
+    data: BatchBookingIn,
+    booking_service: BookingService = Depends(get_booking_service),
+):
+    try:
+        results = booking_service.create_bookings(
+            [b.to_request() for b in data.bookings]
         )
-        return BookingOut(**booking.__dict__)
     except ValueError as exc:
+        # A concurrent booking claimed one of the nights after validation.
         raise HTTPException(status_code=400, detail=str(exc))
+    items = [
+        BatchItemOut(
+            index=i,
+            status="created" if r.booking else "failed",
+            booking=BookingOut.from_entity(r.booking) if r.booking else None,
+            error=r.error,
+        )
+        for i, r in enumerate(results)
+    ]
+    created = sum(1 for r in results if r.booking)
+    return BatchBookingOut(
+        created=created, failed=len(results) - created, results=items
+    )
+
+
+def stream_bookings_between(
+    session_factory: sessionmaker[Session], start: date, end: date
+) -> Iterator[Booking]:
+    # The response body is produced after the endpoint returns, so the export
+    # owns a session for exactly as long as the stream is being read.
+    with session_factory() as session:
+        yield from SqlBookingRepository(session).iter_between(start, end)
+
+
+@app.get("/bookings/export")
+def export_bookings(
+    start: date,
+    end: date,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    resources: Resources = Depends(get_resources),
+):
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    bookings = stream_bookings_between(resources.session_factory, start, end)
+    filename = f"bookings_{start}_{end}.{format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if format == "csv":
+        return StreamingResponse(
+            csv_chunks(bookings), media_type="text/csv", headers=headers
+        )
+    return StreamingResponse(
+        ndjson_chunks(bookings), media_type="application/x-ndjson", headers=headers
+    )
+
+
+@app.get("/bookings", response_model=list[BookingOut])
+def list_bookings(
+    start: date,
+    end: date,
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    booking_service: BookingService = Depends(get_booking_service),
+):
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    page = booking_service.page_bookings_between(
+        start, end, limit, parse_cursor(cursor)
+    )
+    return bookings_response(
+        page.bookings, next_page_headers(request, page.next_key)
+    )
 
 
 @app.get("/bookings/{reference}", response_model=BookingOut)
-def get_booking(reference: str):
+def get_booking(
+    reference: str,
+    booking_service: BookingService = Depends(get_booking_service),
+):
     booking = booking_service.get_booking(reference)
     if not booking:
         raise HTTPException(status_code=404, detail="Not found")
-    return BookingOut(**booking.__dict__)
+    return booking_response(booking)
 
 
 @app.delete("/bookings/{reference}")
-def cancel_booking(reference: str):
+def cancel_booking(
+    reference: str,
+    booking_service: BookingService = Depends(get_booking_service),
+):
     try:
         booking_service.cancel_booking(reference)
         return {"status": "cancelled"}
+    except InvalidTransition as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
     except ValueError:
         raise HTTPException(status_code=404, detail="Not found")
 
 
 @app.get("/rooms", response_model=list[RoomOut])
-def list_rooms():
+def list_rooms(booking_service: BookingService = Depends(get_booking_service)):
     rooms = booking_service.list_rooms()
-    return [RoomOut(number=r.number, room_type=r.room_type) for r in rooms]
+    return rooms_response(rooms)
 
 
 @app.get("/rooms/availability", response_model=list[RoomOut])
-def check_availability(start: date, end: date):
+def check_availability(
+    start: date,
+    end: date,
+    booking_service: BookingService = Depends(get_booking_service),
+):
     rooms = booking_service.available_rooms(start, end)
-    return [RoomOut(number=r.number, room_type=r.room_type) for r in rooms]
+    return rooms_response(rooms)
+
+
+@app.get("/rooms/availability/summary", response_model=AvailabilitySummaryOut)
+def availability_summary(
+    start: date,
+    end: date,
+    booking_service: BookingService = Depends(get_booking_service),
+    resources: Resources = Depends(get_resources),
+):
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    counts = booking_service.availability_summary(start, end)
+    nights = (end - start).days
+    quotes = resources.quotes()
+    room_types = list(counts)
+    totals = quotes.quote_many(
+        room_types, [start] * len(room_types), [nights] * len(room_types)
+    )
+    return AvailabilitySummaryOut(
+        start=start,
+        end=end,
+        nights=nights,
+        room_types=[
+            RoomTypeAvailabilityOut(
+                room_type=room_type,
+                available=counts[room_type],
+                nightly_price=quotes.plan.base[room_type],
+                # Beyond the quote horizon, fall back to the flat base rate.
+                stay_price=(
+                    quotes.plan.base[room_type] * nights
+                    if math.isnan(total)
+                    else total
+                ),
+            )
+            for room_type, total in zip(room_types, totals.tolist())
+        ],
+    )
+
+
+@app.post("/quotes/batch", response_model=QuoteBatchOut)
+def quote_batch(data: QuoteBatchIn, resources: Resources = Depends(get_resources)):
+    quotes = data.quotes
+    totals = resources.quotes().quote_many(
+        [q.room_type for q in quotes],
+        [q.check_in for q in quotes],
+        [q.nights for q in quotes],
+    )
+    return QuoteBatchOut(
+        quotes=[
+            QuoteOut(
+                room_type=q.room_type,
+                check_in=q.check_in,
+                nights=q.nights,
+                total=None if math.isnan(total) else total,
+            )
+            for q, total in zip(quotes, totals.tolist())
+        ]
+    )
 
 
 @app.post("/bookings/{reference}/check-in", response_model=BookingOut)
-def check_in(reference: str):
+def check_in(
+    reference: str,
+    booking_service: BookingService = Depends(get_booking_service),
+):
     try:
         booking = booking_service.check_in_booking(reference)
-        return BookingOut(**booking.__dict__)
+        return booking_response(booking)
+    except InvalidTransition as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
     except ValueError:
         raise HTTPException(status_code=404, detail="Not found")
 
 
 @app.post("/bookings/{reference}/check-out", response_model=BookingOut)
-def check_out(reference: str):
+def check_out(
+    reference: str,
+    booking_service: BookingService = Depends(get_booking_service),
+):
     try:
         booking = booking_service.check_out_booking(reference)
-        return BookingOut(**booking.__dict__)
+        return booking_response(booking)
+    except InvalidTransition as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
     except ValueError:
         raise HTTPException(status_code=404, detail="Not found")
 
 
 @app.get("/guests/{guest_id}/bookings", response_model=list[BookingOut])
-def guest_history(guest_id: str):
-    bookings = booking_service.list_guest_bookings(guest_id)
-    return [BookingOut(**b.__dict__) for b in bookings]
+def guest_history(
+    guest_id: str,
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    booking_service: BookingService = Depends(get_booking_service),
+):
+    # Without limit or cursor the whole history comes back, as it always has.
+    if limit is None and cursor is None:
+        return bookings_response(booking_service.list_guest_bookings(guest_id))
+    page = booking_service.page_guest_bookings(
+        guest_id, limit or DEFAULT_PAGE_SIZE, parse_cursor(cursor)
+    )
+    return bookings_response(
+        page.bookings, next_page_headers(request, page.next_key)
+    )
 
 
 @app.post("/guests", response_model=GuestOut)
-def create_guest(data: GuestIn):
+def create_guest(
+    data: GuestIn,
+    booking_service: BookingService = Depends(get_booking_service),
+):
     try:
         guest = booking_service.create_guest(
             data.id, data.first_name, data.last_name, data.date_of_birth
         )
-        return GuestOut(**guest.__dict__)
+        return guest_response(guest)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
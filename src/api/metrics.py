@@ -0,0 +1,199 @@
+"""Request metrics in the Prometheus text exposition format.
+
+``MetricsMiddleware`` is plain ASGI middleware: per request it reads a clock
+twice, opens a ``query_stats.collect()`` scope and updates a few counters,
+all on the event loop thread, so no locks are needed. Latency, SQL statement
+and database time histograms are labelled with the route template, e.g.
+``/bookings/{reference}``, never the raw path, and requests that match no
+route share one label, so the number of series stays bounded.
+
+When ``Metrics.profiler`` is set, each request's statement fingerprints are
+also passed on to it. Caches registered in ``Metrics.caches`` have their
+``stats()`` rendered as ``hotel_cache_*`` series labelled with the cache name.
+"""
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response
+
+from infrastructure import query_stats
+from infrastructure.profiling import StatementProfiler
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+UNMATCHED = "<unmatched>"
+# Cache ``stats()`` keys as (key, metric name, type, help).
+CACHE_SERIES = (
+    ("hits", "hotel_cache_hits_total", "counter", "Lookups served from the cache."),
+    ("misses", "hotel_cache_misses_total", "counter", "Lookups that missed."),
+    ("evictions", "hotel_cache_evictions_total", "counter", "Entries evicted."),
+    ("size", "hotel_cache_entries", "gauge", "Entries currently cached."),
+    ("hit_rate", "hotel_cache_hit_ratio", "gauge", "Share of lookups that hit."),
+)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative bucket counts in the Prometheus style."""
+
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def samples(self, name: str, labels: Labels) -> Iterable[str]:
+        cumulative = 0
+        bounds = [repr(float(b)) for b in self.buckets] + ["+Inf"]
+        for bound, count in zip(bounds, self.counts):
+            cumulative += count
+            yield _sample(f"{name}_bucket", labels + (("le", bound),), cumulative)
+        yield _sample(f"{name}_sum", labels, self.total)
+        yield _sample(f"{name}_count", labels, self.count)
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self.in_progress = 0
+        self.responses: Dict[Labels, int] = defaultdict(int)
+        self.latency: Dict[Labels, Histogram] = {}
+        self.statements: Dict[Labels, Histogram] = {}
+        self.db_seconds: Dict[Labels, Histogram] = {}
+        self.profiler: Optional[StatementProfiler] = None
+        self.caches: Dict[str, Callable[[], Dict[str, float]]] = {}
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        seconds: float,
+        stats: query_stats.QueryStats,
+    ) -> None:
+        labels = (("method", method), ("route", route))
+        self.responses[labels + (("status", str(status)),)] += 1
+        latency = self.latency.get(labels)
+        if latency is None:
+            latency = self.latency[labels] = Histogram(LATENCY_BUCKETS)
+            self.statements[labels] = Histogram(STATEMENT_BUCKETS)
+            self.db_seconds[labels] = Histogram(LATENCY_BUCKETS)
+        latency.observe(seconds)
+        self.statements[labels].observe(stats.statements)
+        self.db_seconds[labels].observe(stats.seconds)
+
+    def render(self) -> str:
+        lines: List[str] = [
+            "# HELP hotel_http_requests_in_progress Requests being served.",
+            "# TYPE hotel_http_requests_in_progress gauge",
+            _sample("hotel_http_requests_in_progress", (), self.in_progress),
+            "# HELP hotel_http_responses_total Responses by route and status.",
+            "# TYPE hotel_http_responses_total counter",
+        ]
+        for labels, count in sorted(self.responses.items()):
+            lines.append(_sample("hotel_http_responses_total", labels, count))
+        for name, help_text, series in (
+            (
+                "hotel_http_request_duration_seconds",
+                "Time to serve a request.",
+                self.latency,
+            ),
+            (
+                "hotel_db_statements_per_request",
+                "SQL statements executed per request.",
+                self.statements,
+            ),
+            (
+                "hotel_db_seconds_per_request",
+                "Time spent in SQL statements per request.",
+                self.db_seconds,
+            ),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in sorted(series.items()):
+                lines.extend(histogram.samples(name, labels))
+        stats = {cache: read() for cache, read in sorted(self.caches.items())}
+        for key, name, kind, help_text in CACHE_SERIES:
+            samples = [
+                _sample(name, (("cache", cache),), values[key])
+                for cache, values in stats.items()
+                if key in values
+            ]
+            if samples:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+    def response(self) -> Response:
+        return Response(self.render(), media_type=CONTENT_TYPE)
+
+    def sql_profile(self) -> dict:
+        if self.profiler is None:
+            raise HTTPException(status_code=404, detail="SQL profiling is off")
+        return self.profiler.report()
+
+
+def profiler_for(settings) -> Optional[StatementProfiler]:
+    if not settings.sql_profile:
+        return None
+    return StatementProfiler(settings.n_plus_one_threshold)
+
+
+class MetricsMiddleware:
+    def __init__(self, app, metrics: Metrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics = self.metrics
+        profiler = metrics.profiler
+        metrics.in_progress += 1
+        began = time.perf_counter()
+        try:
+            with query_stats.collect(shapes=profiler is not None) as stats:
+                await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.in_progress -= 1
+            method = scope["method"]
+            route = getattr(scope.get("route"), "path", UNMATCHED)
+            metrics.observe(
+                method, route, status, time.perf_counter() - began, stats
+            )
+            if profiler is not None:
+                profiler.observe(f"{method} {route}", stats)
+
+
+def _sample(name: str, labels: Labels, value: float) -> str:
+    if labels:
+        inner = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+        return f"{name}{{{inner}}} {value}"
+    return f"{name} {value}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
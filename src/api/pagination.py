@@ -0,0 +1,51 @@
+"""Opaque cursors for keyset-paginated listings.
+
+A cursor encodes the ``(check_in, reference)`` key of the last booking on a
+page. Clients pass it back unchanged to get the next page; the server seeks
+straight to that key instead of skipping rows with OFFSET.
+"""
+from __future__ import annotations
+
+import base64
+import json
+from datetime import date
+from typing import Dict, Optional
+
+from fastapi import HTTPException, Request
+
+from domain.repositories import PageKey
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(key: PageKey) -> str:
+    raw = json.dumps([key[0].isoformat(), key[1]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> PageKey:
+    """Return the key in ``cursor``; raise ``ValueError`` if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        check_in, reference = json.loads(base64.urlsafe_b64decode(padded))
+        return date.fromisoformat(check_in), str(reference)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def parse_cursor(cursor: Optional[str]) -> Optional[PageKey]:
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def next_page_headers(request: Request, key: Optional[PageKey]) -> Dict[str, str]:
+    if key is None:
+        return {}
+    cursor = encode_cursor(key)
+    url = request.url.include_query_params(cursor=cursor)
+    return {"X-Next-Cursor": cursor, "Link": f'<{url}>; rel="next"'}
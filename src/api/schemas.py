@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from application.use_cases import CreateBookingRequest
+from domain.entities import Booking, Guest, RoomType
+
+
+class BookingIn(BaseModel):
+    guest_id: str
+    first_name: str
+    last_name: str
+    date_of_birth: date
+    room_type: RoomType
+    room_number: str
+    number_of_guests: int
+    check_in: date
+    check_out: date
+    cancelled: bool = False
+    checked_in: bool = False
+    checked_out: bool = False
+    paid: bool = False
+
+    def to_request(self) -> CreateBookingRequest:
+        return CreateBookingRequest(
+            guest_id=self.guest_id,
+            first_name=self.first_name,
+            last_name=self.last_name,
+            date_of_birth=self.date_of_birth,
+            room_type=self.room_type,
+            room_number=self.room_number,
+            number_of_guests=self.number_of_guests,
+            check_in=self.check_in,
+            check_out=self.check_out,
+            cancelled=self.cancelled,
+            checked_in=self.checked_in,
+            checked_out=self.checked_out,
+            paid=self.paid,
+        )
+
+
+class BookingOut(BaseModel):
+    reference: str
+    guest_id: str
+    first_name: str
+    last_name: str
+    date_of_birth: date
+    room_type: RoomType
+    room_number: str
+    number_of_guests: int
+    check_in: date
+    check_out: date
+    cancelled: bool
+    checked_in: bool
+    checked_out: bool
+    paid: bool
+    created_at: datetime
+
+    # Entities are slotted and have no ``__dict__`` to unpack; pydantic reads
+    # their attributes directly instead, without an intermediate dict.
+    model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def from_entity(cls, booking: Booking) -> "BookingOut":
+        return cls.model_validate(booking)
+
+
+MAX_BATCH_SIZE = 1000
+
+
+class BatchBookingIn(BaseModel):
+    bookings: list[BookingIn] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class BatchItemOut(BaseModel):
+    index: int
+    status: Literal["created", "failed"]
+    booking: Optional[BookingOut] = None
+    error: Optional[str] = None
+
+
+class BatchBookingOut(BaseModel):
+    created: int
+    failed: int
+    results: list[BatchItemOut]
+
+
+class RoomOut(BaseModel):
+    number: str
+    room_type: RoomType
+
+
+class RoomTypeAvailabilityOut(BaseModel):
+    room_type: RoomType
+    available: int
+    nightly_price: int
+    stay_price: float
+
+
+class AvailabilitySummaryOut(BaseModel):
+    start: date
+    end: date
+    nights: int
+    room_types: list[RoomTypeAvailabilityOut]
+
+
+MAX_QUOTE_BATCH = 10_000
+
+
+class QuoteIn(BaseModel):
+    room_type: RoomType
+    check_in: date
+    nights: int = Field(ge=1)
+
+
+class QuoteBatchIn(BaseModel):
+    quotes: list[QuoteIn] = Field(min_length=1, max_length=MAX_QUOTE_BATCH)
+
+
+class QuoteOut(BaseModel):
+    room_type: RoomType
+    check_in: date
+    nights: int
+    # None when the stay is outside the priced horizon.
+    total: Optional[float]
+
+
+class QuoteBatchOut(BaseModel):
+    quotes: list[QuoteOut]
+
+
+class GuestIn(BaseModel):
+    id: str
+    first_name: str
+    last_name: str
+    date_of_birth: date
+
+
+class GuestOut(BaseModel):
+    id: str
+    first_name: str
+    last_name: str
+    date_of_birth: date
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def from_entity(cls, guest: Guest) -> "GuestOut":
+        return cls.model_validate(guest)
@@ -0,0 +1,54 @@
+"""Encode domain entities straight to JSON response bodies.
+
+Returning pydantic models from an endpoint costs two passes per object:
+FastAPI validates the return value against ``response_model`` again, then
+serializes it. The helpers here build the body in a single pass instead, with
+pydantic-core encoding the entity dataclasses directly, and return a
+``Response``, which FastAPI sends as is. Endpoints keep ``response_model``
+for the OpenAPI schema only. This relies on each entity having exactly the
+fields of its ``*Out`` schema, which the tests check.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from domain.entities import Booking, Guest, Room
+
+_booking = TypeAdapter(Booking)
+_bookings = TypeAdapter(List[Booking])
+_guest = TypeAdapter(Guest)
+_rooms = TypeAdapter(List[Room])
+
+
+def json_response(body: bytes, headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def booking_json(booking: Booking) -> bytes:
+    return _booking.dump_json(booking)
+
+
+def booking_dict(booking: Booking) -> dict:
+    """JSON-compatible field values, e.g. for a CSV row."""
+    return _booking.dump_python(booking, mode="json")
+
+
+def booking_response(booking: Booking) -> Response:
+    return json_response(_booking.dump_json(booking))
+
+
+def bookings_response(
+    bookings: Iterable[Booking], headers: Optional[Dict[str, str]] = None
+) -> Response:
+    return json_response(_bookings.dump_json(list(bookings)), headers)
+
+
+def guest_response(guest: Guest) -> Response:
+    return json_response(_guest.dump_json(guest))
+
+
+def rooms_response(rooms: Iterable[Room]) -> Response:
+    return json_response(_rooms.dump_json(list(rooms)))
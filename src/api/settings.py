@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if not value:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class Settings:
+    database_url: str = "sqlite:///./hotel.db"
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: int = 30
+    # In-memory indexes are per process; only enable them with a single worker.
+    interval_index: bool = False
+    occupancy_matrix: bool = False
+    occupancy_horizon_days: int = 730
+    # Seconds a cached room catalog stays fresh; 0 disables the cache.
+    room_cache_ttl: float = 60.0
+    # Maximum number of cached guests; 0 disables the guest cache.
+    guest_cache_size: int = 10_000
+    guest_cache_ttl: float = 300.0
+    # JSON rate plan for quotes; empty means flat RoomType prices.
+    rates_file: str = ""
+    quote_horizon_days: int = 730
+    # Commit concurrent POST /bookings together; see application.group_commit.
+    group_commit: bool = False
+    group_commit_max_items: int = 256
+    group_commit_max_delay_ms: float = 2.0
+    # Log statements slower than this with their plans; 0 disables the log.
+    slow_query_ms: float = 0.0
+    # Profile statement shapes per route at /debug/sql-profile.
+    sql_profile: bool = False
+    n_plus_one_threshold: int = 5
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Build settings from ``HOTEL_*`` environment variables."""
+        return cls(
+            database_url=os.environ.get("HOTEL_DATABASE_URL", cls.database_url),
+            pool_size=_env_int("HOTEL_DB_POOL_SIZE", cls.pool_size),
+            max_overflow=_env_int("HOTEL_DB_MAX_OVERFLOW", cls.max_overflow),
+            pool_timeout=_env_int("HOTEL_DB_POOL_TIMEOUT", cls.pool_timeout),
+            interval_index=_env_bool("HOTEL_INTERVAL_INDEX", cls.interval_index),
+            occupancy_matrix=_env_bool(
+                "HOTEL_OCCUPANCY_MATRIX", cls.occupancy_matrix
+            ),
+            occupancy_horizon_days=_env_int(
+                "HOTEL_OCCUPANCY_HORIZON_DAYS", cls.occupancy_horizon_days
+            ),
+            room_cache_ttl=_env_float("HOTEL_ROOM_CACHE_TTL", cls.room_cache_ttl),
+            guest_cache_size=_env_int("HOTEL_GUEST_CACHE_SIZE", cls.guest_cache_size),
+            guest_cache_ttl=_env_float("HOTEL_GUEST_CACHE_TTL", cls.guest_cache_ttl),
+            rates_file=os.environ.get("HOTEL_RATES_FILE", cls.rates_file),
+            quote_horizon_days=_env_int(
+                "HOTEL_QUOTE_HORIZON_DAYS", cls.quote_horizon_days
+            ),
+            group_commit=_env_bool("HOTEL_GROUP_COMMIT", cls.group_commit),
+            group_commit_max_items=_env_int(
+                "HOTEL_GROUP_COMMIT_MAX_ITEMS", cls.group_commit_max_items
+            ),
+            group_commit_max_delay_ms=_env_float(
+                "HOTEL_GROUP_COMMIT_MAX_DELAY_MS", cls.group_commit_max_delay_ms
+            ),
+            slow_query_ms=_env_float("HOTEL_SLOW_QUERY_MS", cls.slow_query_ms),
+            sql_profile=_env_bool("HOTEL_SQL_PROFILE", cls.sql_profile),
+            n_plus_one_threshold=_env_int(
+                "HOTEL_N_PLUS_ONE_THRESHOLD", cls.n_plus_one_threshold
+            ),
+        )
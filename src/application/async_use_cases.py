@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import List, Optional
+
+from domain.entities import Booking, Guest, Room
+from domain.repositories import (
+    AsyncBookingRepository,
+    AsyncGuestRepository,
+    AsyncRoomRepository,
+    PageKey,
+)
+from domain.services import BookingPolicy
+
+from .use_cases import (
+    BookingPage,
+    CreateBookingRequest,
+    to_page,
+    transition_error,
+)
+
+
+class AsyncBookingService:
+    """``BookingService`` for the asyncio repositories.
+
+    Business rules are shared with the sync service through
+    ``CreateBookingRequest`` and ``BookingPolicy``; only I/O is awaited.
+    """
+
+    def __init__(
+        self,
+        booking_repo: AsyncBookingRepository,
+        guest_repo: AsyncGuestRepository,
+        room_repo: AsyncRoomRepository,
+        policy: BookingPolicy,
+    ) -> None:
+        self.booking_repo = booking_repo
+        self.guest_repo = guest_repo
+        self.room_repo = room_repo
+        self.policy = policy
+
+    async def create_booking(self, req: CreateBookingRequest) -> Booking:
+        guest = await self.guest_repo.get(req.guest_id)
+        if guest is None:
+            guest = req.new_guest()
+            await self.guest_repo.add(guest)
+        else:
+            req.check_guest(guest)
+
+        req.check_room(await self.room_repo.get(req.room_number))
+        booking = req.new_booking()
+        self.policy.validate_stay(guest, booking)
+        if await self.booking_repo.has_conflict(
+            booking.room_number, booking.check_in, booking.check_out
+        ):
+            raise ValueError("Room already booked for these dates")
+        await self.booking_repo.add(booking)
+        return booking
+
+    async def get_booking(self, reference: str) -> Booking | None:
+        return await self.booking_repo.get(reference)
+
+    async def list_guest_bookings(self, guest_id: str) -> List[Booking]:
+        return await self.booking_repo.list_for_guest(guest_id)
+
+    async def page_guest_bookings(
+        self, guest_id: str, limit: int, after: Optional[PageKey] = None
+    ) -> BookingPage:
+        rows = await self.booking_repo.page_for_guest(guest_id, limit + 1, after)
+        return to_page(rows, limit)
+
+    async def cancel_booking(self, reference: str) -> None:
+        if await self.booking_repo.cancel(reference) is None:
+            current = await self.booking_repo.get(reference)
+            raise transition_error(current, "cancelled")
+
+    async def check_in_booking(self, reference: str) -> Booking:
+        booking = await self.booking_repo.check_in(reference)
+        if booking is None:
+            current = await self.booking_repo.get(reference)
+            raise transition_error(current, "checked in")
+        return booking
+
+    async def check_out_booking(self, reference: str) -> Booking:
+        booking = await self.booking_repo.check_out(reference)
+        if booking is None:
+            current = await self.booking_repo.get(reference)
+            raise transition_error(current, "checked out")
+        return booking
+
+    async def list_rooms(self) -> List[Room]:
+        return await self.room_repo.list_all()
+
+    async def available_rooms(self, start: date, end: date) -> List[Room]:
+        booked = await self.booking_repo.booked_room_numbers(start, end)
+        rooms = await self.room_repo.list_all()
+        return [r for r in rooms if r.number not in booked]
+
+    async def create_guest(
+        self, guest_id: str, first_name: str, last_name: str, date_of_birth: date
+    ) -> Guest:
+        if await self.guest_repo.get(guest_id):
+            raise ValueError("Guest already exists")
+        guest = Guest(
+            id=guest_id,
+            first_name=first_name,
+            last_name=last_name,
+            date_of_birth=date_of_birth,
+        )
+        await self.guest_repo.add(guest)
+        return guest
@@ -3,11 +3,17 @@ from __future__ import annotations
 from dataclasses import dataclass
 import uuid
 from datetime import date, datetime
-from typing import List
+from typing import Dict, List, Optional, Protocol
 
-from domain.entities import Booking, Guest, RoomType
-from domain.repositories import BookingRepository, GuestRepository, RoomRepository
-from domain.services import BookingPolicy
+from domain.availability import IntervalSet
+from domain.entities import Booking, Guest, Room, RoomType
+from domain.repositories import (
+    BookingRepository,
+    GuestRepository,
+    PageKey,
+    RoomRepository,
+)
+from domain.services import BookingPolicy, InvalidTransition
 
 
 @dataclass
@@ -27,6 +33,84 @@ class CreateBookingRequest:
     checked_out: bool = False
     paid: bool = False
 
+    def new_guest(self) -> Guest:
+        return Guest(
+            id=self.guest_id,
+            first_name=self.first_name,
+            last_name=self.last_name,
+            date_of_birth=self.date_of_birth,
+        )
+
+    def check_guest(self, guest: Guest) -> None:
+        if (
+            guest.first_name != self.first_name
+            or guest.last_name != self.last_name
+            or guest.date_of_birth != self.date_of_birth
+        ):
+            raise ValueError("Guest details mismatch")
+
+    def check_room(self, room: Room | None) -> None:
+        if room is None:
+            raise ValueError("Room not found")
+        if room.room_type != self.room_type:
+            raise ValueError("Room type mismatch")
+
+    def new_booking(self) -> Booking:
+        return Booking(
+            reference=str(uuid.uuid4())[:10],
+            guest_id=self.guest_id,
+            first_name=self.first_name,
+            last_name=self.last_name,
+            date_of_birth=self.date_of_birth,
+            room_type=self.room_type,
+            room_number=self.room_number,
+            number_of_guests=self.number_of_guests,
+            check_in=self.check_in,
+            check_out=self.check_out,
+            cancelled=self.cancelled,
+            checked_in=self.checked_in,
+            checked_out=self.checked_out,
+            paid=self.paid,
+            created_at=datetime.utcnow(),
+        )
+
+
+@dataclass
+class BatchItemResult:
+    booking: Optional[Booking] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class BookingPage:
+    bookings: List[Booking]
+    next_key: Optional[PageKey] = None
+
+
+def to_page(rows: List[Booking], limit: int) -> BookingPage:
+    """Cut ``limit + 1`` fetched rows down to a page and its next key.
+
+    Fetching one row past the limit tells whether another page exists
+    without a separate COUNT query.
+    """
+    if len(rows) <= limit:
+        return BookingPage(rows)
+    last = rows[limit - 1]
+    return BookingPage(rows[:limit], (last.check_in, last.reference))
+
+
+class OccupancyView(Protocol):
+    def roll_to(self, origin: date, list_between) -> None: ...
+
+    def free_rooms(self, start: date, end: date) -> Optional[List[Room]]: ...
+
+
+def transition_error(current: Optional[Booking], action: str) -> ValueError:
+    """Explain a refused transition; only failures pay for looking it up."""
+    if current is None:
+        return ValueError("Booking not found")
+    return InvalidTransition(f"Booking cannot be {action} in its current state")
+
 
 class BookingService:
     def __init__(
@@ -35,93 +119,149 @@ class BookingService:
         guest_repo: GuestRepository,
         room_repo: RoomRepository,
         policy: BookingPolicy,
+        occupancy: Optional[OccupancyView] = None,
     ) -> None:
         self.booking_repo = booking_repo
         self.guest_repo = guest_repo
         self.room_repo = room_repo
         self.policy = policy
+        self.occupancy = occupancy
 
     def create_booking(self, req: CreateBookingRequest) -> Booking:
         guest = self.guest_repo.get(req.guest_id)
         if guest is None:
-            guest = Guest(
-                id=req.guest_id,
-                first_name=req.first_name,
-                last_name=req.last_name,
-                date_of_birth=req.date_of_birth,
-            )
+            guest = req.new_guest()
             self.guest_repo.add(guest)
         else:
-            if (
-                guest.first_name != req.first_name
-                or guest.last_name != req.last_name
-                or guest.date_of_birth != req.date_of_birth
-            ):
-                raise ValueError("Guest details mismatch")
-
-        room = self.room_repo.get(req.room_number)
-        if room is None:
-            raise ValueError("Room not found")
-        if room.room_type != req.room_type:
-            raise ValueError("Room type mismatch")
-        existing = self.booking_repo.list_for_room(req.room_number)
-        booking = Booking(
-            reference=str(uuid.uuid4())[:10],
-            guest_id=req.guest_id,
-            first_name=req.first_name,
-            last_name=req.last_name,
-            date_of_birth=req.date_of_birth,
-            room_type=req.room_type,
-            room_number=req.room_number,
-            number_of_guests=req.number_of_guests,
-            check_in=req.check_in,
-            check_out=req.check_out,
-            cancelled=req.cancelled,
-            checked_in=req.checked_in,
-            checked_out=req.checked_out,
-            paid=req.paid,
-            created_at=datetime.utcnow(),
-        )
-        self.policy.validate_new_booking(guest, existing, booking)
+            req.check_guest(guest)
+
+        req.check_room(self.room_repo.get(req.room_number))
+        booking = req.new_booking()
+        self.policy.validate_stay(guest, booking)
+        self.policy.validate_availability(self.booking_repo, booking)
         self.booking_repo.add(booking)
         return booking
 
+    def create_bookings(
+        self, reqs: List[CreateBookingRequest]
+    ) -> List[BatchItemResult]:
+        """Validate and insert a batch of bookings with bulk reads and writes.
+
+        Each item succeeds or fails on its own, and items are checked for
+        conflicts with earlier items in the same batch as well as with stored
+        bookings. Guests and rooms are prefetched in one query each and all
+        new rows are inserted with a single executemany per table.
+        """
+        if not reqs:
+            return []
+        guests = self.guest_repo.get_many(r.guest_id for r in reqs)
+        rooms = self.room_repo.get_many(r.room_number for r in reqs)
+        taken: Dict[str, IntervalSet] = {}
+        for existing in self.booking_repo.list_active_for_rooms(
+            rooms.keys(),
+            min(r.check_in for r in reqs),
+            max(r.check_out for r in reqs),
+        ):
+            taken.setdefault(existing.room_number, IntervalSet()).add(
+                existing.reference, existing.check_in, existing.check_out
+            )
+
+        new_guests: List[Guest] = []
+        new_bookings: List[Booking] = []
+        results: List[BatchItemResult] = []
+        for req in reqs:
+            try:
+                guest = guests.get(req.guest_id)
+                if guest is None:
+                    guest = req.new_guest()
+                else:
+                    req.check_guest(guest)
+                req.check_room(rooms.get(req.room_number))
+                booking = req.new_booking()
+                self.policy.validate_stay(guest, booking)
+                intervals = taken.setdefault(booking.room_number, IntervalSet())
+                if intervals.overlaps(booking.check_in, booking.check_out):
+                    raise ValueError("Room already booked for these dates")
+                if not booking.cancelled:
+                    intervals.add(
+                        booking.reference, booking.check_in, booking.check_out
+                    )
+            except ValueError as exc:
+                results.append(BatchItemResult(error=str(exc)))
+                continue
+            if req.guest_id not in guests:
+                guests[req.guest_id] = guest
+                new_guests.append(guest)
+            new_bookings.append(booking)
+            results.append(BatchItemResult(booking=booking))
+
+        self.guest_repo.add_many(new_guests)
+        self.booking_repo.add_many(new_bookings)
+        return results
+
     def get_booking(self, reference: str) -> Booking | None:
         return self.booking_repo.get(reference)
 
     def list_guest_bookings(self, guest_id: str) -> List[Booking]:
         return self.booking_repo.list_for_guest(guest_id)
 
+    def page_guest_bookings(
+        self, guest_id: str, limit: int, after: Optional[PageKey] = None
+    ) -> BookingPage:
+        rows = self.booking_repo.page_for_guest(guest_id, limit + 1, after)
+        return to_page(rows, limit)
+
+    def page_bookings_between(
+        self, start: date, end: date, limit: int, after: Optional[PageKey] = None
+    ) -> BookingPage:
+        rows = self.booking_repo.page_between(start, end, limit + 1, after)
+        return to_page(rows, limit)
+
     def cancel_booking(self, reference: str) -> None:
-        booking = self.booking_repo.get(reference)
-        if not booking:
-            raise ValueError("Booking not found")
-        self.booking_repo.remove(reference)
+        if self.booking_repo.cancel(reference) is None:
+            raise transition_error(self.booking_repo.get(reference), "cancelled")
 
     def check_in_booking(self, reference: str) -> Booking:
-        booking = self.booking_repo.get(reference)
-        if not booking:
-            raise ValueError("Booking not found")
-        booking.checked_in = True
-        self.booking_repo.update(booking)
+        booking = self.booking_repo.check_in(reference)
+        if booking is None:
+            raise transition_error(self.booking_repo.get(reference), "checked in")
         return booking
 
     def check_out_booking(self, reference: str) -> Booking:
-        booking = self.booking_repo.get(reference)
-        if not booking:
-            raise ValueError("Booking not found")
-        booking.checked_out = True
-        self.booking_repo.update(booking)
+        booking = self.booking_repo.check_out(reference)
+        if booking is None:
+            raise transition_error(self.booking_repo.get(reference), "checked out")
         return booking
 
     def list_rooms(self):
         return self.room_repo.list_all()
 
     def available_rooms(self, start: date, end: date):
-        rooms = self.room_repo.list_all()
-        bookings = self.booking_repo.list_between(start, end)
-        booked = {b.room_number for b in bookings if not b.cancelled}
-        return [r for r in rooms if r.number not in booked]
+        if self.occupancy is not None:
+            self.occupancy.roll_to(date.today(), self.booking_repo.list_between)
+            free = self.occupancy.free_rooms(start, end)
+            if free is not None:
+                return free
+        booked = self.booking_repo.booked_room_numbers(start, end)
+        return [r for r in self.room_repo.list_all() if r.number not in booked]
+
+    def availability_summary(self, start: date, end: date) -> Dict[RoomType, int]:
+        """Count free rooms of every type for a stay, zero included."""
+        counts = dict.fromkeys(RoomType, 0)
+        free = None
+        if self.occupancy is not None:
+            self.occupancy.roll_to(date.today(), self.booking_repo.list_between)
+            free = self.occupancy.free_rooms(start, end)
+        if free is None:
+            by_type = self.booking_repo.count_free_by_type(start, end)
+            if by_type is not None:
+                counts.update(by_type)
+                return counts
+            booked = self.booking_repo.booked_room_numbers(start, end)
+            free = [r for r in self.room_repo.list_all() if r.number not in booked]
+        for room in free:
+            counts[room.room_type] += 1
+        return counts
 
     def create_guest(
         self, guest_id: str, first_name: str, last_name: str, date_of_birth: date
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from datetime import date
+from threading import RLock
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .entities import Booking
+
+
+class IntervalSet:
+    """Half-open ``[check_in, check_out)`` stays of a single room.
+
+    Intervals are kept sorted by start together with a running maximum of the
+    end dates, so a conflict check is one bisect: among the stays that start
+    before ``check_out`` the room is taken if any of them ends after
+    ``check_in``.
+    """
+
+    def __init__(self) -> None:
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        self._refs: List[str] = []
+        self._max_end: List[int] = []
+        self._positions: Dict[str, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+    def __contains__(self, reference: str) -> bool:
+        return reference in self._positions
+
+    def references(self) -> List[str]:
+        return list(self._refs)
+
+    def overlaps(self, check_in: date, check_out: date) -> bool:
+        i = bisect_left(self._starts, check_out.toordinal()) - 1
+        return i >= 0 and self._max_end[i] > check_in.toordinal()
+
+    def add(self, reference: str, check_in: date, check_out: date) -> None:
+        if reference in self._positions:
+            self.remove(reference)
+        start, end = check_in.toordinal(), check_out.toordinal()
+        i = bisect_left(self._starts, start)
+        self._starts.insert(i, start)
+        self._ends.insert(i, end)
+        self._refs.insert(i, reference)
+        self._max_end.insert(i, end)
+        self._positions[reference] = (start, end)
+        self._refresh_max_end(i)
+
+    def remove(self, reference: str) -> None:
+        position = self._positions.pop(reference, None)
+        if position is None:
+            return
+        i = bisect_left(self._starts, position[0])
+        while self._refs[i] != reference:
+            i += 1
+        del self._starts[i], self._ends[i], self._refs[i], self._max_end[i]
+        self._refresh_max_end(i)
+
+    def _refresh_max_end(self, i: int) -> None:
+        # New stays are almost always the latest ones, so this tail is short.
+        running = self._max_end[i - 1] if i > 0 else 0
+        for j in range(i, len(self._ends)):
+            running = max(running, self._ends[j])
+            self._max_end[j] = running
+
+
+class RoomIntervalIndex:
+    """Thread-safe per-room ``IntervalSet`` registry, loaded lazily.
+
+    Rooms are populated on first use from ``loader``. Mutations to a room
+    that is not loaded are not recorded; instead they bump a version so a
+    load racing with the mutation is discarded rather than cached stale.
+    """
+
+    def __init__(self) -> None:
+        self._rooms: Dict[str, IntervalSet] = {}
+        self._versions: Dict[str, int] = {}
+        self._room_of: Dict[str, str] = {}
+        self._lock = RLock()
+
+    def overlaps(
+        self,
+        room_number: str,
+        check_in: date,
+        check_out: date,
+        loader: Callable[[str], Iterable[Booking]],
+    ) -> bool:
+        intervals = self._get_or_load(room_number, loader)
+        with self._lock:
+            return intervals.overlaps(check_in, check_out)
+
+    def add(self, booking: Booking) -> None:
+        with self._lock:
+            intervals = self._touch(booking.room_number)
+            if intervals is not None and not booking.cancelled:
+                self._insert(intervals, booking)
+
+    def update(self, booking: Booking) -> None:
+        with self._lock:
+            previous = self._room_of.get(booking.reference)
+            if previous is not None and previous != booking.room_number:
+                self.remove(previous, booking.reference)
+            intervals = self._touch(booking.room_number)
+            if intervals is None:
+                return
+            if booking.cancelled:
+                intervals.remove(booking.reference)
+                self._room_of.pop(booking.reference, None)
+            else:
+                self._insert(intervals, booking)
+
+    def remove(self, room_number: str, reference: str) -> None:
+        with self._lock:
+            intervals = self._touch(room_number)
+            if intervals is not None:
+                intervals.remove(reference)
+            self._room_of.pop(reference, None)
+
+    def invalidate(self, room_number: Optional[str] = None) -> None:
+        with self._lock:
+            if room_number is None:
+                for number in list(self._rooms):
+                    self._touch(number)
+                self._rooms.clear()
+                self._room_of.clear()
+                return
+            self._touch(room_number)
+            self._rooms.pop(room_number, None)
+            self._room_of = {
+                ref: room for ref, room in self._room_of.items() if room != room_number
+            }
+
+    def _insert(self, intervals: IntervalSet, booking: Booking) -> None:
+        intervals.add(booking.reference, booking.check_in, booking.check_out)
+        self._room_of[booking.reference] = booking.room_number
+
+    def _touch(self, room_number: str) -> Optional[IntervalSet]:
+        self._versions[room_number] = self._versions.get(room_number, 0) + 1
+        return self._rooms.get(room_number)
+
+    def _get_or_load(
+        self, room_number: str, loader: Callable[[str], Iterable[Booking]]
+    ) -> IntervalSet:
+        with self._lock:
+            intervals = self._rooms.get(room_number)
+            if intervals is not None:
+                return intervals
+            version = self._versions.get(room_number, 0)
+        loaded = IntervalSet()
+        for booking in loader(room_number):
+            if not booking.cancelled:
+                loaded.add(booking.reference, booking.check_in, booking.check_out)
+        with self._lock:
+            if self._versions.get(room_number, 0) != version:
+                return loaded
+            if room_number not in self._rooms:
+                self._rooms[room_number] = loaded
+                for reference in loaded.references():
+                    self._room_of[reference] = room_number
+            return self._rooms[room_number]
@@ -6,26 +6,29 @@ from enum import Enum
 
 
 class RoomType(str, Enum):
-    STANDARD = "standard"
-    DELUXE = "deluxe"
-    SUITE = "suite"
+    # Each member carries its capacity and nightly price as plain attributes.
+    capacity: int
+    price: int
 
-    @property
-    def capacity(self) -> int:
-        return {self.STANDARD: 2, self.DELUXE: 3, self.SUITE: 4}[self]
+    STANDARD = ("standard", 2, 100)
+    DELUXE = ("deluxe", 3, 200)
+    SUITE = ("suite", 4, 300)
 
-    @property
-    def price(self) -> int:
-        return {self.STANDARD: 100, self.DELUXE: 200, self.SUITE: 300}[self]
+    def __new__(cls, value: str, capacity: int, price: int) -> "RoomType":
+        member = str.__new__(cls, value)
+        member._value_ = value
+        member.capacity = capacity
+        member.price = price
+        return member
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Room:
     number: str
     room_type: RoomType
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Guest:
     id: str
     first_name: str
@@ -43,7 +46,7 @@ class Guest:
         return self.age >= 18
 
 
-@dataclass
+@dataclass(slots=True)
 class Booking:
     reference: str
     guest_id: str
@@ -66,3 +69,14 @@ class Booking:
 
     def overlaps(self, other: "Booking") -> bool:
         return not (self.check_out <= other.check_in or self.check_in >= other.check_out)
+
+    # Allowed state transitions. SQL repositories apply the same conditions in
+    # the WHERE clause of the statement that makes the change.
+    def can_check_in(self) -> bool:
+        return not (self.cancelled or self.checked_in)
+
+    def can_check_out(self) -> bool:
+        return self.checked_in and not (self.cancelled or self.checked_out)
+
+    def can_cancel(self) -> bool:
+        return not self.checked_in
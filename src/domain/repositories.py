@@ -2,9 +2,21 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from datetime import date
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
-from .entities import Booking, Guest, Room
+from .entities import Booking, Guest, Room, RoomType
+
+# Keyset position of a booking in (check_in, reference) order.
+PageKey = Tuple[date, str]
+
+
+def _page(
+    bookings: Iterable[Booking], limit: int, after: Optional[PageKey]
+) -> List[Booking]:
+    ordered = sorted(bookings, key=lambda b: (b.check_in, b.reference))
+    if after is not None:
+        ordered = [b for b in ordered if (b.check_in, b.reference) > after]
+    return ordered[:limit]
 
 
 class GuestRepository(ABC):
@@ -16,6 +28,14 @@ class GuestRepository(ABC):
     def get(self, guest_id: str) -> Optional[Guest]:
         pass
 
+    def add_many(self, guests: List[Guest]) -> None:
+        for guest in guests:
+            self.add(guest)
+
+    def get_many(self, guest_ids: Iterable[str]) -> Dict[str, Guest]:
+        found = {guest_id: self.get(guest_id) for guest_id in set(guest_ids)}
+        return {guest_id: g for guest_id, g in found.items() if g is not None}
+
 
 class RoomRepository(ABC):
     @abstractmethod
@@ -26,6 +46,13 @@ class RoomRepository(ABC):
     def get(self, number: str) -> Optional[Room]:
         pass
 
+    def get_many(self, numbers: Iterable[str]) -> Dict[str, Room]:
+        found = {number: self.get(number) for number in set(numbers)}
+        return {number: r for number, r in found.items() if r is not None}
+
+    def list_by_type(self, room_type: RoomType) -> List[Room]:
+        return [r for r in self.list_all() if r.room_type == room_type]
+
 
 class BookingRepository(ABC):
     @abstractmethod
@@ -55,3 +82,186 @@ class BookingRepository(ABC):
     @abstractmethod
     def update(self, booking: Booking) -> None:
         pass
+
+    def has_conflict(self, room_number: str, check_in: date, check_out: date) -> bool:
+        """Return True if an active booking overlaps ``[check_in, check_out)``."""
+        return any(
+            b.check_in < check_out and b.check_out > check_in
+            for b in self.list_for_room(room_number)
+        )
+
+    def add_many(self, bookings: List[Booking]) -> None:
+        for booking in bookings:
+            self.add(booking)
+
+    def booked_room_numbers(self, start: date, end: date) -> Set[str]:
+        """Rooms with an active booking on any night in ``[start, end)``."""
+        return {
+            b.room_number for b in self.list_between(start, end) if not b.cancelled
+        }
+
+    def count_free_by_type(
+        self, start: date, end: date
+    ) -> Optional[Dict[RoomType, int]]:
+        """Count rooms with no active booking in ``[start, end)`` by type.
+
+        Returns None when the store cannot count without listing rooms, in
+        which case callers combine ``booked_room_numbers`` with the catalog.
+        """
+        return None
+
+    def iter_between(
+        self, start: date, end: date, chunk_size: int = 1000
+    ) -> Iterator[Booking]:
+        """Stream bookings overlapping ``[start, end)`` ordered by stay."""
+        bookings = self.list_between(start, end)
+        return iter(sorted(bookings, key=lambda b: (b.check_in, b.reference)))
+
+    def page_for_guest(
+        self, guest_id: str, limit: int, after: Optional[PageKey] = None
+    ) -> List[Booking]:
+        """Up to ``limit`` of the guest's bookings after ``after`` by stay."""
+        return _page(self.list_for_guest(guest_id), limit, after)
+
+    def page_between(
+        self, start: date, end: date, limit: int, after: Optional[PageKey] = None
+    ) -> List[Booking]:
+        """Up to ``limit`` bookings overlapping ``[start, end)`` after ``after``."""
+        return _page(self.list_between(start, end), limit, after)
+
+    def list_active_for_rooms(
+        self, room_numbers: Iterable[str], start: date, end: date
+    ) -> List[Booking]:
+        """Active bookings in any of ``room_numbers`` overlapping ``[start, end)``."""
+        return [
+            b
+            for number in set(room_numbers)
+            for b in self.list_for_room(number)
+            if b.check_in < end and b.check_out > start
+        ]
+
+    def check_in(self, reference: str) -> Optional[Booking]:
+        """Mark the booking checked in if ``Booking.can_check_in`` allows it.
+
+        Returns the updated booking, or None if it does not exist or is not in
+        a state that allows the change. ``check_out`` and ``cancel`` work the
+        same way; ``cancel`` returns the booking it removed.
+        """
+        booking = self.get(reference)
+        if booking is None or not booking.can_check_in():
+            return None
+        booking.checked_in = True
+        self.update(booking)
+        return booking
+
+    def check_out(self, reference: str) -> Optional[Booking]:
+        booking = self.get(reference)
+        if booking is None or not booking.can_check_out():
+            return None
+        booking.checked_out = True
+        self.update(booking)
+        return booking
+
+    def cancel(self, reference: str) -> Optional[Booking]:
+        booking = self.get(reference)
+        if booking is None or not booking.can_cancel():
+            return None
+        self.remove(reference)
+        return booking
+
+
+class AsyncGuestRepository(ABC):
+    @abstractmethod
+    async def add(self, guest: Guest) -> None:
+        pass
+
+    @abstractmethod
+    async def get(self, guest_id: str) -> Optional[Guest]:
+        pass
+
+
+class AsyncRoomRepository(ABC):
+    @abstractmethod
+    async def list_all(self) -> List[Room]:
+        pass
+
+    @abstractmethod
+    async def get(self, number: str) -> Optional[Room]:
+        pass
+
+
+class AsyncBookingRepository(ABC):
+    @abstractmethod
+    async def add(self, booking: Booking) -> None:
+        pass
+
+    @abstractmethod
+    async def get(self, reference: str) -> Optional[Booking]:
+        pass
+
+    @abstractmethod
+    async def list_for_room(self, room_number: str) -> List[Booking]:
+        pass
+
+    @abstractmethod
+    async def list_for_guest(self, guest_id: str) -> List[Booking]:
+        pass
+
+    @abstractmethod
+    async def remove(self, reference: str) -> None:
+        pass
+
+    @abstractmethod
+    async def list_between(self, start: date, end: date) -> List[Booking]:
+        pass
+
+    @abstractmethod
+    async def update(self, booking: Booking) -> None:
+        pass
+
+    async def page_for_guest(
+        self, guest_id: str, limit: int, after: Optional[PageKey] = None
+    ) -> List[Booking]:
+        """Up to ``limit`` of the guest's bookings after ``after`` by stay."""
+        return _page(await self.list_for_guest(guest_id), limit, after)
+
+    async def check_in(self, reference: str) -> Optional[Booking]:
+        """See ``BookingRepository.check_in``."""
+        booking = await self.get(reference)
+        if booking is None or not booking.can_check_in():
+            return None
+        booking.checked_in = True
+        await self.update(booking)
+        return booking
+
+    async def check_out(self, reference: str) -> Optional[Booking]:
+        booking = await self.get(reference)
+        if booking is None or not booking.can_check_out():
+            return None
+        booking.checked_out = True
+        await self.update(booking)
+        return booking
+
+    async def cancel(self, reference: str) -> Optional[Booking]:
+        booking = await self.get(reference)
+        if booking is None or not booking.can_cancel():
+            return None
+        await self.remove(reference)
+        return booking
+
+    async def has_conflict(
+        self, room_number: str, check_in: date, check_out: date
+    ) -> bool:
+        """Return True if an active booking overlaps ``[check_in, check_out)``."""
+        return any(
+            b.check_in < check_out and b.check_out > check_in
+            for b in await self.list_for_room(room_number)
+        )
+
+    async def booked_room_numbers(self, start: date, end: date) -> Set[str]:
+        """See ``BookingRepository.booked_room_numbers``."""
+        return {
+            b.room_number
+            for b in await self.list_between(start, end)
+            if not b.cancelled
+        }
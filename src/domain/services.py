@@ -4,6 +4,11 @@ from datetime import date, timedelta
 from typing import List
 
 from .entities import Booking, Guest
+from .repositories import BookingRepository
+
+
+class InvalidTransition(ValueError):
+    """The booking exists but its state does not allow the requested change."""
 
 
 class BookingPolicy:
@@ -14,6 +19,21 @@ class BookingPolicy:
     def validate_new_booking(
         self, guest: Guest, existing_bookings: List[Booking], new_booking: Booking
     ) -> None:
+        self.validate_stay(guest, new_booking)
+
+        for b in existing_bookings:
+            if b.overlaps(new_booking):
+                raise ValueError("Room already booked for these dates")
+
+    def validate_availability(
+        self, booking_repo: BookingRepository, new_booking: Booking
+    ) -> None:
+        if booking_repo.has_conflict(
+            new_booking.room_number, new_booking.check_in, new_booking.check_out
+        ):
+            raise ValueError("Room already booked for these dates")
+
+    def validate_stay(self, guest: Guest, new_booking: Booking) -> None:
         if not guest.is_adult():
             raise ValueError("Guest must be at least 18 years old")
 
@@ -28,7 +48,3 @@ class BookingPolicy:
             < date.today() + timedelta(hours=self.MIN_NOTICE_HOURS)
         ):
             raise ValueError("Bookings require 24h notice")
-
-        for b in existing_bookings:
-            if b.overlaps(new_booking):
-                raise ValueError("Room already booked for these dates")
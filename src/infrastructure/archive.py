@@ -0,0 +1,95 @@
+"""Move finished stays from ``bookings`` into ``bookings_archive``.
+
+Conflict checks, availability and room listings only read ``bookings``, so
+keeping it to recent and upcoming stays keeps them fast however many years
+of history the hotel has. Bookings are moved in batches, one transaction
+each: the rows are copied, their room-night claims (all in the past) are
+dropped, and the originals are deleted. Run it from cron, e.g. nightly::
+
+    PYTHONPATH=src python -m infrastructure.archive sqlite:///./hotel.db --days 365
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date, timedelta
+from typing import List, Optional
+
+from sqlalchemy import delete, func, select
+
+from .models import ArchivedBookingModel, BookingModel, RoomNightModel
+
+DEFAULT_BATCH_SIZE = 5_000
+
+
+def archive_bookings(
+    engine,
+    cutoff: date,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    today: Optional[date] = None,
+) -> int:
+    """Archive every booking that checked out before ``cutoff``.
+
+    ``cutoff`` may not be later than today, so no stay with nights still to
+    come ever leaves the hot table. Returns the number of bookings moved.
+    """
+    if cutoff > (today or date.today()):
+        raise ValueError("cutoff must not be in the future")
+    hot = BookingModel.__table__
+    cold = ArchivedBookingModel.__table__
+    moved = 0
+    while True:
+        with engine.begin() as conn:
+            references = conn.scalars(
+                select(hot.c.reference)
+                .where(hot.c.check_out < cutoff)
+                .limit(batch_size)
+            ).all()
+            if not references:
+                return moved
+            batch = hot.c.reference.in_(references)
+            conn.execute(
+                cold.insert().from_select(
+                    [c.name for c in hot.c], select(hot).where(batch)
+                )
+            )
+            conn.execute(
+                delete(RoomNightModel).where(RoomNightModel.reference.in_(references))
+            )
+            conn.execute(delete(hot).where(batch))
+        moved += len(references)
+
+
+def count_archived(engine) -> int:
+    with engine.connect() as conn:
+        return conn.scalar(select(func.count()).select_from(ArchivedBookingModel))
+
+
+def main(argv: List[str] | None = None) -> None:
+    from .db import get_engine
+    from .migrations import upgrade
+
+    parser = argparse.ArgumentParser(description="Archive finished bookings")
+    parser.add_argument("url", nargs="?", default="sqlite:///./hotel.db")
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=365,
+        help="archive stays that checked out more than this many days ago",
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+    engine = get_engine(args.url)
+    upgrade(engine)
+    cutoff = date.today() - timedelta(days=args.days)
+    began = time.perf_counter()
+    moved = archive_bookings(engine, cutoff, args.batch_size)
+    print(
+        f"Archived {moved:,} bookings that checked out before {cutoff}"
+        f" in {time.perf_counter() - began:.2f}s"
+        f" ({count_archived(engine):,} archived in total)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import List, Optional, Set
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from domain.entities import Booking, Guest, Room
+from domain.repositories import (
+    AsyncBookingRepository,
+    AsyncGuestRepository,
+    AsyncRoomRepository,
+    PageKey,
+)
+
+from .mappers import (
+    booking_to_entity,
+    booking_to_model,
+    copy_booking_to_model,
+    guest_to_entity,
+    guest_to_model,
+    room_to_entity,
+)
+from . import room_nights
+from .models import ArchivedBookingModel, BookingModel, GuestModel, RoomModel
+from .repositories import (
+    BOOKING_COLUMNS,
+    CAN_CANCEL,
+    CAN_CHECK_IN,
+    CAN_CHECK_OUT,
+    after_key,
+    with_archive,
+)
+
+
+class AsyncSqlGuestRepository(AsyncGuestRepository):
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def add(self, guest: Guest) -> None:
+        self.session.add(guest_to_model(guest))
+        await self.session.flush()
+
+    async def get(self, guest_id: str) -> Guest | None:
+        row = await self.session.get(GuestModel, guest_id)
+        if row:
+            return guest_to_entity(row)
+        return None
+
+
+class AsyncSqlRoomRepository(AsyncRoomRepository):
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def list_all(self) -> List[Room]:
+        rows = await self.session.scalars(select(RoomModel))
+        return [room_to_entity(r) for r in rows]
+
+    async def get(self, number: str) -> Room | None:
+        row = await self.session.get(RoomModel, number)
+        if row:
+            return room_to_entity(row)
+        return None
+
+
+class AsyncSqlBookingRepository(AsyncBookingRepository):
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def add(self, booking: Booking) -> None:
+        await room_nights.claim_async(self.session, [booking])
+        self.session.add(booking_to_model(booking))
+        await self.session.flush()
+
+    async def get(self, reference: str) -> Booking | None:
+        row = await self.session.get(BookingModel, reference)
+        if row is None:
+            row = await self.session.get(ArchivedBookingModel, reference)
+        if row:
+            return booking_to_entity(row)
+        return None
+
+    async def list_for_room(self, room_number: str) -> List[Booking]:
+        rows = await self.session.scalars(
+            select(BookingModel).filter_by(room_number=room_number, cancelled=False)
+        )
+        return [booking_to_entity(r) for r in rows]
+
+    async def has_conflict(
+        self, room_number: str, check_in: date, check_out: date
+    ) -> bool:
+        query = room_nights.conflict_query(room_number, check_in, check_out)
+        return bool(await self.session.scalar(query))
+
+    async def booked_room_numbers(self, start: date, end: date) -> Set[str]:
+        query = room_nights.booked_rooms_query(start, end)
+        return set(await self.session.scalars(query))
+
+    async def list_for_guest(self, guest_id: str) -> List[Booking]:
+        rows = await self.session.execute(
+            with_archive(lambda t: select(t).where(t.c.guest_id == guest_id))
+        )
+        return [booking_to_entity(r) for r in rows]
+
+    async def page_for_guest(
+        self, guest_id: str, limit: int, after: Optional[PageKey] = None
+    ) -> List[Booking]:
+        rows = await self.session.execute(
+            with_archive(
+                lambda t: select(t).where(
+                    t.c.guest_id == guest_id, *after_key(t, after)
+                ),
+                limit,
+            )
+        )
+        return [booking_to_entity(r) for r in rows]
+
+    async def remove(self, reference: str) -> None:
+        row = await self.session.get(BookingModel, reference)
+        if row:
+            await room_nights.release_async(self.session, reference)
+            await self.session.delete(row)
+            await self.session.flush()
+
+    async def update(self, booking: Booking) -> None:
+        row = await self.session.get(BookingModel, booking.reference)
+        if not row:
+            return
+        if room_nights.stay_key(row) != room_nights.stay_key(booking):
+            await room_nights.release_async(self.session, booking.reference)
+            await room_nights.claim_async(self.session, [booking])
+        copy_booking_to_model(booking, row)
+        await self.session.flush()
+
+    async def check_in(self, reference: str) -> Optional[Booking]:
+        return await self._transition(reference, CAN_CHECK_IN, checked_in=True)
+
+    async def check_out(self, reference: str) -> Optional[Booking]:
+        return await self._transition(reference, CAN_CHECK_OUT, checked_out=True)
+
+    async def cancel(self, reference: str) -> Optional[Booking]:
+        result = await self.session.execute(
+            delete(BookingModel)
+            .where(BookingModel.reference == reference, *CAN_CANCEL)
+            .returning(*BOOKING_COLUMNS)
+        )
+        row = result.first()
+        if row is None:
+            return None
+        await room_nights.release_async(self.session, reference)
+        return booking_to_entity(row)
+
+    async def _transition(
+        self, reference: str, guard, **values
+    ) -> Optional[Booking]:
+        result = await self.session.execute(
+            update(BookingModel)
+            .where(BookingModel.reference == reference, *guard)
+            .values(**values)
+            .returning(*BOOKING_COLUMNS)
+        )
+        row = result.first()
+        return booking_to_entity(row) if row else None
+
+    async def list_between(self, start: date, end: date) -> List[Booking]:
+        rows = await self.session.scalars(
+            select(BookingModel).filter(
+                BookingModel.check_in < end, BookingModel.check_out > start
+            )
+        )
+        return [booking_to_entity(r) for r in rows]
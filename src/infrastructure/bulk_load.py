@@ -0,0 +1,311 @@
+"""Stream rooms, guests and bookings from CSV or NDJSON into the database.
+
+Rows go in through chunked ``executemany`` calls, one transaction per chunk,
+without building ORM objects. Secondary indexes are dropped for the
+load and rebuilt once at the end, which is much cheaper than maintaining
+them row by row, and SQLite's durability pragmas are relaxed on the loading
+connection only.
+
+    PYTHONPATH=src python -m infrastructure.bulk_load sqlite:///./hotel.db \\
+        --rooms rooms.csv --guests guests.ndjson --bookings bookings.csv
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime
+from itertools import islice
+from operator import itemgetter
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from sqlalchemy import Column, Table
+
+from . import room_nights
+from .db import get_engine
+from .migrations import apply_indexes, upgrade
+from .models import Base
+
+DEFAULT_CHUNK_SIZE = 50_000
+# Source data only; claims, the archive and the schema version are derived.
+LOADABLE_TABLES = ("rooms", "guests", "bookings")
+
+Source = Union[str, Path, Iterable[Dict[str, Any]]]
+
+# Fast and unsafe while loading; a crash mid-load means reloading anyway.
+LOAD_PRAGMAS = {
+    "synchronous": "OFF",
+    "journal_mode": "MEMORY",
+    "temp_store": "MEMORY",
+    "cache_size": "-262144",
+}
+
+
+@dataclass
+class LoadStats:
+    table: str
+    rows: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def read_records(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Yield one dict per row of a ``.csv`` or ``.ndjson``/``.jsonl`` file."""
+    path = Path(path)
+    with path.open(newline="", encoding="utf-8") as handle:
+        if path.suffix == ".csv":
+            yield from csv.DictReader(handle)
+        elif path.suffix in (".ndjson", ".jsonl"):
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            raise ValueError(f"Unsupported file type: {path.name}")
+
+
+_BOOLS = {
+    "1": True,
+    "true": True,
+    "t": True,
+    "yes": True,
+    "y": True,
+    "0": False,
+    "false": False,
+    "f": False,
+    "no": False,
+    "n": False,
+}
+
+
+def _parse_bool(value: Any) -> bool:
+    try:
+        return _BOOLS[str(value).lower()]
+    except KeyError:
+        raise ValueError(f"Not a boolean: {value!r}") from None
+
+
+def _column_converter(column: Column, dialect) -> Optional[Callable[[Any], Any]]:
+    """Parse a raw value for ``column`` straight into its driver format.
+
+    Returns ``None`` for plain string columns, whose values pass through.
+    """
+    python_type = column.type.python_type
+    bind = column.type.bind_processor(dialect)
+    default = None
+    if column.default is not None and column.default.is_scalar:
+        default = column.default.arg
+    if python_type is str and bind is None and default is None:
+        return None
+    parse: Callable[[Any], Any] = python_type
+    if python_type is bool:
+        parse = _parse_bool
+    elif python_type is datetime:
+        parse = datetime.fromisoformat
+    elif python_type is date:
+        parse = date.fromisoformat
+
+    def convert(value: Any) -> Any:
+        if value is None or value == "":
+            value = default
+        elif type(value) is not python_type:
+            value = parse(value)
+        if bind is not None and value is not None:
+            value = bind(value)
+        return value
+
+    return convert
+
+
+def _row_converter(
+    table: Table, names: Sequence[str], dialect
+) -> Callable[[Dict[str, Any]], List[Any]]:
+    converters = [
+        (i, fn)
+        for i, fn in enumerate(_column_converter(table.c[n], dialect) for n in names)
+        if fn is not None
+    ]
+    known = set(names)
+    getter = itemgetter(*names)
+
+    def convert(record: Dict[str, Any]) -> List[Any]:
+        if not known.issuperset(record):
+            unknown = ", ".join(sorted(set(record) - known))
+            raise ValueError(f"Unknown column for {table.name}: {unknown}")
+        try:
+            values = list(getter(record))
+        except KeyError:
+            values = [record.get(name) for name in names]
+        for i, fn in converters:
+            values[i] = fn(values[i])
+        return values
+
+    return convert
+
+
+@contextmanager
+def _load_connection(engine) -> Iterator[Any]:
+    with engine.connect() as conn:
+        if conn.dialect.name != "sqlite":
+            yield conn
+            return
+        saved = {
+            name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+            for name in LOAD_PRAGMAS
+        }
+        conn.commit()
+        for name, value in LOAD_PRAGMAS.items():
+            conn.exec_driver_sql(f"PRAGMA {name} = {value}")
+        conn.commit()
+        try:
+            yield conn
+        finally:
+            conn.rollback()
+            for name, value in saved.items():
+                conn.exec_driver_sql(f"PRAGMA {name} = {value}")
+            conn.commit()
+
+
+def load_table(
+    conn,
+    table: Table,
+    records: Iterable[Dict[str, Any]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Optional[Callable[[LoadStats], None]] = None,
+) -> LoadStats:
+    """Insert ``records`` into ``table`` in transactions of ``chunk_size`` rows.
+
+    Values are converted to the driver's format up front and sent as
+    positional tuples, so each chunk is a single DBAPI ``executemany`` with no
+    per-row work left for SQLAlchemy.
+    """
+    compiled = table.insert().compile(dialect=conn.dialect)
+    names = list(compiled.positiontup or compiled.params)
+    convert = _row_converter(table, names, conn.dialect)
+    sql = str(compiled)
+    stats = LoadStats(table.name)
+    began = time.perf_counter()
+    rows = iter(records)
+    while True:
+        chunk = [tuple(convert(r)) for r in islice(rows, chunk_size)]
+        if not chunk:
+            break
+        if not compiled.positional:
+            chunk = [dict(zip(names, row)) for row in chunk]
+        with conn.begin():
+            conn.exec_driver_sql(sql, chunk)
+        stats.rows += len(chunk)
+        stats.seconds = time.perf_counter() - began
+        if progress is not None:
+            progress(stats)
+    stats.seconds = time.perf_counter() - began
+    return stats
+
+
+def bulk_load(
+    engine,
+    sources: Mapping[str, Source],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    defer_indexes: bool = True,
+    progress: Optional[Callable[[LoadStats], None]] = None,
+) -> List[LoadStats]:
+    """Load each table named in ``sources`` from a file path or an iterable.
+
+    The schema is upgraded first; existing rows are kept. Tables are
+    loaded in schema order, and any deferred indexes are rebuilt even if the
+    load fails part way. Loading bookings recomputes the room-night claims.
+    """
+    unknown = set(sources) - set(LOADABLE_TABLES)
+    if unknown:
+        raise ValueError(f"Unknown tables: {', '.join(sorted(unknown))}")
+    upgrade(engine)
+    tables = [t for t in Base.metadata.sorted_tables if t.name in sources]
+    results: List[LoadStats] = []
+    try:
+        with _load_connection(engine) as conn:
+            if defer_indexes:
+                with conn.begin():
+                    for table in tables:
+                        for index in table.indexes:
+                            conn.exec_driver_sql(f"DROP INDEX IF EXISTS {index.name}")
+            for table in tables:
+                source = sources[table.name]
+                if isinstance(source, (str, Path)):
+                    source = read_records(source)
+                results.append(load_table(conn, table, source, chunk_size, progress))
+            if "bookings" in sources:
+                with conn.begin():
+                    room_nights.rebuild(conn)
+    finally:
+        if defer_indexes:
+            apply_indexes(engine)
+    return results
+
+
+def _report(stats: LoadStats) -> None:
+    print(
+        f"\r{stats.table}: {stats.rows:,} rows ({stats.rows_per_second:,.0f} rows/s)",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Bulk load CSV or NDJSON files")
+    parser.add_argument("url", nargs="?", default="sqlite:///./hotel.db")
+    for name in LOADABLE_TABLES:
+        parser.add_argument(f"--{name}", type=Path, metavar="FILE")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument(
+        "--keep-indexes",
+        action="store_true",
+        help="maintain indexes during the load instead of rebuilding them after",
+    )
+    args = parser.parse_args(argv)
+    sources = {
+        name: getattr(args, name)
+        for name in LOADABLE_TABLES
+        if getattr(args, name) is not None
+    }
+    if not sources:
+        parser.error("nothing to load")
+    began = time.perf_counter()
+    results = bulk_load(
+        get_engine(args.url),
+        sources,
+        chunk_size=args.chunk_size,
+        defer_indexes=not args.keep_indexes,
+        progress=_report,
+    )
+    print(file=sys.stderr)
+    total = sum(s.rows for s in results)
+    elapsed = time.perf_counter() - began
+    for stats in results:
+        print(
+            f"{stats.table}: {stats.rows:,} rows in {stats.seconds:.2f}s"
+            f" ({stats.rows_per_second:,.0f} rows/s)"
+        )
+    print(f"total: {total:,} rows in {elapsed:.2f}s including index builds")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from threading import Lock
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy import event
+
+from domain.entities import Guest, Room, RoomType
+from domain.repositories import GuestRepository, RoomRepository
+
+from .repositories import SqlGuestRepository
+
+
+@dataclass(frozen=True)
+class RoomCatalog:
+    """Immutable snapshot of the room inventory with lookup indexes."""
+
+    rooms: Tuple[Room, ...]
+    by_number: Mapping[str, Room] = field(repr=False)
+    by_type: Mapping[RoomType, Tuple[Room, ...]] = field(repr=False)
+    loaded_at: float
+
+    @classmethod
+    def from_rooms(cls, rooms: Iterable[Room]) -> "RoomCatalog":
+        ordered = tuple(sorted(rooms, key=lambda r: r.number))
+        by_type: Dict[RoomType, List[Room]] = {t: [] for t in RoomType}
+        for room in ordered:
+            by_type[room.room_type].append(room)
+        return cls(
+            rooms=ordered,
+            by_number=MappingProxyType({r.number: r for r in ordered}),
+            by_type=MappingProxyType({t: tuple(rs) for t, rs in by_type.items()}),
+            loaded_at=time.monotonic(),
+        )
+
+
+class RoomCatalogCache:
+    """Process-wide read-through cache of the room catalog.
+
+    The catalog is loaded on first use and reloaded once it is older than
+    ``ttl`` seconds or after ``invalidate``. Lookups between reloads are
+    served from the snapshot without touching the database.
+    """
+
+    def __init__(self, ttl: float = 60.0) -> None:
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._catalog: Optional[RoomCatalog] = None
+        self._lock = Lock()
+
+    def get(self, loader: Callable[[], Iterable[Room]]) -> RoomCatalog:
+        with self._lock:
+            catalog = self._catalog
+            if catalog is not None and time.monotonic() - catalog.loaded_at < self.ttl:
+                self.hits += 1
+                return catalog
+            # Reload under the lock so concurrent misses share one query.
+            self.misses += 1
+            catalog = RoomCatalog.from_rooms(loader())
+            self._catalog = catalog
+            return catalog
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._catalog = None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+class CachedRoomRepository(RoomRepository):
+    """Serve room reads from a shared ``RoomCatalogCache``."""
+
+    def __init__(self, inner: RoomRepository, cache: RoomCatalogCache) -> None:
+        self.inner = inner
+        self.cache = cache
+
+    def list_all(self) -> List[Room]:
+        return list(self._catalog().rooms)
+
+    def get(self, number: str) -> Room | None:
+        return self._catalog().by_number.get(number)
+
+    def get_many(self, numbers: Iterable[str]) -> Dict[str, Room]:
+        by_number = self._catalog().by_number
+        return {n: by_number[n] for n in set(numbers) if n in by_number}
+
+    def list_by_type(self, room_type: RoomType) -> List[Room]:
+        return list(self._catalog().by_type[room_type])
+
+    def _catalog(self) -> RoomCatalog:
+        return self.cache.get(self.inner.list_all)
+
+
+class GuestCache:
+    """Thread-safe LRU cache of guests with a per-entry TTL.
+
+    At most ``max_size`` guests are kept; the least recently used one is
+    evicted to make room. Entries older than ``ttl`` seconds count as misses.
+    """
+
+    def __init__(self, max_size: int = 10_000, ttl: float = 300.0) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, Tuple[Guest, float]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, guest_id: str) -> Optional[Guest]:
+        with self._lock:
+            entry = self._entries.get(guest_id)
+            if entry is None or time.monotonic() - entry[1] >= self.ttl:
+                if entry is not None:
+                    del self._entries[guest_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(guest_id)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, guest: Guest) -> None:
+        with self._lock:
+            self._entries[guest.id] = (guest, time.monotonic())
+            self._entries.move_to_end(guest.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, guest_id: str) -> None:
+        with self._lock:
+            self._entries.pop(guest_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class CachedGuestRepository(GuestRepository):
+    """Read guests through a shared ``GuestCache``.
+
+    Writes go to the database first and reach the cache only once the
+    session commits, so a rolled-back guest is never served from memory.
+    """
+
+    def __init__(self, inner: SqlGuestRepository, cache: GuestCache) -> None:
+        self.inner = inner
+        self.cache = cache
+        self._pending: List[Guest] = []
+        event.listen(inner.session, "after_commit", self._on_commit)
+        event.listen(inner.session, "after_rollback", self._on_rollback)
+
+    def add(self, guest: Guest) -> None:
+        self.inner.add(guest)
+        self._pending.append(guest)
+
+    def add_many(self, guests: List[Guest]) -> None:
+        self.inner.add_many(guests)
+        self._pending.extend(guests)
+
+    def get(self, guest_id: str) -> Guest | None:
+        guest = self.cache.get(guest_id)
+        if guest is None:
+            guest = self.inner.get(guest_id)
+            if guest is not None:
+                self.cache.put(guest)
+        return guest
+
+    def get_many(self, guest_ids: Iterable[str]) -> Dict[str, Guest]:
+        found: Dict[str, Guest] = {}
+        missing: List[str] = []
+        for guest_id in set(guest_ids):
+            guest = self.cache.get(guest_id)
+            if guest is None:
+                missing.append(guest_id)
+            else:
+                found[guest_id] = guest
+        if missing:
+            loaded = self.inner.get_many(missing)
+            for guest in loaded.values():
+                self.cache.put(guest)
+            found.update(loaded)
+        return found
+
+    def _on_commit(self, session) -> None:
+        pending, self._pending = self._pending, []
+        for guest in pending:
+            self.cache.put(guest)
+
+    def _on_rollback(self, session) -> None:
+        self._pending.clear()
@@ -1,37 +1,148 @@
 from __future__ import annotations
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool, StaticPool
 
-from .models import Base, RoomModel
+from .migrations import upgrade
+from .models import RoomModel
+from .profiling import log_slow_queries
 
 
-def get_engine(url: str = "sqlite:///./hotel.db"):
-    return create_engine(url, echo=False)
+def get_engine(
+    url: str = "sqlite:///./hotel.db",
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    pool_timeout: int = 30,
+    slow_query_ms: float = 0,
+):
+    """Create an engine backed by a connection pool.
+
+    SQLite connections are shared between FastAPI's worker threads, so the
+    driver's same-thread check is disabled. In-memory databases use a single
+    static connection because every new connection would see an empty
+    database. A positive ``slow_query_ms`` logs slower statements with their
+    query plans.
+    """
+    engine = _create_engine(url, pool_size, max_overflow, pool_timeout)
+    if slow_query_ms > 0:
+        log_slow_queries(engine, slow_query_ms)
+    return engine
+
+
+def _create_engine(url: str, pool_size: int, max_overflow: int, pool_timeout: int):
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite":
+        return create_engine(
+            url,
+            echo=False,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+        )
+    connect_args = {"check_same_thread": False}
+    if parsed.database in (None, "", ":memory:"):
+        return create_engine(
+            url, echo=False, connect_args=connect_args, poolclass=StaticPool
+        )
+    return create_engine(
+        url,
+        echo=False,
+        connect_args=connect_args,
+        poolclass=QueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+    )
+
+
+def to_async_url(url: str) -> str:
+    """Map a sync database URL onto its asyncio driver."""
+    parsed = make_url(url)
+    if parsed.drivername == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite").render_as_string(
+            hide_password=False
+        )
+    return url
+
+
+def get_async_engine(
+    url: str = "sqlite+aiosqlite:///./hotel.db",
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    pool_timeout: int = 30,
+    slow_query_ms: float = 0,
+):
+    """Async counterpart of ``get_engine`` for the asyncio extension."""
+    engine = _create_async_engine(url, pool_size, max_overflow, pool_timeout)
+    if slow_query_ms > 0:
+        log_slow_queries(engine, slow_query_ms)
+    return engine
+
+
+def _create_async_engine(
+    url: str, pool_size: int, max_overflow: int, pool_timeout: int
+):
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite":
+        return create_async_engine(
+            url,
+            echo=False,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+        )
+    if parsed.database in (None, "", ":memory:"):
+        return create_async_engine(url, echo=False, poolclass=StaticPool)
+    return create_async_engine(
+        url,
+        echo=False,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+    )
+
+
+def create_session_factory(engine) -> sessionmaker[Session]:
+    return sessionmaker(bind=engine)
 
 
 def create_session(engine) -> Session:
-    return sessionmaker(bind=engine)()
+    return create_session_factory(engine)()
+
+
+def create_async_session_factory(engine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=engine, expire_on_commit=False)
 
 
 def init_db(engine) -> None:
-    """Create fresh tables for the configured engine."""
-    # Recreate the schema so database columns always match the models.
-    Base.metadata.drop_all(engine)
-    Base.metadata.create_all(engine)
+    """Prepare the database for the app without touching existing data.
+
+    Missing tables and indexes are created according to the schema version
+    and the default rooms are only seeded into an empty catalog, so this is
+    cheap and safe to run on every start.
+    """
+    upgrade(engine)
     # Populate a default set of rooms so the API works on a fresh install
     session = create_session(engine)
-    if not session.query(RoomModel).count():
-        rooms: list[RoomModel] = []
+    if session.scalar(select(RoomModel.number).limit(1)) is None:
+        rows = []
         for i in range(100):
-            number = str(101 + i)
             if i < 50:
                 room_type = "standard"
             elif i < 80:
                 room_type = "deluxe"
             else:
                 room_type = "suite"
-            rooms.append(RoomModel(number=number, room_type=room_type))
-        session.add_all(rooms)
+            rows.append({"number": str(101 + i), "room_type": room_type})
+        session.execute(insert(RoomModel), rows)
         session.commit()
     session.close()
+
+
+async def init_db_async(engine) -> None:
+    """Run ``init_db`` through an async engine."""
+    async with engine.begin() as conn:
+        await conn.run_sync(init_db)
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import event
+
+from domain.availability import RoomIntervalIndex
+from domain.entities import Booking, RoomType
+from domain.repositories import BookingRepository, PageKey
+
+from .occupancy import OccupancyMatrix
+from .repositories import SqlBookingRepository
+
+
+class IndexedBookingRepository(BookingRepository):
+    """Answer conflict checks from a shared in-memory ``RoomIntervalIndex``.
+
+    All other calls are delegated to the wrapped SQL repository. Writes are
+    buffered per session and applied to the index only once it commits, so
+    other sessions never see a stay that may still be rolled back. Until
+    then, conflict checks on rooms this session has written go to SQL, which
+    sees its own uncommitted rows.
+    """
+
+    def __init__(self, inner: SqlBookingRepository, index: RoomIntervalIndex) -> None:
+        self.inner = inner
+        self.session = inner.session
+        self.index = index
+        self._pending: List[Tuple[str, Booking]] = []
+        self._written: Set[str] = set()
+        event.listen(inner.session, "after_commit", self._on_commit)
+        event.listen(inner.session, "after_rollback", self._on_rollback)
+
+    def add(self, booking: Booking) -> None:
+        self.inner.add(booking)
+        self._buffer("add", replace(booking))
+
+    def add_many(self, bookings: List[Booking]) -> None:
+        self.inner.add_many(bookings)
+        for booking in bookings:
+            self._buffer("add", replace(booking))
+
+    def get(self, reference: str) -> Booking | None:
+        return self.inner.get(reference)
+
+    def list_for_room(self, room_number: str) -> List[Booking]:
+        return self.inner.list_for_room(room_number)
+
+    def list_for_guest(self, guest_id: str) -> List[Booking]:
+        return self.inner.list_for_guest(guest_id)
+
+    def remove(self, reference: str) -> None:
+        booking = self.inner.get(reference)
+        self.inner.remove(reference)
+        if booking:
+            self._buffer("remove", booking)
+
+    def list_between(self, start: date, end: date) -> List[Booking]:
+        return self.inner.list_between(start, end)
+
+    def booked_room_numbers(self, start: date, end: date) -> Set[str]:
+        return self.inner.booked_room_numbers(start, end)
+
+    def count_free_by_type(
+        self, start: date, end: date
+    ) -> Optional[Dict[RoomType, int]]:
+        return self.inner.count_free_by_type(start, end)
+
+    def list_active_for_rooms(
+        self, room_numbers: Iterable[str], start: date, end: date
+    ) -> List[Booking]:
+        return self.inner.list_active_for_rooms(room_numbers, start, end)
+
+    def iter_between(
+        self, start: date, end: date, chunk_size: int = 1000
+    ) -> Iterator[Booking]:
+        return self.inner.iter_between(start, end, chunk_size)
+
+    def page_for_guest(
+        self, guest_id: str, limit: int, after: Optional[PageKey] = None
+    ) -> List[Booking]:
+        return self.inner.page_for_guest(guest_id, limit, after)
+
+    def page_between(
+        self, start: date, end: date, limit: int, after: Optional[PageKey] = None
+    ) -> List[Booking]:
+        return self.inner.page_between(start, end, limit, after)
+
+    def update(self, booking: Booking) -> None:
+        previous = self.inner.get(booking.reference)
+        self.inner.update(booking)
+        if previous:
+            self._written.add(previous.room_number)
+            self._buffer("update", replace(booking))
+
+    # Checking in or out leaves the stay as it is, so the index is untouched.
+    def check_in(self, reference: str) -> Booking | None:
+        return self.inner.check_in(reference)
+
+    def check_out(self, reference: str) -> Booking | None:
+        return self.inner.check_out(reference)
+
+    def cancel(self, reference: str) -> Booking | None:
+        booking = self.inner.cancel(reference)
+        if booking:
+            self._buffer("remove", booking)
+        return booking
+
+    def has_conflict(self, room_number: str, check_in: date, check_out: date) -> bool:
+        if room_number in self._written:
+            return self.inner.has_conflict(room_number, check_in, check_out)
+        return self.index.overlaps(
+            room_number, check_in, check_out, self.inner.list_for_room
+        )
+
+    def _buffer(self, op: str, booking: Booking) -> None:
+        self._pending.append((op, booking))
+        self._written.add(booking.room_number)
+
+    def _on_commit(self, session) -> None:
+        pending, self._pending = self._pending, []
+        self._written.clear()
+        for op, booking in pending:
+            if op == "add":
+                self.index.add(booking)
+            elif op == "update":
+                self.index.update(booking)
+            else:
+                self.index.remove(booking.room_number, booking.reference)
+
+    def _on_rollback(self, session) -> None:
+        self._pending.clear()
+        self._written.clear()
+
+
+class OccupancyTrackingRepository(BookingRepository):
+    """Keep a shared ``OccupancyMatrix`` in step with committed writes.
+
+    Changes are buffered per session and applied only once it commits, so a
+    rolled-back booking never shows up as occupied.
+    """
+
+    def __init__(self, inner: SqlBookingRepository, matrix: OccupancyMatrix) -> None:
+        self.inner = inner
+        self.session = inner.session
+        self.matrix = matrix
+        self._pending: List[Tuple[Booking, int]] = []
+        event.listen(inner.session, "after_commit", self._on_commit)
+        event.listen(inner.session, "after_rollback", self._on_rollback)
+
+    def add(self, booking: Booking) -> None:
+        self.inner.add(booking)
+        self._pending.append((replace(booking), 1))
+
+    def add_many(self, bookings: List[Booking]) -> None:
+        self.inner.add_many(bookings)
+        self._pending.extend((replace(b), 1) for b in bookings)
+
+    def get(self, reference: str) -> Booking | None:
+        return self.inner.get(reference)
+
+    def list_for_room(self, room_number: str) -> List[Booking]:
+        return self.inner.list_for_room(room_number)
+
+    def list_for_guest(self, guest_id: str) -> List[Booking]:
+        return self.inner.list_for_guest(guest_id)
+
+    def remove(self, reference: str) -> None:
+        booking = self.inner.get(reference)
+        self.inner.remove(reference)
+        if booking:
+            self._pending.append((booking, -1))
+
+    def list_between(self, start: date, end: date) -> List[Booking]:
+        return self.inner.list_between(start, end)
+
+    def booked_room_numbers(self, start: date, end: date) -> Set[str]:
+        return self.inner.booked_room_numbers(start, end)
+
+    def count_free_by_type(
+        self, start: date, end: date
+    ) -> Optional[Dict[RoomType, int]]:
+        return self.inner.count_free_by_type(start, end)
+
+    def list_active_for_rooms(
+        self, room_numbers: Iterable[str], start: date, end: date
+    ) -> List[Booking]:
+        return self.inner.list_active_for_rooms(room_numbers, start, end)
+
+    def iter_between(
+        self, start: date, end: date, chunk_size: int = 1000
+    ) -> Iterator[Booking]:
+        return self.inner.iter_between(start, end, chunk_size)
+
+    def page_for_guest(
+        self, guest_id: str, limit: int, after: Optional[PageKey] = None
+    ) -> List[Booking]:
+        return self.inner.page_for_guest(guest_id, limit, after)
+
+    def page_between(
+        self, start: date, end: date, limit: int, after: Optional[PageKey] = None
+    ) -> List[Booking]:
+        return self.inner.page_between(start, end, limit, after)
+
+    def update(self, booking: Booking) -> None:
+        previous = self.inner.get(booking.reference)
+        self.inner.update(booking)
+        if previous:
+            self._pending.append((previous, -1))
+            self._pending.append((replace(booking), 1))
+
+    def check_in(self, reference: str) -> Booking | None:
+        return self.inner.check_in(reference)
+
+    def check_out(self, reference: str) -> Booking | None:
+        return self.inner.check_out(reference)
+
+    def cancel(self, reference: str) -> Booking | None:
+        booking = self.inner.cancel(reference)
+        if booking:
+            self._pending.append((booking, -1))
+        return booking
+
+    def has_conflict(self, room_number: str, check_in: date, check_out: date) -> bool:
+        return self.inner.has_conflict(room_number, check_in, check_out)
+
+    def _on_commit(self, session) -> None:
+        pending, self._pending = self._pending, []
+        for booking, delta in pending:
+            if delta > 0:
+                self.matrix.book(booking)
+            else:
+                self.matrix.release(booking)
+
+    def _on_rollback(self, session) -> None:
+        self._pending.clear()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from domain.entities import Booking, Guest, Room, RoomType
+
+from .models import BookingModel, GuestModel, RoomModel
+
+
+def guest_to_entity(row: GuestModel) -> Guest:
+    return Guest(
+        id=row.id,
+        first_name=row.first_name,
+        last_name=row.last_name,
+        date_of_birth=row.date_of_birth,
+    )
+
+
+def guest_to_model(guest: Guest) -> GuestModel:
+    return GuestModel(
+        id=guest.id,
+        first_name=guest.first_name,
+        last_name=guest.last_name,
+        date_of_birth=guest.date_of_birth,
+    )
+
+
+def guest_to_row(guest: Guest) -> dict:
+    """Column values for a Core ``insert``, bypassing the unit of work."""
+    return {
+        "id": guest.id,
+        "first_name": guest.first_name,
+        "last_name": guest.last_name,
+        "date_of_birth": guest.date_of_birth,
+    }
+
+
+def room_to_entity(row: RoomModel) -> Room:
+    return Room(number=row.number, room_type=RoomType(row.room_type))
+
+
+def booking_to_entity(row: BookingModel) -> Booking:
+    return Booking(
+        reference=row.reference,
+        guest_id=row.guest_id,
+        first_name=row.first_name,
+        last_name=row.last_name,
+        date_of_birth=row.date_of_birth,
+        room_type=RoomType(row.room_type),
+        room_number=row.room_number,
+        number_of_guests=row.number_of_guests,
+        check_in=row.check_in,
+        check_out=row.check_out,
+        paid=row.paid,
+        cancelled=row.cancelled,
+        checked_in=row.checked_in,
+        checked_out=row.checked_out,
+        created_at=row.created_at,
+    )
+
+
+def booking_to_model(booking: Booking) -> BookingModel:
+    row = BookingModel(reference=booking.reference)
+    copy_booking_to_model(booking, row)
+    return row
+
+
+def booking_to_row(booking: Booking) -> dict:
+    """Column values for a Core ``insert``, bypassing the unit of work."""
+    return {
+        "reference": booking.reference,
+        "guest_id": booking.guest_id,
+        "first_name": booking.first_name,
+        "last_name": booking.last_name,
+        "date_of_birth": booking.date_of_birth,
+        "room_type": booking.room_type.value,
+        "room_number": booking.room_number,
+        "number_of_guests": booking.number_of_guests,
+        "check_in": booking.check_in,
+        "check_out": booking.check_out,
+        "paid": booking.paid,
+        "cancelled": booking.cancelled,
+        "checked_in": booking.checked_in,
+        "checked_out": booking.checked_out,
+        "created_at": booking.created_at,
+    }
+
+
+def copy_booking_to_model(booking: Booking, row: BookingModel) -> None:
+    row.guest_id = booking.guest_id
+    row.first_name = booking.first_name
+    row.last_name = booking.last_name
+    row.date_of_birth = booking.date_of_birth
+    row.room_type = booking.room_type.value
+    row.room_number = booking.room_number
+    row.number_of_guests = booking.number_of_guests
+    row.check_in = booking.check_in
+    row.check_out = booking.check_out
+    row.paid = booking.paid
+    row.cancelled = booking.cancelled
+    row.checked_in = booking.checked_in
+    row.checked_out = booking.checked_out
+    row.created_at = booking.created_at
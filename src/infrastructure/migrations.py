@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import argparse
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from sqlalchemy import Connection, delete, inspect, insert, select
+
+from . import room_nights
+from .models import Base, SchemaVersionModel
+
+# Bump whenever the models change in a way ``upgrade`` has to apply.
+# 2: room_nights claims, backfilled from existing bookings.
+# 3: bookings_archive for finished stays.
+# 4: room_nights indexed by night for availability lookups.
+SCHEMA_VERSION = 4
+
+
+@contextmanager
+def _begin(bind) -> Iterator[Connection]:
+    # Accept a connection too, so this also runs under ``run_sync``.
+    if isinstance(bind, Connection):
+        yield bind
+    else:
+        with bind.begin() as conn:
+            yield conn
+
+
+def apply_indexes(bind) -> List[str]:
+    """Create any model indexes missing from an existing database.
+
+    Tables and rows are left untouched, so this is safe to run against a live
+    ``hotel.db``. Returns the names of the indexes that were created.
+    """
+    created: List[str] = []
+    with _begin(bind) as conn:
+        inspector = inspect(conn)
+        existing_tables = set(inspector.get_table_names())
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            present = {ix["name"] for ix in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name in present:
+                    continue
+                index.create(conn)
+                created.append(index.name)
+        if created and conn.dialect.name == "sqlite":
+            conn.exec_driver_sql("ANALYZE")
+    return created
+
+
+def schema_version(bind) -> int:
+    """Return the stored schema version, or 0 for an unversioned database."""
+    with _begin(bind) as conn:
+        if not inspect(conn).has_table(SchemaVersionModel.__tablename__):
+            return 0
+        return conn.scalar(select(SchemaVersionModel.version)) or 0
+
+
+def upgrade(bind) -> int:
+    """Bring the schema up to ``SCHEMA_VERSION`` without touching any rows.
+
+    A database already at the current version costs a single query. Otherwise
+    missing tables and indexes are created and the new version is recorded.
+    """
+    version = schema_version(bind)
+    if version == SCHEMA_VERSION:
+        return version
+    if version > SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Database schema version {version} is newer than this code "
+            f"supports ({SCHEMA_VERSION})"
+        )
+    with _begin(bind) as conn:
+        Base.metadata.create_all(conn)
+    apply_indexes(bind)
+    with _begin(bind) as conn:
+        if version < 2:
+            room_nights.rebuild(conn)
+        conn.execute(delete(SchemaVersionModel))
+        conn.execute(insert(SchemaVersionModel).values(version=SCHEMA_VERSION))
+    return SCHEMA_VERSION
+
+
+def main(argv: List[str] | None = None) -> None:
+    from .db import get_engine
+
+    parser = argparse.ArgumentParser(description="Add missing tables and indexes")
+    parser.add_argument("url", nargs="?", default="sqlite:///./hotel.db")
+    args = parser.parse_args(argv)
+    engine = get_engine(args.url)
+    before = schema_version(engine)
+    created = apply_indexes(engine)
+    version = upgrade(engine)
+    if created:
+        print("Created indexes: " + ", ".join(created))
+    else:
+        print("All indexes already present")
+    print(f"Schema version {before} -> {version}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import date, datetime
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy import String, Date, Boolean, DateTime
+from sqlalchemy import String, Date, Boolean, DateTime, Index
 
 
 class Base(DeclarativeBase):
@@ -25,8 +25,8 @@ class RoomModel(Base):
     room_type: Mapped[str] = mapped_column(String)
 
 
-class BookingModel(Base):
-    __tablename__ = "bookings"
+class BookingColumns:
+    """Columns shared by live bookings and the archive."""
 
     reference: Mapped[str] = mapped_column(String, primary_key=True)
     guest_id: Mapped[str] = mapped_column(String)
@@ -43,3 +43,70 @@ class BookingModel(Base):
     checked_in: Mapped[bool] = mapped_column(Boolean, default=False)
     checked_out: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(DateTime)
+
+
+class BookingModel(BookingColumns, Base):
+    __tablename__ = "bookings"
+    __table_args__ = (
+        # list_for_room: equality on room and status, dates for overlap checks
+        Index(
+            "ix_bookings_room_cancelled_dates",
+            "room_number",
+            "cancelled",
+            "check_in",
+            "check_out",
+        ),
+        # list_for_guest: guest history ordered by stay
+        Index("ix_bookings_guest_check_in", "guest_id", "check_in", "reference"),
+        # page_between: keyset order for date-range listings
+        Index("ix_bookings_check_in_reference", "check_in", "reference"),
+        # list_between: past stays dominate, so lead with check_out
+        Index(
+            "ix_bookings_dates_room",
+            "check_out",
+            "check_in",
+            "room_number",
+            "cancelled",
+        ),
+    )
+
+
+class ArchivedBookingModel(BookingColumns, Base):
+    """Finished stays moved out of ``bookings`` by ``infrastructure.archive``.
+
+    Guest history, range listings and exports read both tables; conflict
+    checks and availability only ever read ``bookings``.
+    """
+
+    __tablename__ = "bookings_archive"
+    __table_args__ = (
+        Index(
+            "ix_bookings_archive_guest_check_in", "guest_id", "check_in", "reference"
+        ),
+        Index("ix_bookings_archive_check_in_reference", "check_in", "reference"),
+    )
+
+
+class RoomNightModel(Base):
+    """One row per night claimed by an active booking.
+
+    The primary key makes the database reject a second booking for the same
+    room and night at write time, whichever worker or process inserts it.
+    """
+
+    __tablename__ = "room_nights"
+    __table_args__ = (
+        Index("ix_room_nights_reference", "reference"),
+        # Which rooms are taken on given nights, answered from the index alone.
+        Index("ix_room_nights_night_room", "night", "room_number"),
+    )
+
+    room_number: Mapped[str] = mapped_column(String, primary_key=True)
+    night: Mapped[date] = mapped_column(Date, primary_key=True)
+    reference: Mapped[str] = mapped_column(String)
+
+
+class SchemaVersionModel(Base):
+    __tablename__ = "schema_version"
+
+    version: Mapped[int] = mapped_column(primary_key=True)
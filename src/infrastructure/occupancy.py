@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from threading import RLock
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from domain.entities import Booking, Room
+
+BookingLoader = Callable[[date, date], Iterable[Booking]]
+
+
+class OccupancyMatrix:
+    """Rooms x days count matrix over a rolling horizon starting at ``origin``.
+
+    Cell ``[d, r]`` holds how many active bookings occupy room ``r`` on night
+    ``origin + d``. The matrix is stored day-major so a date range is a
+    contiguous block of rows, and a room is free for ``[start, end)`` when
+    its column is all zero there: one vectorized ``any`` per query.
+    Counts rather than booleans keep releases correct if legacy data holds
+    overlapping stays.
+    """
+
+    def __init__(
+        self, rooms: Iterable[Room], origin: date, horizon_days: int = 730
+    ) -> None:
+        self.rooms: List[Room] = sorted(rooms, key=lambda r: r.number)
+        self.origin = origin
+        self.horizon_days = horizon_days
+        self._rows: Dict[str, int] = {r.number: i for i, r in enumerate(self.rooms)}
+        self._room_array = np.empty(len(self.rooms), dtype=object)
+        self._room_array[:] = self.rooms
+        self._nights = np.zeros((horizon_days, len(self.rooms)), dtype=np.uint16)
+        self._lock = RLock()
+
+    @classmethod
+    def build(
+        cls,
+        rooms: Iterable[Room],
+        list_between: BookingLoader,
+        origin: date,
+        horizon_days: int = 730,
+    ) -> "OccupancyMatrix":
+        matrix = cls(rooms, origin, horizon_days)
+        for booking in list_between(origin, matrix.end):
+            matrix.book(booking)
+        return matrix
+
+    @property
+    def end(self) -> date:
+        return self.origin + timedelta(days=self.horizon_days)
+
+    def covers(self, start: date, end: date) -> bool:
+        return self.origin <= start and end <= self.end
+
+    def free_rooms(self, start: date, end: date) -> Optional[List[Room]]:
+        """Rooms with no booked night in ``[start, end)``.
+
+        Returns None when the range falls outside the horizon so callers can
+        fall back to querying the database.
+        """
+        with self._lock:
+            if not self.covers(start, end):
+                return None
+            first, last = self._columns(start, end)
+            if last <= first:
+                return list(self.rooms)
+            taken = self._nights[first:last].any(axis=0)
+        return self._room_array[~taken].tolist()
+
+    def book(self, booking: Booking) -> None:
+        self._apply(booking, 1)
+
+    def release(self, booking: Booking) -> None:
+        self._apply(booking, -1)
+
+    def roll_to(self, origin: date, list_between: BookingLoader) -> None:
+        """Advance the horizon so it starts at ``origin``.
+
+        Past nights are dropped and the newly exposed tail is filled from
+        ``list_between``.
+        """
+        with self._lock:
+            shift = (origin - self.origin).days
+            if shift <= 0:
+                return
+            old_end = self.end
+            if shift >= self.horizon_days:
+                self._nights[:] = 0
+            else:
+                self._nights[:-shift] = self._nights[shift:]
+                self._nights[-shift:] = 0
+            self.origin = origin
+            tail_start = max(old_end, origin)
+            for booking in list_between(tail_start, self.end):
+                self._apply(booking, 1, since=tail_start)
+
+    def _apply(self, booking: Booking, delta: int, since: date | None = None) -> None:
+        if booking.cancelled:
+            return
+        row = self._rows.get(booking.room_number)
+        if row is None:
+            return
+        # The origin moves under the lock in roll_to, so read it under it too.
+        with self._lock:
+            start = max(booking.check_in, since or self.origin, self.origin)
+            end = min(booking.check_out, self.end)
+            if end <= start:
+                return
+            first, last = self._columns(start, end)
+            cells = self._nights[first:last, row]
+            if delta > 0:
+                cells += 1
+            else:
+                np.subtract(cells, 1, out=cells, where=cells > 0)
+
+    def _columns(self, start: date, end: date) -> tuple[int, int]:
+        return (start - self.origin).days, (end - self.origin).days
@@ -0,0 +1,134 @@
+"""Slow-query log and per-route statement profiles.
+
+``log_slow_queries(engine, threshold_ms)`` logs every statement slower than
+the threshold, with its parameters and query plan, to this module's logger.
+``StatementProfiler`` aggregates the ``query_stats`` fingerprints of each
+request by route and warns when one request repeats a statement shape often
+enough to suggest an N+1 loop, e.g. fetching guests one by one for a list of
+bookings.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+from sqlalchemy import event
+
+from .query_stats import QueryStats
+
+logger = logging.getLogger(__name__)
+
+_STARTED = "slow_query_started"
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+def log_slow_queries(engine, threshold_ms: float, explain: bool = True):
+    """Log ``engine``'s statements that take at least ``threshold_ms``."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    threshold = threshold_ms / 1000
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info[_STARTED] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after(conn, cursor, statement, parameters, context, executemany) -> None:
+        started = conn.info.pop(_STARTED, None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        if elapsed < threshold:
+            return
+        plan = ""
+        if explain and statement.lstrip().upper().startswith(_EXPLAINABLE):
+            plan = "\n" + explain_plan(conn, statement, parameters, executemany)
+        if executemany and parameters:
+            shown = f"{len(parameters)} rows, first {parameters[0]!r}"
+        else:
+            shown = repr(parameters)
+        logger.warning(
+            "slow query (%.1f ms): %s\nparameters: %s%s",
+            elapsed * 1000,
+            " ".join(statement.split()),
+            shown,
+            plan,
+        )
+
+    return engine
+
+
+def explain_plan(conn, statement: str, parameters: Any, executemany: bool) -> str:
+    """The database's plan for ``statement``, without running it.
+
+    The plan is fetched on a raw cursor of the same connection, so it sees
+    the same transaction and fires no engine events of its own.
+    """
+    if executemany:
+        parameters = parameters[0] if parameters else ()
+    sqlite = conn.dialect.name == "sqlite"
+    prefix = "EXPLAIN QUERY PLAN " if sqlite else "EXPLAIN "
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        rows = cursor.fetchall()
+    except Exception as exc:
+        return f"(no plan: {exc})"
+    finally:
+        cursor.close()
+    if sqlite:
+        # (id, parent, notused, detail) rows; the detail reads like a plan.
+        return "\n".join(f"  {row[-1]}" for row in rows)
+    return "\n".join("  " + " ".join(str(v) for v in row) for row in rows)
+
+
+@dataclass
+class RouteProfile:
+    requests: int = 0
+    statements: int = 0
+    flagged: int = 0
+    shapes: Counter = field(default_factory=Counter)
+
+
+class StatementProfiler:
+    """Statement fingerprints per route, with N+1 warnings.
+
+    ``observe`` takes the ``QueryStats`` of one request collected with
+    ``shapes=True``. A request that runs one shape ``repeat_threshold`` or
+    more times is logged and counted as flagged.
+    """
+
+    def __init__(self, repeat_threshold: int = 5) -> None:
+        self.repeat_threshold = repeat_threshold
+        self.routes: Dict[str, RouteProfile] = {}
+
+    def observe(self, route: str, stats: QueryStats) -> None:
+        profile = self.routes.get(route)
+        if profile is None:
+            profile = self.routes[route] = RouteProfile()
+        profile.requests += 1
+        profile.statements += stats.statements
+        if stats.shapes:
+            profile.shapes.update(stats.shapes)
+        repeated = stats.repeated(self.repeat_threshold)
+        if repeated:
+            profile.flagged += 1
+            for shape, count in repeated.items():
+                logger.warning("possible N+1 in %s: %d x %s", route, count, shape)
+
+    def report(self) -> Dict[str, Any]:
+        """Per route: request count, statements per request and each shape."""
+        return {
+            route: {
+                "requests": p.requests,
+                "statements_per_request": p.statements / p.requests,
+                "n_plus_one_requests": p.flagged,
+                "shapes": [
+                    {"statement": shape, "per_request": count / p.requests}
+                    for shape, count in p.shapes.most_common()
+                ],
+            }
+            for route, p in sorted(self.routes.items())
+        }
@@ -0,0 +1,97 @@
+"""Count SQL statements and database time per unit of work, e.g. a request.
+
+``track(engine)`` hooks the engine's cursor events once. ``collect()`` then
+opens a scope whose ``QueryStats`` receives every statement executed in the
+same context, including sync endpoints' worker threads, which inherit the
+request's context. Statements outside any scope only cost the two event
+calls and a context variable lookup.
+
+With ``collect(shapes=True)`` statements are also counted by ``fingerprint``,
+which is how tests pin statement budgets and spot N+1 loops::
+
+    with query_stats.collect(shapes=True) as stats:
+        service.create_booking(req)
+    assert stats.statements <= 6 and not stats.repeated(2)
+"""
+from __future__ import annotations
+
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterator, Optional
+
+from sqlalchemy import event
+
+_START = "query_stats_started"
+_PARAM = r"(?:\?|%s|%\(\w+\)s|\$\d+|:\w+)"
+_PARAM_LIST = re.compile(rf"\(\s*{_PARAM}(?:\s*,\s*{_PARAM})+\s*\)")
+_REPEATED_ROWS = re.compile(r"(\(\?, \.\.\.\))(?:\s*,\s*\1)+")
+
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    seconds: float = 0.0
+    # Statements per fingerprint, kept by ``collect(shapes=True)``.
+    shapes: Optional[Counter] = None
+
+    def repeated(self, threshold: int) -> Dict[str, int]:
+        """Shapes run at least ``threshold`` times, the mark of an N+1 loop."""
+        if not self.shapes:
+            return {}
+        return {s: n for s, n in self.shapes.items() if n >= threshold}
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """``statement`` with whitespace and variable-length lists normalized.
+
+    Values are already bound parameters, so only ``IN`` lists and multi-row
+    ``VALUES`` differ between runs of one query; both collapse to ``(?, ...)``.
+    """
+    shape = _PARAM_LIST.sub("(?, ...)", " ".join(statement.split()))
+    return _REPEATED_ROWS.sub(r"\1", shape)
+
+
+@contextmanager
+def collect(shapes: bool = False) -> Iterator[QueryStats]:
+    stats = QueryStats(shapes=Counter() if shapes else None)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def track(engine):
+    """Report ``engine``'s statements to the active ``collect()`` scope.
+
+    Accepts sync and async engines and is safe to call more than once.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if not event.contains(sync_engine, "before_cursor_execute", _before):
+        event.listen(sync_engine, "before_cursor_execute", _before)
+        event.listen(sync_engine, "after_cursor_execute", _after)
+    return engine
+
+
+def _before(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None:
+        conn.info[_START] = time.perf_counter()
+
+
+def _after(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    started = conn.info.pop(_START, None)
+    if stats is not None and started is not None:
+        stats.statements += 1
+        stats.seconds += time.perf_counter() - started
+        if stats.shapes is not None:
+            stats.shapes[fingerprint(statement)] += 1
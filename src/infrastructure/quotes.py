@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Mapping, Sequence, Tuple
+
+import numpy as np
+
+from domain.entities import RoomType
+
+ROOM_TYPES: Tuple[RoomType, ...] = tuple(RoomType)
+_TYPE_INDEX = {room_type: i for i, room_type in enumerate(ROOM_TYPES)}
+
+
+@dataclass(frozen=True)
+class Season:
+    """Multiply nightly rates for nights in ``[start, end)``."""
+
+    start: date
+    end: date
+    multiplier: float
+
+
+@dataclass(frozen=True)
+class RatePlan:
+    """Nightly base rates per room type, adjusted by weekday and season.
+
+    The default plan charges ``RoomType.price`` every night.
+    """
+
+    base: Mapping[RoomType, int] = field(
+        default_factory=lambda: {t: t.price for t in ROOM_TYPES}
+    )
+    # Monday first, as ``date.weekday()`` counts.
+    weekday: Sequence[float] = (1.0,) * 7
+    seasons: Sequence[Season] = ()
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "RatePlan":
+        """Load a plan from JSON, e.g.::
+
+            {"base": {"suite": 320},
+             "weekday": [1, 1, 1, 1, 1.2, 1.25, 1],
+             "seasons": [{"start": "2026-12-20", "end": "2027-01-03",
+                          "multiplier": 1.5}]}
+
+        Omitted keys keep the defaults.
+        """
+        data = json.loads(Path(path).read_text())
+        base = {t: t.price for t in ROOM_TYPES}
+        base.update({RoomType(k): int(v) for k, v in data.get("base", {}).items()})
+        weekday = tuple(float(m) for m in data.get("weekday", (1.0,) * 7))
+        if len(weekday) != 7:
+            raise ValueError("weekday needs one multiplier per day, Monday first")
+        seasons = tuple(
+            Season(
+                date.fromisoformat(s["start"]),
+                date.fromisoformat(s["end"]),
+                float(s["multiplier"]),
+            )
+            for s in data.get("seasons", ())
+        )
+        return cls(base, weekday, seasons)
+
+
+class QuoteEngine:
+    """Price stays from per-date rate tables with O(1) range sums.
+
+    Nightly rates in cents are materialized as a room types x days array
+    starting at ``origin``, and each row is turned into a prefix sum. The
+    price of ``nights`` nights from ``check_in`` is then the difference of
+    two cells, which ``quote_many`` evaluates for a whole batch at once.
+    """
+
+    def __init__(
+        self, plan: RatePlan, origin: date, horizon_days: int = 730
+    ) -> None:
+        self.plan = plan
+        self.origin = origin
+        self.horizon_days = horizon_days
+        factor = np.asarray(plan.weekday, dtype=np.float64)[
+            (origin.weekday() + np.arange(horizon_days)) % 7
+        ]
+        for season in plan.seasons:
+            first = max(0, (season.start - origin).days)
+            last = min(horizon_days, (season.end - origin).days)
+            if first < last:
+                factor[first:last] *= season.multiplier
+        base = np.array([plan.base[t] * 100 for t in ROOM_TYPES], dtype=np.float64)
+        cents = np.rint(np.outer(base, factor)).astype(np.int64)
+        self._prefix = np.zeros((len(ROOM_TYPES), horizon_days + 1), dtype=np.int64)
+        np.cumsum(cents, axis=1, out=self._prefix[:, 1:])
+
+    @property
+    def end(self) -> date:
+        return self.origin + timedelta(days=self.horizon_days)
+
+    def quote(self, room_type: RoomType, check_in: date, nights: int) -> float | None:
+        """Total price of the stay, or None if it is outside the horizon."""
+        totals = self.quote_many([room_type], [check_in], [nights])
+        return None if np.isnan(totals[0]) else float(totals[0])
+
+    def quote_many(
+        self,
+        room_types: Sequence[RoomType],
+        check_ins: Sequence[date],
+        nights: Sequence[int],
+    ) -> np.ndarray:
+        """Vectorized ``quote``: totals in currency units, NaN when unpriced."""
+        rows = np.fromiter(
+            (_TYPE_INDEX[t] for t in room_types), dtype=np.intp, count=len(room_types)
+        )
+        days = np.array(check_ins, dtype="datetime64[D]")
+        start = (days - np.datetime64(self.origin, "D")).astype(np.int64)
+        stop = start + np.asarray(nights, dtype=np.int64)
+        valid = (start >= 0) & (stop > start) & (stop <= self.horizon_days)
+        first = np.where(valid, start, 0)
+        last = np.where(valid, stop, 0)
+        cents = self._prefix[rows, last] - self._prefix[rows, first]
+        return np.where(valid, cents / 100, np.nan)
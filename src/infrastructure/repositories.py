@@ -1,13 +1,84 @@
 from __future__ import annotations
 
-from datetime import date, datetime
-from typing import List
+from datetime import date
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set
+from sqlalchemy import (
+    Select,
+    Table,
+    delete,
+    func,
+    insert,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
 from sqlalchemy.orm import Session
 
 from domain.entities import Booking, Guest, Room, RoomType
-from domain.repositories import BookingRepository, GuestRepository, RoomRepository
+from domain.repositories import (
+    BookingRepository,
+    GuestRepository,
+    PageKey,
+    RoomRepository,
+)
 
-from .models import BookingModel, GuestModel, RoomModel
+from .mappers import (
+    booking_to_entity,
+    booking_to_model,
+    booking_to_row,
+    copy_booking_to_model,
+    guest_to_entity,
+    guest_to_model,
+    guest_to_row,
+    room_to_entity,
+)
+from . import room_nights
+from .models import (
+    ArchivedBookingModel,
+    BookingModel,
+    GuestModel,
+    RoomModel,
+    RoomNightModel,
+)
+
+# ``Booking.can_check_in`` and friends as WHERE clauses, so a transition is a
+# single guarded statement that also returns the changed row.
+CAN_CHECK_IN = (BookingModel.cancelled.is_(False), BookingModel.checked_in.is_(False))
+CAN_CHECK_OUT = (
+    BookingModel.checked_in.is_(True),
+    BookingModel.cancelled.is_(False),
+    BookingModel.checked_out.is_(False),
+)
+CAN_CANCEL = (BookingModel.checked_in.is_(False),)
+BOOKING_COLUMNS = tuple(BookingModel.__table__.c)
+
+BOOKING_TABLES = (BookingModel.__table__, ArchivedBookingModel.__table__)
+
+
+def with_archive(
+    build: Callable[[Table], Select], limit: Optional[int] = None
+) -> Select:
+    """Run ``build`` against live and archived bookings as one ordered query.
+
+    Each side is ordered by stay and limited on its own, so both use their
+    ``(..., check_in, reference)`` index, and the two are merged by stay.
+    """
+    parts = []
+    for table in BOOKING_TABLES:
+        part = build(table).order_by(table.c.check_in, table.c.reference)
+        if limit is not None:
+            part = part.limit(limit)
+        parts.append(select(part.subquery()))
+    both = union_all(*parts).subquery()
+    query = select(both).order_by(both.c.check_in, both.c.reference)
+    return query if limit is None else query.limit(limit)
+
+
+def after_key(table: Table, after: Optional[PageKey]) -> tuple:
+    if after is None:
+        return ()
+    return (tuple_(table.c.check_in, table.c.reference) > tuple_(*after),)
 
 
 class SqlGuestRepository(GuestRepository):
@@ -15,27 +86,23 @@ class SqlGuestRepository(GuestRepository):
         self.session = session
 
     def add(self, guest: Guest) -> None:
-        self.session.add(
-            GuestModel(
-                id=guest.id,
-                first_name=guest.first_name,
-                last_name=guest.last_name,
-                date_of_birth=guest.date_of_birth,
-            )
-        )
-        self.session.commit()
+        self.session.add(guest_to_model(guest))
+        self.session.flush()
 
     def get(self, guest_id: str) -> Guest | None:
         row = self.session.get(GuestModel, guest_id)
         if row:
-            return Guest(
-                id=row.id,
-                first_name=row.first_name,
-                last_name=row.last_name,
-                date_of_birth=row.date_of_birth,
-            )
+            return guest_to_entity(row)
         return None
 
+    def add_many(self, guests: List[Guest]) -> None:
+        if guests:
+            self.session.execute(insert(GuestModel), [guest_to_row(g) for g in guests])
+
+    def get_many(self, guest_ids: Iterable[str]) -> Dict[str, Guest]:
+        rows = self.session.query(GuestModel).filter(GuestModel.id.in_(set(guest_ids)))
+        return {r.id: guest_to_entity(r) for r in rows}
+
 
 class SqlRoomRepository(RoomRepository):
     def __init__(self, session: Session) -> None:
@@ -43,123 +110,177 @@ class SqlRoomRepository(RoomRepository):
 
     def list_all(self) -> List[Room]:
         rows = self.session.query(RoomModel).all()
-        return [Room(number=r.number, room_type=RoomType(r.room_type)) for r in rows]
+        return [room_to_entity(r) for r in rows]
 
     def get(self, number: str) -> Room | None:
         row = self.session.get(RoomModel, number)
         if row:
-            return Room(number=row.number, room_type=RoomType(row.room_type))
+            return room_to_entity(row)
         return None
 
+    def get_many(self, numbers: Iterable[str]) -> Dict[str, Room]:
+        rows = self.session.query(RoomModel).filter(RoomModel.number.in_(set(numbers)))
+        return {r.number: room_to_entity(r) for r in rows}
+
 
 class SqlBookingRepository(BookingRepository):
     def __init__(self, session: Session) -> None:
         self.session = session
 
     def add(self, booking: Booking) -> None:
-        self.session.add(
-            BookingModel(
-                reference=booking.reference,
-                guest_id=booking.guest_id,
-                first_name=booking.first_name,
-                last_name=booking.last_name,
-                date_of_birth=booking.date_of_birth,
-                room_type=booking.room_type.value,
-                room_number=booking.room_number,
-                number_of_guests=booking.number_of_guests,
-                check_in=booking.check_in,
-                check_out=booking.check_out,
-                paid=booking.paid,
-                cancelled=booking.cancelled,
-                checked_in=booking.checked_in,
-                checked_out=booking.checked_out,
-                created_at=booking.created_at,
-            )
-        )
-        self.session.commit()
+        room_nights.claim(self.session, [booking])
+        self.session.add(booking_to_model(booking))
+        self.session.flush()
 
     def get(self, reference: str) -> Booking | None:
         row = self.session.get(BookingModel, reference)
+        if row is None:
+            row = self.session.get(ArchivedBookingModel, reference)
         if row:
-            return Booking(
-                reference=row.reference,
-                guest_id=row.guest_id,
-                first_name=row.first_name,
-                last_name=row.last_name,
-                date_of_birth=row.date_of_birth,
-                room_type=RoomType(row.room_type),
-                room_number=row.room_number,
-                number_of_guests=row.number_of_guests,
-                check_in=row.check_in,
-                check_out=row.check_out,
-                paid=row.paid,
-                cancelled=row.cancelled,
-                checked_in=row.checked_in,
-                checked_out=row.checked_out,
-                created_at=row.created_at,
-            )
+            return booking_to_entity(row)
         return None
 
     def list_for_room(self, room_number: str) -> List[Booking]:
         rows = self.session.query(BookingModel).filter_by(room_number=room_number, cancelled=False).all()
-        return [self._to_entity(r) for r in rows]
+        return [booking_to_entity(r) for r in rows]
+
+    def has_conflict(self, room_number: str, check_in: date, check_out: date) -> bool:
+        query = room_nights.conflict_query(room_number, check_in, check_out)
+        return bool(self.session.scalar(query))
+
+    def booked_room_numbers(self, start: date, end: date) -> Set[str]:
+        return set(self.session.scalars(room_nights.booked_rooms_query(start, end)))
+
+    def count_free_by_type(
+        self, start: date, end: date
+    ) -> Optional[Dict[RoomType, int]]:
+        # One anti-join against the claims grouped by type; each room costs a
+        # primary-key probe and only (type, count) pairs come back.
+        booked = (
+            select(RoomNightModel.night)
+            .where(
+                RoomNightModel.room_number == RoomModel.number,
+                *room_nights.within(start, end),
+            )
+            .exists()
+        )
+        rows = self.session.execute(
+            select(RoomModel.room_type, func.count())
+            .where(~booked)
+            .group_by(RoomModel.room_type)
+        )
+        return {RoomType(room_type): count for room_type, count in rows}
+
+    def add_many(self, bookings: List[Booking]) -> None:
+        if bookings:
+            room_nights.claim(self.session, bookings)
+            self.session.execute(
+                insert(BookingModel), [booking_to_row(b) for b in bookings]
+            )
+
+    def list_active_for_rooms(
+        self, room_numbers: Iterable[str], start: date, end: date
+    ) -> List[Booking]:
+        rows = self.session.query(BookingModel).filter(
+            BookingModel.room_number.in_(set(room_numbers)),
+            BookingModel.cancelled.is_(False),
+            BookingModel.check_in < end,
+            BookingModel.check_out > start,
+        )
+        return [booking_to_entity(r) for r in rows]
 
     def list_for_guest(self, guest_id: str) -> List[Booking]:
-        rows = self.session.query(BookingModel).filter_by(guest_id=guest_id).all()
-        return [self._to_entity(r) for r in rows]
+        rows = self.session.execute(
+            with_archive(lambda t: select(t).where(t.c.guest_id == guest_id))
+        )
+        return [booking_to_entity(r) for r in rows]
 
     def remove(self, reference: str) -> None:
         row = self.session.get(BookingModel, reference)
         if row:
+            room_nights.release(self.session, reference)
             self.session.delete(row)
-            self.session.commit()
+            self.session.flush()
 
     def update(self, booking: Booking) -> None:
         row = self.session.get(BookingModel, booking.reference)
         if not row:
             return
-          
-        row.guest_id = booking.guest_id
-        row.first_name = booking.first_name
-        row.last_name = booking.last_name
-        row.date_of_birth = booking.date_of_birth
-        row.room_type = booking.room_type.value
-        row.room_number = booking.room_number
-
-        row.number_of_guests = booking.number_of_guests
-
-        row.check_in = booking.check_in
-        row.check_out = booking.check_out
-        row.paid = booking.paid
-        row.cancelled = booking.cancelled
-        row.checked_in = booking.checked_in
-        row.checked_out = booking.checked_out
-        row.created_at = booking.created_at
-
-        self.session.commit()
+        if room_nights.stay_key(row) != room_nights.stay_key(booking):
+            room_nights.release(self.session, booking.reference)
+            room_nights.claim(self.session, [booking])
+        copy_booking_to_model(booking, row)
+        self.session.flush()
+
+    def check_in(self, reference: str) -> Optional[Booking]:
+        return self._transition(reference, CAN_CHECK_IN, checked_in=True)
+
+    def check_out(self, reference: str) -> Optional[Booking]:
+        return self._transition(reference, CAN_CHECK_OUT, checked_out=True)
+
+    def cancel(self, reference: str) -> Optional[Booking]:
+        row = self.session.execute(
+            delete(BookingModel)
+            .where(BookingModel.reference == reference, *CAN_CANCEL)
+            .returning(*BOOKING_COLUMNS)
+        ).first()
+        if row is None:
+            return None
+        room_nights.release(self.session, reference)
+        return booking_to_entity(row)
+
+    def _transition(self, reference: str, guard, **values) -> Optional[Booking]:
+        row = self.session.execute(
+            update(BookingModel)
+            .where(BookingModel.reference == reference, *guard)
+            .values(**values)
+            .returning(*BOOKING_COLUMNS)
+        ).first()
+        return booking_to_entity(row) if row else None
 
     def list_between(self, start: date, end: date) -> List[Booking]:
         rows = self.session.query(BookingModel).filter(
             BookingModel.check_in < end, BookingModel.check_out > start
         ).all()
-        return [self._to_entity(r) for r in rows]
-
-    def _to_entity(self, row: BookingModel) -> Booking:
-        return Booking(
-            reference=row.reference,
-            guest_id=row.guest_id,
-            first_name=row.first_name,
-            last_name=row.last_name,
-            date_of_birth=row.date_of_birth,
-            room_type=RoomType(row.room_type),
-            room_number=row.room_number,
-            number_of_guests=row.number_of_guests,
-            check_in=row.check_in,
-            check_out=row.check_out,
-            paid=row.paid,
-            cancelled=row.cancelled,
-            checked_in=row.checked_in,
-            checked_out=row.checked_out,
-            created_at=row.created_at,
+        return [booking_to_entity(r) for r in rows]
+
+    def iter_between(
+        self, start: date, end: date, chunk_size: int = 1000
+    ) -> Iterator[Booking]:
+        # Plain rows fetched ``chunk_size`` at a time keep memory flat: no ORM
+        # instances are built and nothing accumulates in the identity map.
+        result = self.session.execute(
+            with_archive(
+                lambda t: select(t).where(t.c.check_in < end, t.c.check_out > start)
+            ).execution_options(yield_per=chunk_size)
+        )
+        for row in result:
+            yield booking_to_entity(row)
 
+    # Seek past the last seen key instead of OFFSET so every page costs the
+    # same index range scans however deep the client has paged.
+    def page_for_guest(
+        self, guest_id: str, limit: int, after: Optional[PageKey] = None
+    ) -> List[Booking]:
+        rows = self.session.execute(
+            with_archive(
+                lambda t: select(t).where(
+                    t.c.guest_id == guest_id, *after_key(t, after)
+                ),
+                limit,
+            )
+        )
+        return [booking_to_entity(r) for r in rows]
+
+    def page_between(
+        self, start: date, end: date, limit: int, after: Optional[PageKey] = None
+    ) -> List[Booking]:
+        rows = self.session.execute(
+            with_archive(
+                lambda t: select(t).where(
+                    t.c.check_in < end, t.c.check_out > start, *after_key(t, after)
+                ),
+                limit,
+            )
         )
+        return [booking_to_entity(r) for r in rows]
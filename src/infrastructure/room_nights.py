@@ -0,0 +1,257 @@
+"""Per-room-night claims that make double bookings impossible to commit.
+
+Every active booking owns one ``room_nights`` row per night it covers.
+Claims are written in the same transaction as the booking, so two
+overlapping bookings can both pass the optimistic ``has_conflict`` check
+but only one of them can insert its claims; the other fails with
+``ValueError`` and its transaction is rolled back by the caller.
+
+The claims double as the read model for availability: conflict checks and
+free-room queries are equality lookups on room and night instead of range
+predicates over ``bookings``. Check them against ``bookings``, and recompute
+them if they have drifted, with::
+
+    PYTHONPATH=src python -m infrastructure.room_nights sqlite:///./hotel.db --rebuild
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Iterable, List
+
+from sqlalchemy import Connection, Select, delete, exists, func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from domain.entities import Booking
+
+from .models import BookingModel, RoomNightModel
+
+CONFLICT = "Room already booked for these dates"
+
+# Expands every active booking into its nights in one statement. Dates are
+# stored as ISO text on SQLite, which ``date()`` reads and writes as is.
+_SQLITE_NIGHTS = """
+WITH RECURSIVE nights (room_number, night, check_out, reference) AS (
+    SELECT room_number, check_in, check_out, reference
+    FROM bookings WHERE NOT cancelled AND check_in < check_out
+    UNION ALL
+    SELECT room_number, date(night, '+1 day'), check_out, reference
+    FROM nights WHERE date(night, '+1 day') < check_out
+)
+SELECT room_number, night, reference FROM nights
+"""
+_SQLITE_REBUILD = (
+    "INSERT OR IGNORE INTO room_nights (room_number, night, reference)"
+    + _SQLITE_NIGHTS
+)
+_SQLITE_VERIFY = {
+    "missing": """
+        SELECT count(*) FROM (
+            SELECT room_number, night, reference FROM expected_nights
+            EXCEPT SELECT room_number, night, reference FROM room_nights)""",
+    "stray": """
+        SELECT count(*) FROM (
+            SELECT room_number, night, reference FROM room_nights
+            EXCEPT SELECT room_number, night, reference FROM expected_nights)""",
+    "double_booked": """
+        SELECT count(*) FROM (
+            SELECT 1 FROM expected_nights
+            GROUP BY room_number, night HAVING count(*) > 1)""",
+}
+
+
+@dataclass
+class ClaimReport:
+    """How the stored claims compare with the claims ``bookings`` implies.
+
+    ``missing`` nights of active bookings have no claim, ``stray`` claims
+    belong to no active booking's night, and ``double_booked`` room-nights
+    are covered by more than one active booking (only one of which can hold
+    the claim, so each also counts as missing).
+    """
+
+    expected: int
+    claimed: int
+    missing: int
+    stray: int
+    double_booked: int
+
+    @property
+    def consistent(self) -> bool:
+        return not (self.missing or self.stray or self.double_booked)
+
+
+def night_rows(bookings: Iterable[Booking]) -> List[dict]:
+    """Return the claim rows for the active bookings in ``bookings``."""
+    return [
+        {
+            "room_number": b.room_number,
+            "night": b.check_in + timedelta(days=i),
+            "reference": b.reference,
+        }
+        for b in bookings
+        if not b.cancelled
+        for i in range((b.check_out - b.check_in).days)
+    ]
+
+
+def stay_key(booking) -> tuple:
+    """The fields of a booking, entity or row, that decide its claims."""
+    return booking.room_number, booking.check_in, booking.check_out, booking.cancelled
+
+
+def within(start: date, end: date) -> tuple:
+    """Claims for nights in ``[start, end)``: every night of a stay in range."""
+    return RoomNightModel.night >= start, RoomNightModel.night < end
+
+
+def conflict_query(room_number: str, check_in: date, check_out: date) -> Select:
+    """Whether any night of the stay is claimed: one primary-key range probe."""
+    return select(
+        exists().where(
+            RoomNightModel.room_number == room_number, *within(check_in, check_out)
+        )
+    )
+
+
+def booked_rooms_query(start: date, end: date) -> Select:
+    return (
+        select(RoomNightModel.room_number).where(*within(start, end)).distinct()
+    )
+
+
+def claim(session: Session, bookings: Iterable[Booking]) -> None:
+    rows = night_rows(bookings)
+    if not rows:
+        return
+    try:
+        session.execute(insert(RoomNightModel), rows)
+    except IntegrityError:
+        raise ValueError(CONFLICT) from None
+
+
+def release(session: Session, reference: str) -> None:
+    session.execute(delete(RoomNightModel).where(RoomNightModel.reference == reference))
+
+
+async def claim_async(session: AsyncSession, bookings: Iterable[Booking]) -> None:
+    rows = night_rows(bookings)
+    if not rows:
+        return
+    try:
+        await session.execute(insert(RoomNightModel), rows)
+    except IntegrityError:
+        raise ValueError(CONFLICT) from None
+
+
+async def release_async(session: AsyncSession, reference: str) -> None:
+    await session.execute(
+        delete(RoomNightModel).where(RoomNightModel.reference == reference)
+    )
+
+
+def verify(conn: Connection) -> ClaimReport:
+    """Compare ``room_nights`` with the active bookings, without changing it."""
+    claimed = conn.scalar(select(func.count()).select_from(RoomNightModel))
+    if conn.dialect.name == "sqlite":
+        conn.exec_driver_sql("DROP TABLE IF EXISTS temp.expected_nights")
+        conn.exec_driver_sql("CREATE TEMP TABLE expected_nights AS" + _SQLITE_NIGHTS)
+        try:
+            counts = {
+                name: conn.exec_driver_sql(sql).scalar()
+                for name, sql in _SQLITE_VERIFY.items()
+            }
+            expected = conn.exec_driver_sql(
+                "SELECT count(*) FROM expected_nights"
+            ).scalar()
+        finally:
+            conn.exec_driver_sql("DROP TABLE temp.expected_nights")
+        return ClaimReport(expected, claimed, **counts)
+    wanted = {
+        (row["room_number"], row["night"], row["reference"])
+        for booking in conn.execute(select(BookingModel.__table__))
+        for row in night_rows([booking])
+    }
+    held = set(
+        conn.execute(
+            select(
+                RoomNightModel.room_number,
+                RoomNightModel.night,
+                RoomNightModel.reference,
+            )
+        ).tuples()
+    )
+    per_night = Counter((room, night) for room, night, _ in wanted)
+    return ClaimReport(
+        expected=len(wanted),
+        claimed=claimed,
+        missing=len(wanted - held),
+        stray=len(held - wanted),
+        double_booked=sum(1 for n in per_night.values() if n > 1),
+    )
+
+
+def rebuild(conn: Connection) -> None:
+    """Recompute every claim from the ``bookings`` table.
+
+    Used when upgrading a database that predates claims and after bulk loads.
+    Where stored bookings already overlap, the first claim for a night wins.
+    """
+    conn.execute(delete(RoomNightModel))
+    if conn.dialect.name == "sqlite":
+        conn.exec_driver_sql(_SQLITE_REBUILD)
+        return
+    rows = {}
+    for booking in conn.execute(select(BookingModel.__table__)):
+        for row in night_rows([booking]):
+            rows.setdefault((row["room_number"], row["night"]), row)
+    if rows:
+        conn.execute(insert(RoomNightModel), list(rows.values()))
+
+
+def _print_report(report: ClaimReport) -> None:
+    print(
+        f"{report.claimed:,} claims for {report.expected:,} booked room-nights:"
+        f" {report.missing:,} missing, {report.stray:,} stray,"
+        f" {report.double_booked:,} double booked"
+    )
+
+
+def main(argv: List[str] | None = None) -> None:
+    from .db import get_engine
+    from .migrations import upgrade
+
+    parser = argparse.ArgumentParser(
+        description="Check room-night claims against bookings"
+    )
+    parser.add_argument("url", nargs="?", default="sqlite:///./hotel.db")
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="recompute the claims from bookings if they are inconsistent",
+    )
+    args = parser.parse_args(argv)
+    engine = get_engine(args.url)
+    upgrade(engine)
+    with engine.connect() as conn:
+        report = verify(conn)
+    _print_report(report)
+    if not report.consistent and args.rebuild:
+        with engine.begin() as conn:
+            rebuild(conn)
+        with engine.connect() as conn:
+            report = verify(conn)
+        print("Rebuilt:", end=" ")
+        _print_report(report)
+    # Double bookings already stored survive a rebuild and need a person.
+    if not report.consistent:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
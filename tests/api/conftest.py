@@ -0,0 +1,18 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.async_main import app as async_app
+from src.api.main import app as sync_app
+
+
+@pytest.fixture(scope="module", params=["sync", "async"])
+def client(request):
+    app = sync_app if request.param == "sync" else async_app
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="module")
+def sync_client():
+    with TestClient(sync_app) as test_client:
+        yield test_client
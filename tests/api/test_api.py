@@ -1,18 +1,28 @@
-from datetime import date, timedelta
+import csv
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 
-from fastapi.testclient import TestClient
+from src.api.main import app as sync_app
+from src.api.pagination import DEFAULT_PAGE_SIZE
+from src.api.settings import Settings
+from src.infrastructure import room_nights
+from src.infrastructure.db import create_session, get_engine, init_db
+from src.infrastructure.models import (
+    BookingModel,
+    GuestModel,
+    RoomModel,
+    RoomNightModel,
+)
 
-from src.api.main import app, session
-from src.infrastructure.models import GuestModel, RoomModel, BookingModel
+engine = get_engine(Settings.from_env().database_url)
+init_db(engine)
+session = create_session(engine)
 
-client = TestClient(app)
 
-
-def test_create_and_get_booking():
-    session.query(BookingModel).delete()
-    session.query(GuestModel).delete()
-    session.query(RoomModel).delete()
-    session.commit()
+def test_create_and_get_booking(client):
+    clear_db()
 
     session.add(
         GuestModel(
@@ -50,13 +60,21 @@ def test_create_and_get_booking():
 
 
 def clear_db():
+    session.query(RoomNightModel).delete()
     session.query(BookingModel).delete()
     session.query(GuestModel).delete()
     session.query(RoomModel).delete()
     session.commit()
+    resources = getattr(sync_app.state, "resources", None)
+    if resources is None:
+        return
+    if resources.room_cache is not None:
+        resources.room_cache.invalidate()
+    if resources.guest_cache is not None:
+        resources.guest_cache.clear()
 
 
-def test_cancel_booking():
+def test_cancel_booking(client):
     clear_db()
     session.add(
         GuestModel(
@@ -92,7 +110,7 @@ def test_cancel_booking():
     assert resp.status_code == 404
 
 
-def test_room_availability():
+def test_room_availability(client):
     clear_db()
     session.add(
         GuestModel(
@@ -135,7 +153,7 @@ def test_room_availability():
     assert "102" in rooms and "101" not in rooms
 
 
-def test_check_in_and_out():
+def test_check_in_and_out(client):
     clear_db()
     session.add(
         GuestModel(
@@ -171,9 +189,14 @@ def test_check_in_and_out():
     resp = client.post(f"/bookings/{ref}/check-out")
     assert resp.status_code == 200
     assert resp.json()["checked_out"] is True
+    assert client.post(f"/bookings/{ref}/check-in").status_code == 409
+    assert client.post(f"/bookings/{ref}/check-out").status_code == 409
+    assert client.delete(f"/bookings/{ref}").status_code == 409
+    assert client.post("/bookings/missing/check-in").status_code == 404
+    assert client.delete("/bookings/missing").status_code == 404
 
 
-def test_guest_history_and_register():
+def test_guest_history_and_register(client):
     clear_db()
     resp = client.post(
         "/guests",
@@ -210,3 +233,423 @@ def test_guest_history_and_register():
     assert resp.status_code == 200
     assert len(resp.json()) == 1
 
+
+def test_failed_booking_rolls_back_new_guest(client):
+    clear_db()
+    payload = {
+        "guest_id": "g3",
+        "first_name": "Ian",
+        "last_name": "Irwin",
+        "date_of_birth": str(date.today() - timedelta(days=30 * 365)),
+        "room_type": "standard",
+        "room_number": "999",
+        "number_of_guests": 1,
+        "check_in": str(date.today() + timedelta(days=1)),
+        "check_out": str(date.today() + timedelta(days=2)),
+    }
+    resp = client.post("/bookings", json=payload)
+    assert resp.status_code == 400
+    session.expire_all()
+    assert session.get(GuestModel, "g3") is None
+
+
+def test_concurrent_requests_use_separate_sessions(client):
+    clear_db()
+    session.add_all(
+        [RoomModel(number=str(101 + i), room_type="standard") for i in range(20)]
+    )
+    session.commit()
+
+    def book(i: int) -> int:
+        payload = {
+            "guest_id": f"c{i}",
+            "first_name": "Cat",
+            "last_name": "Carr",
+            "date_of_birth": str(date.today() - timedelta(days=30 * 365)),
+            "room_type": "standard",
+            "room_number": str(101 + i),
+            "number_of_guests": 1,
+            "check_in": str(date.today() + timedelta(days=1)),
+            "check_out": str(date.today() + timedelta(days=2)),
+        }
+        return client.post("/bookings", json=payload).status_code
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        statuses = list(pool.map(book, range(20)))
+    assert statuses == [200] * 20
+    session.expire_all()
+    assert session.query(BookingModel).count() == 20
+
+
+def test_batch_booking(sync_client):
+    clear_db()
+    session.add_all(
+        [
+            RoomModel(number="101", room_type="standard"),
+            RoomModel(number="102", room_type="deluxe"),
+        ]
+    )
+    session.commit()
+
+    def item(room_number, room_type, day):
+        return {
+            "guest_id": "g9",
+            "first_name": "Bea",
+            "last_name": "Bell",
+            "date_of_birth": str(date.today() - timedelta(days=30 * 365)),
+            "room_type": room_type,
+            "room_number": room_number,
+            "number_of_guests": 1,
+            "check_in": str(date.today() + timedelta(days=day)),
+            "check_out": str(date.today() + timedelta(days=day + 2)),
+        }
+
+    resp = sync_client.post(
+        "/bookings/batch",
+        json={
+            "bookings": [
+                item("101", "standard", 2),
+                item("101", "standard", 3),
+                item("102", "deluxe", 3),
+            ]
+        },
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert (body["created"], body["failed"]) == (2, 1)
+    assert [r["status"] for r in body["results"]] == ["created", "failed", "created"]
+    ref = body["results"][2]["booking"]["reference"]
+    assert sync_client.get(f"/bookings/{ref}").status_code == 200
+    assert len(sync_client.get("/guests/g9/bookings").json()) == 2
+
+
+def test_export_bookings_streams_ndjson_and_csv(sync_client):
+    clear_db()
+    session.add_all(
+        [RoomModel(number=str(101 + i), room_type="standard") for i in range(3)]
+    )
+    session.commit()
+    for i in range(3):
+        payload = {
+            "guest_id": "g5",
+            "first_name": "Finn",
+            "last_name": "Ford",
+            "date_of_birth": str(date.today() - timedelta(days=30 * 365)),
+            "room_type": "standard",
+            "room_number": str(101 + i),
+            "number_of_guests": 1,
+            "check_in": str(date.today() + timedelta(days=1 + i)),
+            "check_out": str(date.today() + timedelta(days=2 + i)),
+        }
+        assert sync_client.post("/bookings", json=payload).status_code == 200
+
+    start = str(date.today() + timedelta(days=2))
+    end = str(date.today() + timedelta(days=10))
+    resp = sync_client.get(f"/bookings/export?start={start}&end={end}")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [r["room_number"] for r in rows] == ["102", "103"]
+
+    resp = sync_client.get(f"/bookings/export?start={start}&end={end}&format=csv")
+    assert resp.status_code == 200
+    records = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [r["room_number"] for r in records] == ["102", "103"]
+    assert records[0]["guest_id"] == "g5"
+
+    resp = sync_client.get(f"/bookings/export?start={end}&end={start}")
+    assert resp.status_code == 400
+
+
+def test_guest_history_and_range_listing_paginate_with_cursors(client):
+    clear_db()
+    session.add_all(
+        [RoomModel(number=str(101 + i), room_type="standard") for i in range(5)]
+    )
+    session.commit()
+    for i in range(5):
+        payload = {
+            "guest_id": "g6",
+            "first_name": "Gail",
+            "last_name": "Grant",
+            "date_of_birth": str(date.today() - timedelta(days=30 * 365)),
+            "room_type": "standard",
+            "room_number": str(101 + i),
+            "number_of_guests": 1,
+            "check_in": str(date.today() + timedelta(days=1 + i)),
+            "check_out": str(date.today() + timedelta(days=2 + i)),
+        }
+        assert client.post("/bookings", json=payload).status_code == 200
+
+    rooms, url = [], "/guests/g6/bookings?limit=2"
+    while url:
+        resp = client.get(url)
+        assert resp.status_code == 200
+        rooms.append([b["room_number"] for b in resp.json()])
+        link = resp.headers.get("link")
+        url = link[1 : link.index(">")] if link else None
+    assert rooms == [["101", "102"], ["103", "104"], ["105"]]
+    assert "x-next-cursor" not in resp.headers
+
+    assert client.get("/guests/g6/bookings?cursor=nope").status_code == 400
+    assert client.get("/guests/g6/bookings?limit=0").status_code == 422
+
+
+def test_guest_history_without_paging_params_is_unbounded(client):
+    clear_db()
+    session.add(RoomModel(number="101", room_type="standard"))
+    first = date.today() + timedelta(days=1)
+    session.add_all(
+        BookingModel(
+            reference=f"h{i}",
+            guest_id="g7",
+            first_name="Hal",
+            last_name="Hart",
+            date_of_birth=date(1990, 1, 1),
+            room_type="standard",
+            room_number="101",
+            number_of_guests=1,
+            check_in=first + timedelta(days=i),
+            check_out=first + timedelta(days=i + 1),
+            paid=True,
+            cancelled=False,
+            created_at=datetime(2030, 1, 1),
+        )
+        for i in range(DEFAULT_PAGE_SIZE + 1)
+    )
+    session.commit()
+
+    resp = client.get("/guests/g7/bookings")
+    assert len(resp.json()) == DEFAULT_PAGE_SIZE + 1
+    assert "x-next-cursor" not in resp.headers
+    # A cursor alone pages with the default size.
+    resp = client.get("/guests/g7/bookings?limit=1")
+    cursor = resp.headers["x-next-cursor"]
+    resp = client.get(f"/guests/g7/bookings?cursor={cursor}")
+    assert len(resp.json()) == DEFAULT_PAGE_SIZE
+    assert resp.json()[0]["reference"] == "h1"
+
+
+def test_list_bookings_between_paginates(sync_client):
+    clear_db()
+    session.add_all(
+        [RoomModel(number=str(101 + i), room_type="standard") for i in range(5)]
+    )
+    session.commit()
+    for i in range(5):
+        payload = {
+            "guest_id": "g7",
+            "first_name": "Hal",
+            "last_name": "Hart",
+            "date_of_birth": str(date.today() - timedelta(days=30 * 365)),
+            "room_type": "standard",
+            "room_number": str(101 + i),
+            "number_of_guests": 1,
+            "check_in": str(date.today() + timedelta(days=1 + i)),
+            "check_out": str(date.today() + timedelta(days=2 + i)),
+        }
+        assert sync_client.post("/bookings", json=payload).status_code == 200
+
+    start = str(date.today() + timedelta(days=2))
+    end = str(date.today() + timedelta(days=10))
+    resp = sync_client.get(f"/bookings?start={start}&end={end}&limit=3")
+    assert [b["room_number"] for b in resp.json()] == ["102", "103", "104"]
+    cursor = resp.headers["x-next-cursor"]
+    resp = sync_client.get(
+        f"/bookings?start={start}&end={end}&limit=3&cursor={cursor}"
+    )
+    assert [b["room_number"] for b in resp.json()] == ["105"]
+    assert "link" not in resp.headers
+    assert sync_client.get(f"/bookings?start={end}&end={start}").status_code == 400
+
+
+def test_availability_summary_counts_free_rooms_by_type(sync_client):
+    clear_db()
+    session.add_all(
+        [
+            RoomModel(number="101", room_type="standard"),
+            RoomModel(number="102", room_type="standard"),
+            RoomModel(number="201", room_type="suite"),
+        ]
+    )
+    session.commit()
+    check_in = date.today() + timedelta(days=3)
+    for reference, room, cancelled in (("s1", "101", False), ("s2", "201", True)):
+        session.add(
+            BookingModel(
+                reference=reference,
+                guest_id="g9",
+                first_name="Ivy",
+                last_name="Ives",
+                date_of_birth=date(1990, 1, 1),
+                room_type="standard" if room == "101" else "suite",
+                room_number=room,
+                number_of_guests=1,
+                check_in=check_in,
+                check_out=check_in + timedelta(days=2),
+                paid=True,
+                cancelled=cancelled,
+                created_at=datetime(2030, 1, 1),
+            )
+        )
+    session.flush()
+    # Rows written behind the repositories' back need their claims rebuilt,
+    # as after a bulk load.
+    room_nights.rebuild(session.connection())
+    session.commit()
+
+    start = str(check_in + timedelta(days=1))
+    end = str(check_in + timedelta(days=4))
+    resp = sync_client.get(f"/rooms/availability/summary?start={start}&end={end}")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["nights"] == 3
+    assert [
+        (t["room_type"], t["available"], t["nightly_price"], t["stay_price"])
+        for t in body["room_types"]
+    ] == [
+        ("standard", 1, 100, 300),
+        ("deluxe", 0, 200, 600),
+        ("suite", 1, 300, 900),
+    ]
+    resp = sync_client.get(f"/rooms/availability/summary?start={end}&end={start}")
+    assert resp.status_code == 400
+
+
+def test_quote_batch(sync_client):
+    check_in = date.today() + timedelta(days=10)
+    quotes = [
+        {"room_type": "standard", "check_in": str(check_in), "nights": 3},
+        {"room_type": "suite", "check_in": str(check_in), "nights": 2},
+        {
+            "room_type": "deluxe",
+            "check_in": str(check_in + timedelta(days=5000)),
+            "nights": 1,
+        },
+    ]
+    resp = sync_client.post("/quotes/batch", json={"quotes": quotes})
+    assert resp.status_code == 200
+    assert [q["total"] for q in resp.json()["quotes"]] == [300, 600, None]
+    bad = {
+        "quotes": [{"room_type": "standard", "check_in": str(check_in), "nights": 0}]
+    }
+    assert sync_client.post("/quotes/batch", json=bad).status_code == 422
+
+
+def test_group_commit_bookings_open_no_request_session():
+    from src.api.main import Resources, get_booking_writer
+
+    def no_session():
+        raise AssertionError("grouped bookings must not open a session")
+
+    writer = object()
+    resources = Resources(None, no_session, None, group_commit=writer)
+    assert next(get_booking_writer(resources)) is writer
+
+
+def test_metrics_report_route_latency_status_and_sql(client):
+    def series(text, name):
+        return {
+            line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+            for line in text.splitlines()
+            if line.startswith(name + "{")
+        }
+
+    client.get("/rooms")
+    client.get("/bookings/missing-1")
+    client.get("/bookings/missing-2")
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = resp.text
+    responses = series(text, "hotel_http_responses_total")
+    route = 'method="GET",route="/bookings/{reference}"'
+    assert responses[f"hotel_http_responses_total{{{route},status=\"404\"}}"] >= 2
+    rooms = 'method="GET",route="/rooms",status="200"'
+    assert responses[f"hotel_http_responses_total{{{rooms}}}"] >= 1
+    latency = series(text, "hotel_http_request_duration_seconds_count")
+    assert latency[f"hotel_http_request_duration_seconds_count{{{route}}}"] >= 2
+    statements = series(text, "hotel_db_statements_per_request_sum")
+    assert statements[f"hotel_db_statements_per_request_sum{{{route}}}"] >= 2
+    assert "hotel_http_requests_in_progress 1" in text
+    # Statement profiling is opt-in.
+    assert client.get("/debug/sql-profile").status_code == 404
+
+
+def test_metrics_export_cache_stats(sync_client):
+    sync_client.get("/rooms")
+    sync_client.get("/rooms")
+    text = sync_client.get("/metrics").text
+    values = {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+        for line in text.splitlines()
+        if line.startswith("hotel_cache_")
+    }
+    assert "# TYPE hotel_cache_hits_total counter" in text
+    assert values['hotel_cache_hits_total{cache="room"}'] >= 1
+    assert values['hotel_cache_misses_total{cache="room"}'] >= 1
+    assert 'hotel_cache_entries{cache="guest"}' in values
+    assert 0 <= values['hotel_cache_hit_ratio{cache="guest"}'] <= 1
+    # The room catalog cache holds one entry and never evicts.
+    assert 'hotel_cache_evictions_total{cache="room"}' not in values
+
+
+def test_booking_out_from_entity_matches_validated_model():
+    # The app imports entities as ``domain.*``; use the same classes.
+    from src.api.schemas import Booking, BookingOut, Guest, GuestOut, RoomType
+
+    booking = Booking(
+        reference="r1",
+        guest_id="g1",
+        first_name="Alice",
+        last_name="Smith",
+        date_of_birth=date(1990, 1, 1),
+        room_type=RoomType.DELUXE,
+        room_number="102",
+        number_of_guests=2,
+        check_in=date(2030, 1, 1),
+        check_out=date(2030, 1, 4),
+        paid=True,
+    )
+    assert not hasattr(booking, "__dict__")
+    expected = BookingOut.model_validate(
+        {name: getattr(booking, name) for name in BookingOut.model_fields}
+    )
+    actual = BookingOut.from_entity(booking)
+    assert actual.model_dump_json() == expected.model_dump_json()
+    guest = Guest("g1", "Alice", "Smith", date(1990, 1, 1))
+    assert GuestOut.from_entity(guest).model_dump() == {
+        "id": "g1",
+        "first_name": "Alice",
+        "last_name": "Smith",
+        "date_of_birth": date(1990, 1, 1),
+    }
+
+
+def test_entities_serialize_with_exactly_the_schema_fields():
+    from dataclasses import fields
+
+    from src.api import serialization
+    from src.api.schemas import BookingOut, GuestOut, RoomOut, RoomType
+
+    for entity, schema in (
+        (serialization.Booking, BookingOut),
+        (serialization.Guest, GuestOut),
+        (serialization.Room, RoomOut),
+    ):
+        assert {f.name for f in fields(entity)} == set(schema.model_fields)
+
+    booking = serialization.Booking(
+        reference="r1",
+        guest_id="g1",
+        first_name="Alice",
+        last_name="Smith",
+        date_of_birth=date(1990, 1, 1),
+        room_type=RoomType.SUITE,
+        room_number="103",
+        number_of_guests=2,
+        check_in=date(2030, 1, 1),
+        check_out=date(2030, 1, 4),
+    )
+    body = serialization.bookings_response([booking]).body
+    assert json.loads(body) == [BookingOut.from_entity(booking).model_dump(mode="json")]
@@ -1,5 +1,7 @@
 from datetime import date, timedelta
 
+from sqlalchemy import event
+
 from src.application.use_cases import BookingService, CreateBookingRequest
 from src.domain.entities import Guest, RoomType
 from src.domain.services import BookingPolicy
@@ -58,6 +60,97 @@ def test_create_booking(tmp_path):
     )
 
     booking = service.create_booking(req)
+    session.commit()
     assert booking.reference
     fetched = service.get_booking(booking.reference)
     assert fetched is not None
+
+
+def make_request(guest_id, room_number, start_offset, nights=1, first_name="Alice"):
+    return CreateBookingRequest(
+        guest_id=guest_id,
+        first_name=first_name,
+        last_name="Smith",
+        date_of_birth=date.today() - timedelta(days=30 * 365),
+        room_type=RoomType.STANDARD,
+        room_number=room_number,
+        number_of_guests=1,
+        check_in=date.today() + timedelta(days=start_offset),
+        check_out=date.today() + timedelta(days=start_offset + nights),
+        paid=True,
+    )
+
+
+def test_create_bookings_batch_reports_per_item(tmp_path):
+    booking_repo, guest_repo, room_repo, session = create_repos()
+    session.add_all(
+        [
+            RoomModel(number="101", room_type="standard"),
+            RoomModel(number="102", room_type="standard"),
+        ]
+    )
+    session.commit()
+    service = BookingService(booking_repo, guest_repo, room_repo, BookingPolicy())
+    service.create_booking(make_request("g0", "102", 10, nights=3))
+    session.commit()
+
+    statements = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, sql, params, context, executemany: statements.append(sql),
+    )
+    results = service.create_bookings(
+        [
+            make_request("g1", "101", 2, nights=2),
+            make_request("g1", "101", 3),
+            make_request("g1", "101", 4),
+            make_request("g2", "102", 11),
+            make_request("g1", "999", 5),
+            make_request("g1", "101", 6, first_name="Alicia"),
+        ]
+    )
+    session.commit()
+
+    assert [r.error for r in results] == [
+        None,
+        "Room already booked for these dates",
+        None,
+        "Room already booked for these dates",
+        "Room not found",
+        "Guest details mismatch",
+    ]
+    inserts = [s.split()[2] for s in statements if s.startswith("INSERT")]
+    assert sorted(inserts) == ["bookings", "guests", "room_nights"]
+    assert len(service.list_guest_bookings("g1")) == 2
+    assert guest_repo.get("g2") is None
+
+
+class ListingBookingRepository(SqlBookingRepository):
+    # A store that cannot count free rooms itself.
+    def count_free_by_type(self, start, end):
+        return None
+
+
+def test_availability_summary_falls_back_to_the_room_catalog(tmp_path):
+    booking_repo, guest_repo, room_repo, session = create_repos()
+    session.add_all(
+        [
+            RoomModel(number="101", room_type="standard"),
+            RoomModel(number="102", room_type="standard"),
+            RoomModel(number="201", room_type="suite"),
+        ]
+    )
+    session.commit()
+    service = BookingService(booking_repo, guest_repo, room_repo, BookingPolicy())
+    service.create_booking(make_request("g1", "101", 10, nights=3))
+    session.commit()
+    listing = BookingService(
+        ListingBookingRepository(session), guest_repo, room_repo, BookingPolicy()
+    )
+
+    start = date.today() + timedelta(days=11)
+    end = start + timedelta(days=2)
+    expected = {RoomType.STANDARD: 1, RoomType.DELUXE: 0, RoomType.SUITE: 1}
+    assert service.availability_summary(start, end) == expected
+    assert listing.availability_summary(start, end) == expected
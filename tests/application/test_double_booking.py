@@ -0,0 +1,104 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from sqlalchemy.exc import OperationalError
+
+from src.application.use_cases import BookingService, CreateBookingRequest
+from src.domain.entities import RoomType
+from src.domain.services import BookingPolicy
+from src.infrastructure.db import create_session, get_engine, init_db
+from src.infrastructure.repositories import (
+    SqlBookingRepository,
+    SqlGuestRepository,
+    SqlRoomRepository,
+)
+
+REQUESTS = 2000
+THREADS = 16
+# Writers wait on SQLite's busy timeout; one that still finds the database
+# locked retries rather than counting as a conflict.
+ATTEMPTS = 5
+ROOMS = ["101", "102", "103", "104", "105"]
+
+OVERLAPS = """
+SELECT count(*) FROM bookings a JOIN bookings b
+  ON a.room_number = b.room_number AND a.reference < b.reference
+ AND a.check_in < b.check_out AND b.check_in < a.check_out
+WHERE NOT a.cancelled AND NOT b.cancelled
+"""
+
+
+class OptimisticPolicy(BookingPolicy):
+    # Skip the read-side check so every request races to the write.
+    def validate_availability(self, booking_repo, new_booking) -> None:
+        pass
+
+
+def test_parallel_conflicting_requests_never_overlap(tmp_path):
+    engine = get_engine(f"sqlite:///{tmp_path / 'stress.db'}", pool_size=THREADS)
+    init_db(engine)
+    rng = random.Random(7)
+    start = date.today() + timedelta(days=2)
+    stays = [
+        (
+            rng.choice(ROOMS),
+            start + timedelta(days=rng.randrange(60)),
+            rng.randint(1, 5),
+        )
+        for _ in range(REQUESTS)
+    ]
+
+    def book(i: int) -> bool:
+        for _ in range(ATTEMPTS):
+            try:
+                return attempt(i)
+            except OperationalError as exc:
+                if "database is locked" not in str(exc):
+                    raise
+        raise AssertionError(f"request {i} found the database locked every time")
+
+    def attempt(i: int) -> bool:
+        room, check_in, nights = stays[i]
+        session = create_session(engine)
+        service = BookingService(
+            SqlBookingRepository(session),
+            SqlGuestRepository(session),
+            SqlRoomRepository(session),
+            OptimisticPolicy(),
+        )
+        try:
+            service.create_booking(
+                CreateBookingRequest(
+                    guest_id=f"s{i}",
+                    first_name="Sam",
+                    last_name="Stone",
+                    date_of_birth=date(1990, 1, 1),
+                    room_type=RoomType.STANDARD,
+                    room_number=room,
+                    number_of_guests=1,
+                    check_in=check_in,
+                    check_out=check_in + timedelta(days=nights),
+                )
+            )
+            session.commit()
+            return True
+        except ValueError:
+            session.rollback()
+            return False
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        accepted = sum(pool.map(book, range(REQUESTS)))
+
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql(OVERLAPS).scalar() == 0
+        booked, booked_nights = conn.exec_driver_sql(
+            "SELECT count(*), sum(julianday(check_out) - julianday(check_in))"
+            " FROM bookings"
+        ).one()
+        claims = conn.exec_driver_sql("SELECT count(*) FROM room_nights").scalar()
+    assert booked == accepted
+    assert 0 < accepted < REQUESTS
+    assert claims == booked_nights
@@ -0,0 +1,112 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from src.application.group_commit import GroupCommitWriter
+from src.application.use_cases import (
+    BatchItemResult,
+    BookingService,
+    CreateBookingRequest,
+)
+from src.domain.entities import RoomType
+from src.domain.services import BookingPolicy
+from src.infrastructure.db import create_session, get_engine, init_db
+from src.infrastructure.repositories import (
+    SqlBookingRepository,
+    SqlGuestRepository,
+    SqlRoomRepository,
+)
+
+ROOMS = ["101", "102", "103", "104", "105"]
+
+
+def request(guest_id: str, room: str, check_in: date) -> CreateBookingRequest:
+    return CreateBookingRequest(
+        guest_id=guest_id,
+        first_name="Gail",
+        last_name="Case",
+        date_of_birth=date(1990, 1, 1),
+        room_type=RoomType.STANDARD,
+        room_number=room,
+        number_of_guests=1,
+        check_in=check_in,
+        check_out=check_in + timedelta(days=2),
+    )
+
+
+def test_concurrent_bookings_share_commits(tmp_path):
+    engine = get_engine(f"sqlite:///{tmp_path / 'group.db'}")
+    init_db(engine)
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(1))
+
+    def write_batch(reqs):
+        session = create_session(engine)
+        try:
+            service = BookingService(
+                SqlBookingRepository(session),
+                SqlGuestRepository(session),
+                SqlRoomRepository(session),
+                BookingPolicy(),
+            )
+            results = service.create_bookings(reqs)
+            session.commit()
+            return results
+        finally:
+            session.close()
+
+    start = date.today() + timedelta(days=3)
+    # Every room is asked for twice per stay, so half the requests must fail.
+    reqs = [
+        request(f"gc{i}", ROOMS[i % 5], start + timedelta(days=2 * (i // 10)))
+        for i in range(200)
+    ]
+    writer = GroupCommitWriter(write_batch, max_items=64, max_delay=0.005)
+    writer.start()
+
+    def book(req):
+        try:
+            return writer.create_booking(req)
+        except ValueError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        created = [b for b in pool.map(book, reqs) if b is not None]
+    writer.close()
+
+    assert len(created) == 100
+    assert len(commits) < len(reqs) / 4
+    with engine.connect() as conn:
+        stored = conn.exec_driver_sql("SELECT count(*) FROM bookings").scalar()
+        claims = conn.exec_driver_sql("SELECT count(*) FROM room_nights").scalar()
+    assert stored == 100
+    assert claims == 200
+
+
+def test_failed_group_is_retried_one_request_at_a_time():
+    calls = []
+
+    def write_batch(reqs):
+        calls.append([r.guest_id for r in reqs])
+        if any(r.guest_id == "bad" for r in reqs):
+            raise ValueError("Room already booked for these dates")
+        return [BatchItemResult(error=r.guest_id) for r in reqs]
+
+    writer = GroupCommitWriter(write_batch, max_items=3, max_delay=1.0)
+    writer.start()
+    check_in = date.today() + timedelta(days=3)
+    futures = [
+        writer.submit(request(g, "101", check_in))
+        for g in ("a", "bad", "c")
+    ]
+    writer.close()
+
+    assert calls == [["a", "bad", "c"], ["a"], ["bad"], ["c"]]
+    assert futures[0].result().error == "a"
+    with pytest.raises(ValueError):
+        futures[1].result()
+    assert futures[2].result().error == "c"
+    with pytest.raises(RuntimeError):
+        writer.submit(request("late", "101", check_in))
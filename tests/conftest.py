@@ -0,0 +1,27 @@
+from datetime import date, timedelta
+
+import pytest
+
+from src.domain.entities import Booking, RoomType
+
+
+def build_booking(reference, room_number, check_in, nights=2, **fields):
+    return Booking(
+        reference=reference,
+        guest_id="g1",
+        first_name="Alice",
+        last_name="Smith",
+        date_of_birth=date(1990, 1, 1),
+        room_type=RoomType.STANDARD,
+        room_number=room_number,
+        number_of_guests=1,
+        check_in=check_in,
+        check_out=check_in + timedelta(days=nights),
+        **fields,
+    )
+
+
+@pytest.fixture
+def make_booking():
+    """A standard-room booking for guest g1; keyword ``fields`` override."""
+    return build_booking
@@ -0,0 +1,57 @@
+from datetime import date, timedelta
+
+from src.domain.availability import IntervalSet, RoomIntervalIndex
+
+
+def test_interval_set_half_open_overlaps():
+    day = date(2030, 1, 10)
+    intervals = IntervalSet()
+    intervals.add("r1", day, day + timedelta(days=3))
+    assert intervals.overlaps(day + timedelta(days=2), day + timedelta(days=5))
+    assert not intervals.overlaps(day + timedelta(days=3), day + timedelta(days=5))
+    assert not intervals.overlaps(day - timedelta(days=2), day)
+
+
+def test_interval_set_finds_long_stay_behind_short_ones():
+    day = date(2030, 1, 1)
+    intervals = IntervalSet()
+    intervals.add("long", day, day + timedelta(days=20))
+    intervals.add("short", day + timedelta(days=1), day + timedelta(days=2))
+    assert intervals.overlaps(day + timedelta(days=10), day + timedelta(days=11))
+    intervals.remove("long")
+    assert not intervals.overlaps(day + timedelta(days=10), day + timedelta(days=11))
+    assert len(intervals) == 1
+
+
+def test_room_index_tracks_add_update_remove(make_booking):
+    day = date(2030, 1, 1)
+    index = RoomIntervalIndex()
+    rows = {
+        f"old{i}": make_booking(f"old{i}", "101", day - timedelta(days=3 * i), 2)
+        for i in range(1, 50)
+    }
+    rows["other"] = make_booking("other", "102", day + timedelta(days=5), 2)
+    loads = []
+
+    def loader(room_number):
+        loads.append(room_number)
+        return [b for b in rows.values() if b.room_number == room_number]
+
+    assert not index.overlaps("101", day, day + timedelta(days=2), loader)
+    assert not index.overlaps("102", day, day + timedelta(days=2), loader)
+    booking = make_booking("new", "101", day, 2)
+    rows["new"] = booking
+    index.add(booking)
+    assert index.overlaps(
+        "101", day + timedelta(days=1), day + timedelta(days=3), loader
+    )
+
+    booking.room_number = "102"
+    index.update(booking)
+    assert not index.overlaps("101", day, day + timedelta(days=2), loader)
+    assert index.overlaps("102", day, day + timedelta(days=2), loader)
+
+    del rows["new"]
+    index.remove("102", "new")
+    assert not index.overlaps("102", day, day + timedelta(days=2), loader)
+    assert loads == ["101", "102"]
@@ -0,0 +1,82 @@
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from src.infrastructure.archive import archive_bookings
+from src.infrastructure.async_repositories import AsyncSqlBookingRepository
+from src.infrastructure.db import (
+    create_async_session_factory,
+    create_session,
+    get_async_engine,
+    get_engine,
+    init_db,
+    to_async_url,
+)
+from src.infrastructure.models import (
+    ArchivedBookingModel,
+    BookingModel,
+    RoomNightModel,
+)
+from src.infrastructure.repositories import SqlBookingRepository
+
+TODAY = date(2030, 6, 1)
+
+
+def test_archive_moves_finished_stays_and_reads_union_both(tmp_path, make_booking):
+    url = f"sqlite:///{tmp_path / 'hotel.db'}"
+    engine = get_engine(url)
+    init_db(engine)
+    session = create_session(engine)
+    repo = SqlBookingRepository(session)
+    # Three stays long past, one just finished, one upcoming.
+    for i, offset in enumerate((-400, -300, -200, -3, 10)):
+        check_in = TODAY + timedelta(days=offset)
+        repo.add(make_booking(f"r{i}", "101", check_in))
+    session.commit()
+
+    with pytest.raises(ValueError):
+        archive_bookings(engine, TODAY + timedelta(days=1), today=TODAY)
+    moved = archive_bookings(engine, TODAY - timedelta(days=30), 2, today=TODAY)
+    assert moved == 3
+    assert archive_bookings(engine, TODAY - timedelta(days=30), today=TODAY) == 0
+
+    with engine.connect() as conn:
+        def count(model):
+            return conn.scalar(select(func.count()).select_from(model))
+
+        assert count(BookingModel) == 2
+        assert count(ArchivedBookingModel) == 3
+        assert count(RoomNightModel) == 4
+        claimed = conn.scalars(select(RoomNightModel.reference).distinct()).all()
+        assert sorted(claimed) == ["r3", "r4"]
+
+    session.expire_all()
+    # Conflict checks only see live bookings; history reads both tables.
+    assert [b.reference for b in repo.list_for_room("101")] == ["r3", "r4"]
+    history = repo.list_for_guest("g1")
+    assert [b.reference for b in history] == [f"r{i}" for i in range(5)]
+    assert repo.get("r0").check_in == TODAY - timedelta(days=400)
+    first = repo.page_for_guest("g1", 2)
+    second = repo.page_for_guest("g1", 2, (first[-1].check_in, first[-1].reference))
+    assert [b.reference for b in first + second] == ["r0", "r1", "r2", "r3"]
+    start, end = TODAY - timedelta(days=250), TODAY
+    assert [b.reference for b in repo.iter_between(start, end)] == ["r2", "r3"]
+    assert [b.reference for b in repo.page_between(start, end, 1)] == ["r2"]
+    # Archived stays can no longer change.
+    assert repo.check_in("r0") is None and repo.cancel("r0") is None
+    session.close()
+
+    async def async_history():
+        async_engine = get_async_engine(to_async_url(url))
+        async with create_async_session_factory(async_engine)() as async_session:
+            async_repo = AsyncSqlBookingRepository(async_session)
+            page = await async_repo.page_for_guest("g1", 3)
+            archived = await async_repo.get("r1")
+        await async_engine.dispose()
+        return page, archived
+
+    page, archived = asyncio.run(async_history())
+    assert [b.reference for b in page] == ["r0", "r1", "r2"]
+    assert archived is not None and archived.reference == "r1"
@@ -0,0 +1,83 @@
+import json
+from datetime import date
+
+import pytest
+from sqlalchemy import inspect, select
+
+from src.infrastructure.bulk_load import bulk_load, main
+from src.infrastructure.db import get_engine
+from src.infrastructure.migrations import SCHEMA_VERSION, schema_version
+from src.infrastructure.models import BookingModel, GuestModel, RoomModel
+
+
+def booking_record(i: int) -> dict:
+    return {
+        "reference": f"r{i}",
+        "guest_id": "g1",
+        "first_name": "Alice",
+        "last_name": "Smith",
+        "date_of_birth": "1990-01-01",
+        "room_type": "standard",
+        "room_number": "101",
+        "number_of_guests": 1,
+        "check_in": f"2030-01-{i + 1:02d}",
+        "check_out": f"2030-01-{i + 2:02d}",
+        "paid": i % 2 == 0,
+        "cancelled": False,
+        "created_at": "2029-12-01T09:30:00",
+    }
+
+
+def test_bulk_load_streams_csv_and_ndjson_and_rebuilds_indexes(tmp_path):
+    rooms = tmp_path / "rooms.csv"
+    rooms.write_text("number,room_type\n101,standard\n102,suite\n")
+    guests = tmp_path / "guests.csv"
+    guests.write_text("id,first_name,last_name,date_of_birth\ng1,Alice,Smith,1990-01-01\n")
+    bookings = tmp_path / "bookings.ndjson"
+    bookings.write_text("".join(json.dumps(booking_record(i)) + "\n" for i in range(7)))
+    engine = get_engine(f"sqlite:///{tmp_path / 'load.db'}")
+
+    seen = []
+    results = bulk_load(
+        engine,
+        {"bookings": bookings, "rooms": rooms, "guests": guests},
+        chunk_size=3,
+        progress=lambda stats: seen.append((stats.table, stats.rows)),
+    )
+
+    assert {s.table: s.rows for s in results} == {
+        "rooms": 2,
+        "guests": 1,
+        "bookings": 7,
+    }
+    assert ("bookings", 3) in seen and ("bookings", 6) in seen
+    indexes = {ix["name"] for ix in inspect(engine).get_indexes("bookings")}
+    assert indexes == {ix.name for ix in BookingModel.__table__.indexes}
+    with engine.connect() as conn:
+        row = conn.execute(
+            select(BookingModel.__table__).where(BookingModel.reference == "r2")
+        ).one()
+        assert conn.execute(select(RoomModel.number)).scalars().all() == ["101", "102"]
+        born = conn.execute(select(GuestModel.date_of_birth)).scalar()
+        assert born == date(1990, 1, 1)
+    assert row.check_in == date(2030, 1, 3)
+    assert row.paid is True and row.checked_in is False
+    assert row.created_at.hour == 9
+    assert schema_version(engine) == SCHEMA_VERSION
+
+
+def test_bulk_load_rejects_unknown_columns_and_keeps_indexes(tmp_path):
+    engine = get_engine(f"sqlite:///{tmp_path / 'load.db'}")
+    with pytest.raises(ValueError):
+        bulk_load(engine, {"rooms": [{"number": "101", "floor": 1}]})
+    indexes = {ix["name"] for ix in inspect(engine).get_indexes("bookings")}
+    assert len(indexes) == len(BookingModel.__table__.indexes)
+
+
+def test_bulk_load_only_accepts_source_tables(tmp_path, capsys):
+    engine = get_engine(f"sqlite:///{tmp_path / 'load.db'}")
+    with pytest.raises(ValueError, match="room_nights"):
+        bulk_load(engine, {"room_nights": []})
+    with pytest.raises(SystemExit):
+        main([str(engine.url), "--schema_version", "v.csv"])
+    assert "unrecognized arguments" in capsys.readouterr().err
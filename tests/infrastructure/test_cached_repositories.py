@@ -0,0 +1,121 @@
+from datetime import date
+
+from sqlalchemy import event
+
+from src.domain.entities import Guest, Room, RoomType
+from src.domain.repositories import RoomRepository
+from src.infrastructure.cached_repositories import (
+    CachedGuestRepository,
+    CachedRoomRepository,
+    GuestCache,
+    RoomCatalogCache,
+)
+from src.infrastructure.db import create_session, get_engine
+from src.infrastructure.models import Base
+from src.infrastructure.repositories import SqlGuestRepository
+
+
+class CountingRoomRepository(RoomRepository):
+    def __init__(self, rooms):
+        self.rooms = rooms
+        self.calls = 0
+
+    def list_all(self):
+        self.calls += 1
+        return list(self.rooms)
+
+    def get(self, number):
+        self.calls += 1
+        return next((r for r in self.rooms if r.number == number), None)
+
+
+def test_room_cache_serves_reads_from_snapshot():
+    inner = CountingRoomRepository(
+        [
+            Room(number="102", room_type=RoomType.DELUXE),
+            Room(number="101", room_type=RoomType.STANDARD),
+        ]
+    )
+    cache = RoomCatalogCache(ttl=60)
+    repo = CachedRoomRepository(inner, cache)
+
+    assert [r.number for r in repo.list_all()] == ["101", "102"]
+    assert repo.get("102").room_type == RoomType.DELUXE
+    assert repo.get("999") is None
+    assert list(repo.get_many(["101", "999"])) == ["101"]
+    assert [r.number for r in repo.list_by_type(RoomType.DELUXE)] == ["102"]
+    assert repo.list_by_type(RoomType.SUITE) == []
+    assert inner.calls == 1
+    assert cache.stats() == {"hits": 5, "misses": 1}
+
+
+def test_room_cache_reloads_after_invalidate_or_ttl():
+    inner = CountingRoomRepository([Room(number="101", room_type=RoomType.STANDARD)])
+    cache = RoomCatalogCache(ttl=60)
+    repo = CachedRoomRepository(inner, cache)
+    repo.list_all()
+
+    inner.rooms.append(Room(number="103", room_type=RoomType.SUITE))
+    assert repo.get("103") is None
+    cache.invalidate()
+    assert repo.get("103") is not None
+
+    expired = CachedRoomRepository(inner, RoomCatalogCache(ttl=0))
+    expired.list_all()
+    expired.list_all()
+    assert inner.calls == 4
+
+
+def make_guest(guest_id):
+    return Guest(
+        id=guest_id,
+        first_name="Alice",
+        last_name="Smith",
+        date_of_birth=date(1990, 1, 1),
+    )
+
+
+def test_guest_cache_evicts_least_recently_used():
+    cache = GuestCache(max_size=2, ttl=60)
+    cache.put(make_guest("g1"))
+    cache.put(make_guest("g2"))
+    assert cache.get("g1") is not None
+    cache.put(make_guest("g3"))
+    assert cache.get("g2") is None
+    assert cache.get("g1") is not None and cache.get("g3") is not None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (3, 1, 1)
+    assert stats["size"] == 2 and stats["hit_rate"] == 0.75
+
+    expired = GuestCache(max_size=2, ttl=0)
+    expired.put(make_guest("g1"))
+    assert expired.get("g1") is None
+
+
+def test_cached_guest_repository_writes_through_on_commit(tmp_path):
+    engine = get_engine(f"sqlite:///{tmp_path / 'guests.db'}")
+    Base.metadata.create_all(engine)
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, sql, params, context, executemany: statements.append(sql),
+    )
+    cache = GuestCache()
+
+    session = create_session(engine)
+    repo = CachedGuestRepository(SqlGuestRepository(session), cache)
+    repo.add(make_guest("g1"))
+    session.rollback()
+    assert cache.get("g1") is None
+    repo.add(make_guest("g2"))
+    session.commit()
+    session.close()
+
+    session = create_session(engine)
+    repo = CachedGuestRepository(SqlGuestRepository(session), cache)
+    statements.clear()
+    assert repo.get("g2").first_name == "Alice"
+    assert list(repo.get_many(["g2"])) == ["g2"]
+    assert statements == []
+    session.close()
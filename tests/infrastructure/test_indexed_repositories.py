@@ -0,0 +1,39 @@
+from datetime import date, timedelta
+
+from src.domain.availability import RoomIntervalIndex
+from src.infrastructure.db import create_session, get_engine
+from src.infrastructure.indexed_repositories import IndexedBookingRepository
+from src.infrastructure.models import Base
+from src.infrastructure.repositories import SqlBookingRepository
+
+
+def test_index_matches_sql_and_survives_rollback(tmp_path, make_booking):
+    engine = get_engine(f"sqlite:///{tmp_path / 'index.db'}")
+    Base.metadata.create_all(engine)
+    index = RoomIntervalIndex()
+    start = date.today() + timedelta(days=10)
+
+    session = create_session(engine)
+    repo = IndexedBookingRepository(SqlBookingRepository(session), index)
+    repo.add(make_booking("r1", "101", start))
+    assert repo.has_conflict("101", start, start + timedelta(days=1))
+    # Other sessions share the index and must not see the stay before commit.
+    assert not index.overlaps("101", start, start + timedelta(days=1), lambda _: [])
+    session.commit()
+    assert repo.has_conflict("101", start, start + timedelta(days=1))
+    assert repo.inner.has_conflict("101", start, start + timedelta(days=1))
+
+    booking = repo.get("r1")
+    booking.cancelled = True
+    repo.update(booking)
+    assert not repo.has_conflict("101", start, start + timedelta(days=1))
+    session.rollback()
+    session.close()
+
+    session = create_session(engine)
+    repo = IndexedBookingRepository(SqlBookingRepository(session), index)
+    assert repo.has_conflict("101", start, start + timedelta(days=1))
+    repo.remove("r1")
+    session.commit()
+    assert not repo.has_conflict("101", start, start + timedelta(days=1))
+    session.close()
@@ -0,0 +1,139 @@
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import inspect
+
+from src.infrastructure.db import get_engine, init_db
+from src.infrastructure.migrations import (
+    SCHEMA_VERSION,
+    apply_indexes,
+    schema_version,
+)
+from src.infrastructure.models import Base, BookingModel, GuestModel
+
+
+def test_apply_indexes_keeps_existing_rows(tmp_path):
+    engine = get_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for index in BookingModel.__table__.indexes:
+            conn.exec_driver_sql(f"DROP INDEX {index.name}")
+        conn.execute(
+            BookingModel.__table__.insert(),
+            {
+                "reference": "r1",
+                "guest_id": "g1",
+                "first_name": "Alice",
+                "last_name": "Smith",
+                "date_of_birth": date(1990, 1, 1),
+                "room_type": "standard",
+                "room_number": "101",
+                "number_of_guests": 1,
+                "check_in": date(2030, 1, 1),
+                "check_out": date(2030, 1, 2),
+                "paid": True,
+                "cancelled": False,
+                "checked_in": False,
+                "checked_out": False,
+                "created_at": datetime(2029, 12, 1),
+            },
+        )
+
+    created = apply_indexes(engine)
+
+    expected = {index.name for index in BookingModel.__table__.indexes}
+    assert set(created) == expected
+    present = {ix["name"] for ix in inspect(engine).get_indexes("bookings")}
+    assert expected <= present
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT count(*) FROM bookings").scalar() == 1
+    assert apply_indexes(engine) == []
+
+
+def test_init_db_is_idempotent_and_keeps_data(tmp_path):
+    engine = get_engine(f"sqlite:///{tmp_path / 'hotel.db'}")
+    init_db(engine)
+    assert schema_version(engine) == SCHEMA_VERSION
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DELETE FROM rooms WHERE number != '101'")
+        conn.execute(
+            GuestModel.__table__.insert(),
+            {
+                "id": "g1",
+                "first_name": "Alice",
+                "last_name": "Smith",
+                "date_of_birth": date(1990, 1, 1),
+            },
+        )
+
+    init_db(engine)
+
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT count(*) FROM rooms").scalar() == 1
+        assert conn.exec_driver_sql("SELECT count(*) FROM guests").scalar() == 1
+
+
+def test_init_db_upgrades_unversioned_database(tmp_path):
+    engine = get_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    BookingModel.__table__.create(engine)
+    with engine.begin() as conn:
+        for index in BookingModel.__table__.indexes:
+            conn.exec_driver_sql(f"DROP INDEX {index.name}")
+    assert schema_version(engine) == 0
+
+    init_db(engine)
+
+    inspector = inspect(engine)
+    assert {"guests", "rooms", "schema_version"} <= set(inspector.get_table_names())
+    present = {ix["name"] for ix in inspector.get_indexes("bookings")}
+    assert {index.name for index in BookingModel.__table__.indexes} <= present
+    assert schema_version(engine) == SCHEMA_VERSION
+
+
+def test_init_db_refuses_newer_schema(tmp_path):
+    engine = get_engine(f"sqlite:///{tmp_path / 'future.db'}")
+    init_db(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            f"UPDATE schema_version SET version = {SCHEMA_VERSION + 1}"
+        )
+    with pytest.raises(RuntimeError):
+        init_db(engine)
+
+
+def test_upgrade_backfills_room_nights_for_existing_bookings(tmp_path):
+    engine = get_engine(f"sqlite:///{tmp_path / 'v1.db'}")
+    init_db(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("UPDATE schema_version SET version = 1")
+        for reference, cancelled in (("r1", False), ("r2", True)):
+            conn.execute(
+                BookingModel.__table__.insert(),
+                {
+                    "reference": reference,
+                    "guest_id": "g1",
+                    "first_name": "Alice",
+                    "last_name": "Smith",
+                    "date_of_birth": date(1990, 1, 1),
+                    "room_type": "standard",
+                    "room_number": "101",
+                    "number_of_guests": 1,
+                    "check_in": date(2030, 1, 30),
+                    "check_out": date(2030, 2, 2),
+                    "paid": True,
+                    "cancelled": cancelled,
+                    "created_at": datetime(2029, 12, 1),
+                },
+            )
+
+    init_db(engine)
+
+    with engine.connect() as conn:
+        nights = conn.exec_driver_sql(
+            "SELECT night, reference FROM room_nights ORDER BY night"
+        ).all()
+    assert nights == [
+        ("2030-01-30", "r1"),
+        ("2030-01-31", "r1"),
+        ("2030-02-01", "r1"),
+    ]
@@ -0,0 +1,73 @@
+from datetime import date, timedelta
+
+from src.domain.entities import Room, RoomType
+from src.infrastructure.db import create_session, get_engine
+from src.infrastructure.indexed_repositories import OccupancyTrackingRepository
+from src.infrastructure.models import Base
+from src.infrastructure.occupancy import OccupancyMatrix
+from src.infrastructure.repositories import SqlBookingRepository
+
+ORIGIN = date(2030, 1, 1)
+ROOMS = [Room(number=str(101 + i), room_type=RoomType.STANDARD) for i in range(3)]
+
+
+def free_numbers(matrix, start, nights):
+    rooms = matrix.free_rooms(start, start + timedelta(days=nights))
+    return None if rooms is None else [r.number for r in rooms]
+
+
+def test_matrix_book_release_and_horizon(make_booking):
+    bookings = [
+        make_booking("r1", "101", ORIGIN + timedelta(days=2), 3),
+        make_booking("r2", "102", ORIGIN + timedelta(days=4), 1, cancelled=True),
+    ]
+    matrix = OccupancyMatrix.build(
+        ROOMS, lambda start, end: bookings, ORIGIN, horizon_days=30
+    )
+    assert free_numbers(matrix, ORIGIN + timedelta(days=3), 1) == ["102", "103"]
+    assert free_numbers(matrix, ORIGIN + timedelta(days=5), 2) == ["101", "102", "103"]
+    assert free_numbers(matrix, ORIGIN + timedelta(days=29), 2) is None
+    assert free_numbers(matrix, ORIGIN - timedelta(days=1), 2) is None
+
+    matrix.release(bookings[0])
+    assert free_numbers(matrix, ORIGIN + timedelta(days=3), 1) == ["101", "102", "103"]
+
+
+def test_matrix_rolls_forward_and_loads_new_tail(make_booking):
+    late = make_booking("late", "103", ORIGIN + timedelta(days=12), 4)
+    early = make_booking("early", "101", ORIGIN + timedelta(days=1), 2)
+    matrix = OccupancyMatrix.build(
+        ROOMS, lambda start, end: [early], ORIGIN, horizon_days=10
+    )
+    requested = []
+
+    def list_between(start, end):
+        requested.append((start, end))
+        return [late]
+
+    matrix.roll_to(ORIGIN + timedelta(days=5), list_between)
+    assert requested == [(ORIGIN + timedelta(days=10), ORIGIN + timedelta(days=15))]
+    assert free_numbers(matrix, ORIGIN + timedelta(days=12), 2) == ["101", "102"]
+    assert free_numbers(matrix, ORIGIN + timedelta(days=5), 5) == ["101", "102", "103"]
+
+
+def test_tracking_repository_applies_only_committed_writes(tmp_path, make_booking):
+    engine = get_engine(f"sqlite:///{tmp_path / 'occupancy.db'}")
+    Base.metadata.create_all(engine)
+    matrix = OccupancyMatrix(ROOMS, ORIGIN, horizon_days=30)
+
+    session = create_session(engine)
+    repo = OccupancyTrackingRepository(SqlBookingRepository(session), matrix)
+    repo.add(make_booking("r1", "101", ORIGIN + timedelta(days=1), 2))
+    assert free_numbers(matrix, ORIGIN + timedelta(days=1), 1) == ["101", "102", "103"]
+    session.commit()
+    assert free_numbers(matrix, ORIGIN + timedelta(days=1), 1) == ["102", "103"]
+
+    repo.add(make_booking("r2", "102", ORIGIN + timedelta(days=1), 2))
+    session.rollback()
+    assert free_numbers(matrix, ORIGIN + timedelta(days=1), 1) == ["102", "103"]
+
+    repo.remove("r1")
+    session.commit()
+    assert free_numbers(matrix, ORIGIN + timedelta(days=1), 1) == ["101", "102", "103"]
+    session.close()
@@ -0,0 +1,113 @@
+import logging
+from collections import Counter
+from datetime import date, timedelta
+
+from src.application.use_cases import BookingService, CreateBookingRequest
+from src.domain.entities import RoomType
+from src.domain.services import BookingPolicy
+from src.infrastructure import query_stats
+from src.infrastructure.db import create_session, get_engine, init_db
+from src.infrastructure.profiling import StatementProfiler
+from src.infrastructure.repositories import (
+    SqlBookingRepository,
+    SqlGuestRepository,
+    SqlRoomRepository,
+)
+
+
+def request(i: int) -> CreateBookingRequest:
+    check_in = date.today() + timedelta(days=5 + 3 * i)
+    return CreateBookingRequest(
+        guest_id=f"p{i}",
+        first_name="Pat",
+        last_name="Prof",
+        date_of_birth=date(1990, 1, 1),
+        room_type=RoomType.STANDARD,
+        room_number=str(101 + i % 50),
+        number_of_guests=1,
+        check_in=check_in,
+        check_out=check_in + timedelta(days=2),
+    )
+
+
+def make_service(engine):
+    session = create_session(engine)
+    service = BookingService(
+        SqlBookingRepository(session),
+        SqlGuestRepository(session),
+        SqlRoomRepository(session),
+        BookingPolicy(),
+    )
+    return service, session
+
+
+def test_fingerprint_collapses_lists_and_rows():
+    fp = query_stats.fingerprint
+    assert fp("SELECT a\n  FROM t WHERE x IN (?, ?, ?)") == fp(
+        "SELECT a FROM t WHERE x IN (?, ?)"
+    )
+    assert fp("INSERT INTO t (a, b) VALUES (?, ?), (?, ?)") == (
+        "INSERT INTO t (a, b) VALUES (?, ...)"
+    )
+
+
+def test_booking_use_cases_stay_within_statement_budgets(tmp_path):
+    engine = query_stats.track(get_engine(f"sqlite:///{tmp_path / 'p.db'}"))
+    init_db(engine)
+    service, session = make_service(engine)
+
+    with query_stats.collect(shapes=True) as single:
+        service.create_booking(request(0))
+    assert single.statements <= 6
+    assert not single.repeated(2)
+
+    # A batch costs the same statements however many items it holds.
+    sizes = {}
+    for size, first in ((2, 1), (20, 3)):
+        with query_stats.collect(shapes=True) as batch:
+            reqs = [request(first + i) for i in range(size)]
+            results = service.create_bookings(reqs)
+        assert all(r.booking for r in results)
+        assert not batch.repeated(2)
+        sizes[size] = batch.statements
+    assert sizes[2] == sizes[20]
+    session.commit()
+    session.close()
+
+
+def test_slow_queries_are_logged_with_their_plan(tmp_path, caplog):
+    engine = get_engine(f"sqlite:///{tmp_path / 'p.db'}", slow_query_ms=1e-6)
+    init_db(engine)
+    service, session = make_service(engine)
+    with caplog.at_level(logging.WARNING, logger="src.infrastructure.profiling"):
+        service.get_booking("nope")
+    session.close()
+    [message] = [
+        r.getMessage()
+        for r in caplog.records
+        if "FROM bookings WHERE bookings.reference = ?" in r.getMessage()
+    ]
+    assert message.startswith("slow query")
+    assert "parameters: ('nope',)" in message
+    assert "SEARCH bookings USING INDEX" in message
+
+
+def test_profiler_flags_repeated_shapes(caplog):
+    profiler = StatementProfiler(repeat_threshold=3)
+    loop = query_stats.QueryStats(
+        statements=4,
+        shapes=Counter({"SELECT * FROM guests WHERE id = ?": 3, "SELECT 1": 1}),
+    )
+    with caplog.at_level(logging.WARNING, logger="src.infrastructure.profiling"):
+        profiler.observe("GET /bookings", loop)
+        single = query_stats.QueryStats(1, shapes=Counter({"SELECT 1": 1}))
+        profiler.observe("GET /bookings", single)
+    assert ["possible N+1" in r.getMessage() for r in caplog.records] == [True]
+    report = profiler.report()["GET /bookings"]
+    assert report["requests"] == 2
+    assert report["statements_per_request"] == 2.5
+    assert report["n_plus_one_requests"] == 1
+    assert report["shapes"][0] == {
+        "statement": "SELECT * FROM guests WHERE id = ?",
+        "per_request": 1.5,
+    }
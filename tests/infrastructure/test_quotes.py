@@ -0,0 +1,75 @@
+import json
+import math
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from src.domain.entities import RoomType
+from src.infrastructure.quotes import QuoteEngine, RatePlan, Season
+
+ORIGIN = date(2030, 1, 7)  # a Monday
+
+
+def test_default_plan_charges_flat_room_type_price():
+    engine = QuoteEngine(RatePlan(), ORIGIN, horizon_days=60)
+    assert engine.quote(RoomType.STANDARD, ORIGIN + timedelta(days=3), 4) == 400
+    assert engine.quote(RoomType.SUITE, ORIGIN, 1) == 300
+
+
+def test_weekday_and_seasonal_rates_match_a_night_by_night_sum():
+    plan = RatePlan(
+        base={RoomType.STANDARD: 100, RoomType.DELUXE: 180, RoomType.SUITE: 310},
+        weekday=(1, 1, 1, 1, 1.2, 1.25, 1),
+        seasons=(Season(date(2030, 2, 1), date(2030, 2, 15), 1.5),),
+    )
+    engine = QuoteEngine(plan, ORIGIN, horizon_days=90)
+
+    def nightly(room_type, night):
+        rate = plan.base[room_type] * plan.weekday[night.weekday()]
+        if date(2030, 2, 1) <= night < date(2030, 2, 15):
+            rate *= 1.5
+        return round(rate * 100)
+
+    rng = random.Random(3)
+    requests = [
+        (rng.choice(list(RoomType)), ORIGIN + timedelta(days=rng.randrange(80)), n)
+        for n in (rng.randint(1, 10) for _ in range(500))
+    ]
+    totals = engine.quote_many(*zip(*requests))
+    for (room_type, check_in, nights), total in zip(requests, totals):
+        expected = sum(
+            nightly(room_type, check_in + timedelta(days=i)) for i in range(nights)
+        )
+        assert total == pytest.approx(expected / 100)
+    # Friday and Saturday carry the weekday uplift.
+    assert engine.quote(RoomType.STANDARD, date(2030, 1, 11), 2) == 245
+
+
+def test_stays_outside_the_horizon_are_unpriced():
+    engine = QuoteEngine(RatePlan(), ORIGIN, horizon_days=30)
+    totals = engine.quote_many(
+        [RoomType.STANDARD] * 3,
+        [ORIGIN - timedelta(days=1), ORIGIN + timedelta(days=28), ORIGIN],
+        [2, 3, 0],
+    )
+    # quote_many marks unpriced stays with NaN.
+    assert all(math.isnan(total) for total in totals)
+    assert engine.quote(RoomType.STANDARD, ORIGIN + timedelta(days=28), 2) == 200
+
+
+def test_rate_plan_from_file(tmp_path):
+    path = tmp_path / "rates.json"
+    path.write_text(
+        json.dumps(
+            {
+                "base": {"suite": 320},
+                "seasons": [
+                    {"start": "2030-01-08", "end": "2030-01-09", "multiplier": 2}
+                ],
+            }
+        )
+    )
+    engine = QuoteEngine(RatePlan.from_file(path), ORIGIN, horizon_days=10)
+    assert engine.quote(RoomType.SUITE, ORIGIN, 2) == 960
+    assert engine.quote(RoomType.STANDARD, ORIGIN, 1) == 100
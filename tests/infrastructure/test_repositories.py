@@ -1,13 +1,18 @@
-from datetime import date, timedelta
+from dataclasses import replace
+from datetime import date, datetime, timedelta
 
+import pytest
+from sqlalchemy import event, select
+
+from src.infrastructure import room_nights
 from src.infrastructure.db import get_engine, create_session, init_db
 from src.infrastructure.repositories import (
     SqlBookingRepository,
     SqlGuestRepository,
     SqlRoomRepository,
 )
-from src.infrastructure.models import Base
-from src.domain.entities import Guest
+from src.infrastructure.models import Base, RoomNightModel
+from src.domain.entities import Booking, Guest, RoomType
 
 
 def setup_function() -> None:
@@ -30,7 +35,7 @@ def create_repos():
 
 
 def test_guest_repository():
-    booking_repo, guest_repo, room_repo, session = create_repos()
+    _, guest_repo, _, session = create_repos()
     guest = Guest(
         id="g1",
         first_name="Alice",
@@ -40,3 +45,97 @@ def test_guest_repository():
     guest_repo.add(guest)
     fetched = guest_repo.get("g1")
     assert fetched is not None and fetched.first_name == "Alice"
+    session.close()
+
+
+def test_booking_repository_claims_room_nights():
+    booking_repo, _, _, session = create_repos()
+    check_in = date.today() + timedelta(days=5)
+    booking = Booking(
+        reference="r1",
+        guest_id="g1",
+        first_name="Alice",
+        last_name="Smith",
+        date_of_birth=date(1990, 1, 1),
+        room_type=RoomType.STANDARD,
+        room_number="101",
+        number_of_guests=1,
+        check_in=check_in,
+        check_out=check_in + timedelta(days=3),
+        created_at=datetime(2030, 1, 1),
+    )
+
+    def claims():
+        query = select(RoomNightModel.reference, RoomNightModel.night).order_by(
+            RoomNightModel.night
+        )
+        return [(ref, (night - check_in).days) for ref, night in session.execute(query)]
+
+    booking_repo.add(booking)
+    assert claims() == [("r1", 0), ("r1", 1), ("r1", 2)]
+    clash = replace(booking, reference="r2", check_in=check_in + timedelta(days=2))
+    with pytest.raises(ValueError):
+        booking_repo.add(clash)
+    session.rollback()
+    assert claims() == []
+
+    # Cancelling or removing a booking releases its nights for the next one.
+    booking_repo.add(booking)
+    booking_repo.update(replace(booking, cancelled=True))
+    assert claims() == []
+    booking_repo.add(clash)
+    assert claims() == [("r2", 2)]
+    booking_repo.remove("r2")
+    assert claims() == []
+    booking_repo.add(replace(clash, reference="r3"))
+    # Moving a stay moves its claims.
+    booking_repo.update(replace(clash, reference="r3", room_number="102"))
+    session.commit()
+    assert claims() == [("r3", 2)]
+    assert session.scalars(select(RoomNightModel.room_number)).all() == ["102"]
+    assert room_nights.verify(session.connection()).consistent
+    session.close()
+
+
+def test_booking_transitions_are_single_guarded_statements():
+    booking_repo, _, _, session = create_repos()
+    check_in = date.today() + timedelta(days=5)
+    booking = Booking(
+        reference="r1",
+        guest_id="g1",
+        first_name="Alice",
+        last_name="Smith",
+        date_of_birth=date(1990, 1, 1),
+        room_type=RoomType.STANDARD,
+        room_number="101",
+        number_of_guests=1,
+        check_in=check_in,
+        check_out=check_in + timedelta(days=2),
+    )
+    booking_repo.add(booking)
+    booking_repo.add(replace(booking, reference="r2", room_number="102"))
+    session.commit()
+    session.expire_all()
+
+    statements = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, sql, params, context, executemany: statements.append(sql),
+    )
+    assert booking_repo.check_out("r1") is None
+    checked_in = booking_repo.check_in("r1")
+    assert checked_in is not None and checked_in.checked_in
+    assert booking_repo.check_in("r1") is None
+    assert booking_repo.check_out("r1").checked_out
+    assert booking_repo.check_in("missing") is None
+    assert [s.split()[0] for s in statements] == ["UPDATE"] * 5
+
+    assert booking_repo.cancel("r1") is None
+    assert booking_repo.cancel("r2").room_number == "102"
+    session.commit()
+    assert booking_repo.get("r1").checked_out
+    assert booking_repo.get("r2") is None
+    booking_repo.add(replace(booking, reference="r3", room_number="102"))
+    session.commit()
+    session.close()
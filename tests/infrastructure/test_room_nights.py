@@ -0,0 +1,100 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from src.domain.repositories import BookingRepository
+from src.infrastructure import room_nights
+from src.infrastructure.db import create_session, get_engine, init_db
+from src.infrastructure.models import BookingModel, RoomNightModel
+from src.infrastructure.repositories import SqlBookingRepository
+
+DAY = date(2030, 3, 1)
+
+
+def test_availability_from_claims_matches_bookings(tmp_path, make_booking):
+    engine = get_engine(f"sqlite:///{tmp_path / 'hotel.db'}")
+    init_db(engine)
+    session = create_session(engine)
+    repo = SqlBookingRepository(session)
+    rng = random.Random(5)
+    for room in ("101", "102", "103", "104"):
+        day = rng.randrange(4)
+        while day < 60:
+            nights = rng.randint(1, 5)
+            repo.add(
+                make_booking(
+                    f"{room}-{day}",
+                    room,
+                    DAY + timedelta(days=day),
+                    nights,
+                    cancelled=rng.random() < 0.2,
+                )
+            )
+            day += nights + rng.randrange(4)
+    session.commit()
+
+    for _ in range(200):
+        start = DAY + timedelta(days=rng.randrange(-5, 65))
+        end = start + timedelta(days=rng.randint(1, 6))
+        room = rng.choice(("101", "102", "103", "104", "999"))
+        assert repo.has_conflict(room, start, end) == BookingRepository.has_conflict(
+            repo, room, start, end
+        )
+        assert repo.booked_room_numbers(
+            start, end
+        ) == BookingRepository.booked_room_numbers(repo, start, end)
+    session.close()
+
+
+def test_verify_reports_drift_and_rebuild_repairs_it(tmp_path, capsys, make_booking):
+    url = f"sqlite:///{tmp_path / 'hotel.db'}"
+    engine = get_engine(url)
+    init_db(engine)
+    session = create_session(engine)
+    repo = SqlBookingRepository(session)
+    repo.add(make_booking("r1", "101", DAY, 3))
+    repo.add(make_booking("r2", "102", DAY))
+    repo.add(make_booking("r3", "103", DAY, cancelled=True))
+    session.commit()
+    with engine.connect() as conn:
+        assert room_nights.verify(conn) == room_nights.ClaimReport(5, 5, 0, 0, 0)
+
+    with engine.begin() as conn:
+        conn.execute(
+            RoomNightModel.__table__.delete().where(RoomNightModel.reference == "r2")
+        )
+        conn.execute(
+            RoomNightModel.__table__.insert(),
+            {"room_number": "104", "night": DAY, "reference": "gone"},
+        )
+        # A booking written behind the repository's back, overlapping r1.
+        row = make_booking("r4", "101", DAY + timedelta(days=2))
+        conn.execute(
+            BookingModel.__table__.insert(),
+            {name: getattr(row, name) for name in BookingModel.__table__.c.keys()},
+        )
+    with engine.connect() as conn:
+        report = room_nights.verify(conn)
+    assert report == room_nights.ClaimReport(
+        expected=7, claimed=4, missing=4, stray=1, double_booked=1
+    )
+    assert not report.consistent
+
+    # The stored double booking survives a rebuild, so the command fails.
+    with pytest.raises(SystemExit) as exit:
+        room_nights.main([url, "--rebuild"])
+    assert exit.value.code == 1
+    assert "1 double booked" in capsys.readouterr().out
+    with engine.connect() as conn:
+        report = room_nights.verify(conn)
+    assert (report.missing, report.stray, report.double_booked) == (1, 0, 1)
+
+    with engine.begin() as conn:
+        conn.execute(
+            BookingModel.__table__.delete().where(BookingModel.reference == "r4")
+        )
+    room_nights.main([url, "--rebuild"])
+    with engine.connect() as conn:
+        assert room_nights.verify(conn).consistent
+    session.close()